@@ -0,0 +1,61 @@
+# ─── benchmarks/bench_conjugation.py ───────────────────────────────────────
+"""
+Пропускная способность conjugation.conjugate_many().
+
+Глаголы синтетические: случайный иероглиф(ы) + окончание всех групп
+(五段 на каждый ряд, 一段, する, 来る). Меряется «холодный» прогон (кэш
+пуст) и «тёплый» (повторная пачка того же размера, что и кэш).
+
+    python benchmarks/bench_conjugation.py [--n 10000 100000] [--seed 1]
+"""
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import conjugation
+
+KANJI = "飲書話待死遊読取泳買食見寝起考始教開閉出入走帰作送立座持使習覚忘"
+ENDINGS = ("む", "く", "す", "つ", "ぬ", "ぶ", "ぐ", "う", "る",
+           "べる", "める", "きる", "える", "じる", "する", "来る")
+
+
+def synthetic_verbs(n: int, rng: random.Random) -> list[str]:
+    out, seen = [], set()
+    while len(out) < n:
+        v = "".join(rng.choices(KANJI, k=rng.randint(1, 3))) + rng.choice(ENDINGS)
+        if v not in seen:
+            seen.add(v)
+            out.append(v)
+    return out
+
+
+def run(verbs) -> float:
+    t0 = time.perf_counter()
+    done, rejected = conjugation.conjugate_many(verbs)
+    dt = time.perf_counter() - t0
+    assert len(done) == len(verbs) and not rejected
+    return dt
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--n", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    cache = conjugation.cache_info().maxsize
+    print(f"{'глаголов':>9} {'холодный, с':>12} {'глаг/с':>10} "
+          f"{'тёплый, с':>10} {'глаг/с':>10}")
+    for n in args.n:
+        verbs = synthetic_verbs(n, rng)
+        conjugation._forms.cache_clear()
+        cold = run(verbs)
+        hot_set = verbs[-min(n, cache):]           # умещается в кэш целиком
+        warm = run(hot_set)
+        print(f"{n:>9} {cold:>12.3f} {n / cold:>10,.0f} "
+              f"{warm:>10.4f} {len(hot_set) / warm:>10,.0f}")
+    print(conjugation.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ─── benchmarks/bench_export.py ────────────────────────────────────────────
+"""
+Выгрузка карточек (export.py) на синтетическом корпусе: скорость и
+пиковая память.
+
+Корпус — synthetic.write_data_dir() такого масштаба, чтобы все источники
+(примеры уроков, конструкции, грамматика, спряжение) дали не меньше
+--cards карточек. Контент читается заранее, замеряется только выгрузка:
+время по форматам csv / tsv / anki и пик tracemalloc — у потоковой
+записи и, для сравнения, у «всё в список, потом join».
+
+    python benchmarks/bench_export.py [--cards 100000] [--seed 0]
+"""
+import argparse, os, sys, tempfile, time, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic                                   # добавляет корень проекта в sys.path
+import content, export
+
+
+def cards(repo):
+    for source in export.SOURCES.values():
+        yield from source(repo)
+
+
+def corpus(tmp: str, n: int, seed: int):
+    """Репозиторий с синтетическими данными на ≥ n карточек."""
+    def repo_at(scale):
+        path = os.path.join(tmp, f"x{scale}")
+        synthetic.write_data_dir(path, scale, seed)
+        return content.ContentRepository(path, os.path.join(tmp, "missing.pack"),
+                                         bundle_dir=path)
+
+    per_scale = sum(1 for _ in cards(repo_at(1)))
+    repo = repo_at(max(1, -(-n // per_scale)))
+    for name in content.DATASETS:
+        repo.get(name)                             # чтение JSON — вне замера
+    return repo
+
+
+def peak(fn) -> int:
+    tracemalloc.start()
+    fn()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+
+def naive(repo, out: str):
+    """Без потока: все строки в список, затем один write."""
+    rows = ["\t".join(c) for c in cards(repo)]
+    with open(out, "w", encoding="utf-8") as f:
+        f.write("\n".join(rows))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--cards", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        repo = corpus(tmp, args.cards, args.seed)
+        total = sum(1 for _ in cards(repo))
+        print(f"корпус: {total} карточек ({time.perf_counter() - t0:.1f} с на подготовку)")
+
+        out = os.path.join(tmp, "deck")
+        for fmt in export.DELIMITERS:
+            t0 = time.perf_counter()
+            n = export.export(out, cards(repo), fmt)
+            dt = time.perf_counter() - t0
+            print(f"  {fmt:<5} {dt * 1000:8.1f} мс · {n / dt:>9,.0f} карточек/с · "
+                  f"{os.path.getsize(out) / 2**20:6.1f} MB")
+
+        stream = peak(lambda: export.export(out, cards(repo), "anki"))
+        listed = peak(lambda: naive(repo, out))
+        print(f"пик памяти: поток {stream / 1024:.1f} KB · "
+              f"список + join {listed / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# ─── benchmarks/bench_sampling.py ──────────────────────────────────────────
+"""
+Взвешенная выборка конструкций (pools.WeightedPool): скорость на
+больших пулах. Распределение проверяется критерием χ² в tests/test_pools.py.
+
+Замеры — построение таблицы, выдача по --k элементов на сессию и
+вытягивание пула до конца; для сравнения — random.choices по
+накопленным весам с пересчётом после каждого удаления (на меньшем пуле).
+
+    python benchmarks/bench_sampling.py [--n 100000] [--k 10] [--seed 1]
+"""
+import argparse, os, random, sys, time
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic                                   # добавляет корень проекта в sys.path
+import content
+from pools import WeightedPool
+
+
+def weights_for(n: int, level: str, rng) -> tuple[float, ...]:
+    forms = ["Te-form", "Ta-form", "Masu-form"]
+    return tuple(content.construction_weight(c, level)
+                 for c in synthetic.constructions(n, forms, rng))
+
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def bench(n: int, k: int, seed: int):
+    rng = random.Random(seed)
+    weights = weights_for(n, "N4", rng)
+    pool = None
+
+    def build():
+        nonlocal pool
+        pool = WeightedPool.full(weights)
+
+    t_build = timed(build)
+    sessions = max(1, min(2000, n // k // 2))
+    t_sessions = timed(lambda: [pool.draw(k, rng) for _ in range(sessions)])
+    t_rest = timed(lambda: pool.draw(len(pool), rng))
+    print(f"  n={n:<8} построение {t_build * 1000:8.1f} мс · "
+          f"сессия по {k}: {t_sessions / sessions * 1e6:7.1f} мкс · "
+          f"остаток пула: {t_rest / max(1, n - sessions * k) * 1e6:5.2f} мкс/элемент")
+
+
+def bench_naive(n: int, k: int, seed: int):
+    """random.choices по накопленным весам: O(n) на каждое извлечение."""
+    rng = random.Random(seed)
+    weights = list(weights_for(n, "N4", rng))
+    ids = list(range(n))
+    sessions = 50
+
+    def run():
+        for _ in range(sessions):
+            for _ in range(k):
+                j = rng.choices(range(len(ids)), cum_weights=list(accumulate(weights)))[0]
+                ids[j], weights[j] = ids[-1], weights[-1]
+                ids.pop()
+                weights.pop()
+
+    t = timed(run)
+    print(f"  n={n:<8} random.choices + пересчёт: сессия по {k}: "
+          f"{t / sessions * 1e6:9.1f} мкс")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--n", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    ap.add_argument("--k", type=int, default=10, help="элементов на сессию")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    for n in args.n:
+        bench(n, args.k, args.seed)
+    bench_naive(min(args.n[-1], 10_000), args.k, args.seed)
+
+
+if __name__ == "__main__":
+    main()
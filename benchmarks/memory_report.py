@@ -0,0 +1,90 @@
+# ─── benchmarks/memory_report.py ───────────────────────────────────────────
+"""
+Память под контент: dict из json.load, прежнее read-only представление
+(freeze: MappingProxyType + tuple) и записи records.py.
+
+Каждый набор (синтетический, benchmarks/synthetic.py) сериализуется в
+JSON заранее, затем под tracemalloc разбирается тремя способами; в отчёт
+идёт удерживаемая память (current после разбора минус до него) и байт
+на запись. Строки в исходных данных — отдельные объекты, как после
+json.load настоящего файла, так что выигрыш от интернирования честный.
+
+    python benchmarks/memory_report.py [--n 100000] [--seed 0] [--json out.json]
+"""
+import argparse, gc, json, os, random, sys, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic                                   # добавляет корень проекта в sys.path
+import records
+from drill import TABLE_FORMS
+
+VARIANTS = (
+    ("dict",    lambda name, text: json.loads(text)),
+    ("freeze",  lambda name, text: records.freeze(json.loads(text))),
+    ("records", lambda name, text: records.freeze_dataset(name, json.loads(text))),
+)
+
+
+def corpus(n: int, seed: int) -> dict[str, tuple[int, str]]:
+    """Имя набора → (число записей, JSON-текст)."""
+    rng = random.Random(seed)
+    forms = list(TABLE_FORMS.values())
+    rows = [{"form": rng.choice(list(TABLE_FORMS)),
+             "values": [synthetic._ja(rng, 4) for _ in range(12)]} for _ in range(n)]
+    data = {
+        "grammar_n5":    (n, synthetic.grammar_list(n, rng)),
+        "constructions": (n, synthetic.constructions(n, forms, rng)),
+        "lessons":       (n // 50, synthetic.lessons(n // 50, rng, cases=3, examples=2)),
+        "conjugation":   (n, {"columns": synthetic.verbs(12, rng), "rows": rows,
+                              "filter_labels": []}),
+    }
+    return {name: (count, json.dumps(obj, ensure_ascii=False))
+            for name, (count, obj) in data.items()}
+
+
+def retained(fn) -> int:
+    """Байт, которые удерживает результат fn() (tracemalloc)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = fn()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del value
+    return size
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--n", type=int, default=100_000, help="записей в наборе")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", metavar="PATH", help="записать результат в JSON")
+    args = ap.parse_args()
+
+    report = {}
+    print(f"{'набор':<14} {'записей':>8}" + "".join(f" {v:>12}" for v, _ in VARIANTS)
+          + f" {'экономия':>9}")
+    for name, (count, text) in corpus(args.n, args.seed).items():
+        sizes = {variant: retained(lambda: load(name, text)) for variant, load in VARIANTS}
+        saved = 1 - sizes["records"] / sizes["dict"]
+        report[name] = {"entries": count,
+                        **{f"{v}_bytes": s for v, s in sizes.items()},
+                        **{f"{v}_per_entry": round(s / count) for v, s in sizes.items()},
+                        "saved": round(saved, 3)}
+        print(f"{name:<14} {count:>8}"
+              + "".join(f" {s / 2**20:>9.1f} MB" for s in sizes.values())
+              + f" {saved:>8.0%}")
+
+    total = {v: sum(r[f"{v}_bytes"] for r in report.values()) for v, _ in VARIANTS}
+    print(f"{'всего':<14} {'':>8}" + "".join(f" {s / 2**20:>9.1f} MB" for s in total.values())
+          + f" {1 - total['records'] / total['dict']:>8.0%}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"n": args.n, "seed": args.seed, "datasets": report},
+                      f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+# ─── benchmarks/run.py ─────────────────────────────────────────────────────
+"""
+Набор бенчмарков: запуск, загрузка контента, выборка, сохранение, отрисовка.
+
+    python benchmarks/run.py                       # всё, сравнить с baseline.json
+    python benchmarks/run.py --quick               # меньше повторов и размеров
+    python benchmarks/run.py --only render --tk stub
+    python benchmarks/run.py --save-baseline       # записать новый baseline.json
+
+Работает на сервере без экрана: окна FormGuide создаются в Tk под
+Xvfb (если он установлен) либо заменяются заглушками виджетов
+(--tk stub) — тогда меряется вся Python-часть отрисовки без Tcl.
+Все файлы пишутся во временную папку; данные — копия data/*.json и
+синтетический контент (benchmarks/synthetic.py) нужного размера.
+
+Результат — JSON {"meta", "results": {имя: {"ms", …}}}; сравнение с
+базовой линией — по медиане "ms", регрессией считается рост больше
+--tolerance (и больше NOISE_MS в абсолютном выражении).
+"""
+import argparse, json, os, platform, random, shutil, statistics, subprocess
+import sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+BASELINE = os.path.join(HERE, "baseline.json")
+RESULTS  = os.path.join(HERE, "results.json")
+NOISE_MS = 0.5
+
+BENCHES: list[tuple[str, object]] = []
+
+
+def bench(group: str):
+    def deco(fn):
+        BENCHES.append((group, fn))
+        return fn
+    return deco
+
+
+def timed(fn, repeat: int, setup=None) -> dict:
+    """Медиана и минимум по repeat запускам; setup() — вне замера."""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        t0 = time.perf_counter()
+        fn(arg) if setup is not None else fn()
+        times.append(time.perf_counter() - t0)
+    return {"ms": round(statistics.median(times) * 1000, 3),
+            "min_ms": round(min(times) * 1000, 3), "n": repeat}
+
+
+class Ctx:
+    def __init__(self, tmp: str, quick: bool, tk_mode: str):
+        self.tmp = tmp
+        self.quick = quick
+        self.tk_mode = tk_mode
+        self.repeat = 3 if quick else 7
+        self.sizes = (100, 1000, 10_000) if quick else (100, 1000, 10_000, 100_000)
+        self.results: dict[str, dict] = {}
+
+    def add(self, name: str, metrics: dict):
+        self.results[name] = metrics
+        extra = {k: v for k, v in metrics.items() if k not in ("ms", "min_ms", "n")}
+        print(f"  {name:<44} {metrics['ms']:>10.3f} ms  {extra or ''}")
+
+
+# ─────────────────── запуск ───────────────────
+@bench("startup")
+def bench_imports(ctx: Ctx):
+    """Время импорта модулей в чистом интерпретаторе."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    for mod in ("menu", "form_guide"):
+        code = (f"import time; t = time.perf_counter(); import {mod}; "
+                f"print(time.perf_counter() - t)")
+        times = []
+        for _ in range(ctx.repeat):
+            out = subprocess.run([sys.executable, "-c", code], cwd=ctx.tmp, env=env,
+                                 capture_output=True, text=True, check=True).stdout
+            times.append(float(out.strip().splitlines()[-1]))
+        ctx.add(f"import.{mod}", {"ms": round(statistics.median(times) * 1000, 3),
+                                  "min_ms": round(min(times) * 1000, 3), "n": ctx.repeat})
+
+
+@bench("startup")
+def bench_ensure_data_dir(ctx: Ctx):
+    from utils import ensure_data_dir
+    counter = iter(range(10 ** 6))
+    ctx.add("ensure_data_dir.first_run", timed(
+        lambda dst: ensure_data_dir(dst), ctx.repeat,
+        setup=lambda: os.path.join(ctx.tmp, f"dd{next(counter)}")))
+    existing = os.path.join(ctx.tmp, "dd_existing")
+    ensure_data_dir(existing)
+    ctx.add("ensure_data_dir.existing", timed(lambda: ensure_data_dir(existing), ctx.repeat))
+
+
+# ─────────────────── контент ───────────────────
+@bench("content")
+def bench_content(ctx: Ctx):
+    import content, content_pack
+    data = os.path.join(ctx.tmp, "data")
+    pack = os.path.join(ctx.tmp, content_pack.PACK_NAME)
+    nopack = os.path.join(ctx.tmp, "missing.pack")
+    content_pack.build(pack, {n: os.path.join(data, f) for n, f in content.DATASETS.items()})
+
+    for name, fname in content.DATASETS.items():
+        size = os.path.getsize(os.path.join(data, fname))
+        m = timed(lambda repo: repo.get(name), ctx.repeat,
+                  setup=lambda: content.ContentRepository(data, nopack, bundle_dir=data))
+        ctx.add(f"content.json.{name}", dict(m, bytes=size))
+
+        def packed(repo):
+            obj = repo.get(name)
+            for _ in (obj.values() if hasattr(obj, "values") else obj):
+                pass                                  # декодировать все записи
+        ctx.add(f"content.pack.{name}", timed(
+            packed, ctx.repeat, setup=lambda: content.ContentRepository(data, pack, bundle_dir=data)))
+
+    # синтетический список уровня на 100k (10k в --quick) записей
+    import synthetic
+    n = 10_000 if ctx.quick else 100_000
+    big = os.path.join(ctx.tmp, "big")
+    os.makedirs(big, exist_ok=True)
+    with open(os.path.join(big, content.DATASETS["grammar_n5"]), "w", encoding="utf-8") as f:
+        json.dump(synthetic.grammar_list(n, random.Random(1)), f, ensure_ascii=False)
+    m = timed(lambda repo: repo.get("grammar_n5"), ctx.repeat,
+              setup=lambda: content.ContentRepository(big, nopack, bundle_dir=big))
+    ctx.add(f"content.json.grammar_{n}",
+            dict(m, bytes=os.path.getsize(os.path.join(big, content.DATASETS["grammar_n5"]))))
+
+
+# ─────────────────── выборка на сегодня ───────────────────
+@bench("sampling")
+def bench_today_items(ctx: Ctx):
+    import synthetic
+    from progress_store import ProgressJournal
+    from session import Session
+    for n in ctx.sizes:
+        items = synthetic.imported_items(n, random.Random(n))
+        journal = ProgressJournal(os.path.join(ctx.tmp, f"sample_{n}.json"), dict)
+        session = Session(log=journal.append)
+        session.import_items(items)
+        rng = random.Random(0)
+        draws = max(1, min(200, n // 5))
+
+        def run():
+            for _ in range(draws):
+                session.today_items(5, rng)
+        m = timed(run, 1)
+        ctx.add(f"today_items.{n}", {"ms": round(m["ms"] / draws, 4),
+                                     "min_ms": round(m["min_ms"] / draws, 4), "n": draws})
+
+
+# ─────────────────── сохранение / загрузка ───────────────────
+def _session(n: int):
+    import synthetic
+    from session import Session
+    s = Session()
+    s.import_items(synthetic.imported_items(n, random.Random(n)))
+    s.grammar_pool.draw(n // 3, random.Random(0))
+    return s
+
+
+@bench("persistence")
+def bench_json_progress(ctx: Ctx):
+    from progress_store import ProgressJournal
+    for n in ctx.sizes:
+        s = _session(n)
+        path = os.path.join(ctx.tmp, f"progress_{n}.json")
+        journal = ProgressJournal(path, s.snapshot)
+        m = timed(journal.compact, ctx.repeat)
+        ctx.add(f"save_progress.json.{n}", dict(m, bytes=os.path.getsize(path)))
+
+        def draw():
+            journal.append("draw", pool="grammar", ids=s.grammar_pool.draw(5))
+            journal.flush()
+        ctx.add(f"save_progress.json_journal.{n}", timed(draw, ctx.repeat))
+        ctx.add(f"load_progress.json.{n}", timed(
+            lambda: ProgressJournal(path, dict).load(), ctx.repeat))
+
+
+@bench("persistence")
+def bench_sqlite_progress(ctx: Ctx):
+    from profile_store import ProfileStore, ProfileJournal
+    for n in ctx.sizes:
+        s = _session(n)
+        path = os.path.join(ctx.tmp, f"profiles_{n}.db")
+        store = ProfileStore(path)
+        store.open()
+        journal = ProfileJournal(store, "progress", s.snapshot)
+        journal.profile = store.profile_id("bench")
+        m = timed(lambda: journal.write([], journal.prepare_snapshot()), ctx.repeat)
+        size = sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+        ctx.add(f"save_progress.sqlite_full.{n}", dict(m, bytes=size))
+
+        def draw():
+            journal.append("draw", pool="grammar", source=s.pool_source("grammar"),
+                           ids=s.grammar_pool.draw(5))
+            journal.flush()
+        ctx.add(f"save_progress.sqlite_rows.{n}", timed(draw, ctx.repeat))
+        ctx.add(f"load_progress.sqlite.{n}", timed(
+            lambda: store.read_progress(journal.profile), ctx.repeat))
+        store.close()
+
+
+@bench("persistence")
+def bench_history(ctx: Ctx):
+    """Сессия в историю и чтение агрегатов после 1 / 10 лет ежедневных занятий."""
+    from profile_store import ProfileStore, ProfileJournal
+    for years in (1, 10):
+        path = os.path.join(ctx.tmp, f"history_{years}.db")
+        store = ProfileStore(path)
+        store.open()
+        journal = ProfileJournal(store, "history")
+        journal.profile = store.profile_id("bench")
+        t0 = time.time() - years * 365 * 86400
+        for day in range(years * 365):
+            journal.append("session", ts=t0 + day * 86400, mode="grammar",
+                           source="grammar_n5", level="N5",
+                           items=[f"g{day * 5 + i}" for i in range(5)], groups=[("N5",)] * 5)
+        journal.flush()
+        clock = iter(range(10 ** 6))
+
+        def one():
+            journal.append("session", ts=time.time() + next(clock), mode="forms",
+                           source="forms", level="N5", items=["Te-form"], groups=[("forms",)])
+            journal.flush()
+        ctx.add(f"history.append.{years}y", timed(one, ctx.repeat))
+        ctx.add(f"history.read.{years}y", timed(
+            lambda: store.read_history(journal.profile), ctx.repeat))
+        store.close()
+
+
+# ─────────────────── отрисовка FormGuide ───────────────────
+class InlineIO:
+    """TkExecutor без потоков: задача и колбэк выполняются сразу."""
+
+    def submit(self, fn, *args, on_done=None, on_error=None, owner=None):
+        try:
+            result = fn(*args)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return
+        if on_done is not None:
+            on_done(result)
+
+    def cancel(self, owner):
+        pass
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class _Stub:
+    """Заглушка виджета: все методы — no-op."""
+
+    def __getattr__(self, name):
+        return lambda *a, **k: None
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class StubText(_Stub):
+    def __init__(self):
+        self.chars = self.calls = 0
+
+    def delete(self, *a):
+        self.chars = 0
+
+    def insert(self, index, *args):
+        self.calls += 1
+        self.chars += sum(len(t) for t in args[::2])
+
+    def after(self, ms, fn, *args):
+        fn(*args)                                 # дорисовка — сразу
+
+
+class StubVar:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def stub_form_guide(io):
+    """FormGuide без Tk: те же методы, виджеты — заглушки."""
+    import form_guide
+    from virtual_table import VirtualTable
+    fg = form_guide.FormGuide.__new__(form_guide.FormGuide)
+    fg.root = fg.main_menu_root = fg.txt_fr = fg.conj_fr = fg.form_box = _Stub()
+    fg.io, fg.own_io = io, False
+    fg.lessons, fg.lessons_version = {}, 0
+    fg._render_cache, fg._render_token, fg._request_id = {}, 0, 0
+    fg.view = "lesson"
+    fg.form_var, fg.verbs_var, fg.query_var = StubVar(), StubVar(), StubVar()
+    fg.text_box = StubText()
+    table = VirtualTable.__new__(VirtualTable)
+    table.height, table.col_width = 28, 110
+    table.columns, table.rows, table.offset = (), (), 0
+    table._slots, table._shown = [], []
+    table.frame, table.tv, table.sb = _Stub(), _Stub(), _Stub()
+    table.tv.insert = lambda *a, iid=None, **k: iid
+    fg.table, fg._table_key = table, None
+    fg._lessons_loaded(form_guide.load_lessons())
+    return fg
+
+
+def open_tk(mode: str):
+    """(root, режим): настоящий Tk, Tk под Xvfb или None для заглушек."""
+    if mode == "stub":
+        return None, "stub"
+    import tkinter
+    import ttkbootstrap as tb
+    try:
+        root = tb.Window(themename="minty")
+        root.withdraw()
+        return root, "display"
+    except tkinter.TclError:
+        pass
+    if shutil.which("Xvfb"):
+        display = f":{os.getpid() % 500 + 100}"
+        proc = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ["DISPLAY"] = display
+        for _ in range(50):
+            time.sleep(0.1)
+            try:
+                root = tb.Window(themename="minty")
+                root.withdraw()
+                root._xvfb = proc
+                return root, "xvfb"
+            except tkinter.TclError:
+                continue
+        proc.terminate()
+    if mode == "xvfb":
+        raise SystemExit("Xvfb недоступен: запустите с --tk stub")
+    return None, "stub"
+
+
+@bench("render")
+def bench_render(ctx: Ctx):
+    import conjugation, form_guide, synthetic
+    io = InlineIO()
+    root, mode = open_tk(ctx.tk_mode)
+    ctx.tk_mode = mode
+    if root is None:
+        fg = stub_form_guide(io)
+        drain = lambda: None
+    else:
+        import ttkbootstrap as tb
+        top = tb.Toplevel(root)
+        fg = form_guide.FormGuide(top, root, io)
+
+        def drain():                              # дорисовка по after() до конца
+            while root.tk.call("after", "info"):
+                root.update()
+            root.update_idletasks()
+
+    def show(method, *args):
+        def run():
+            method(*args)
+            drain()
+        return run
+
+    forms = list(fg.lessons)
+
+    def lessons_cold():
+        for f in forms:
+            fg._render_cache.clear()
+            fg.form_var.set(f)
+            show(fg.show_lesson)()
+    ctx.add("render.show_lesson.cold_all", timed(lessons_cold, ctx.repeat))
+
+    def lessons_warm():
+        for f in forms:
+            fg.form_var.set(f)
+            show(fg.show_lesson)()
+    ctx.add("render.show_lesson.warm_all", timed(lessons_warm, ctx.repeat))
+
+    def constructions():
+        fg._render_cache.clear()
+        for f in forms:
+            fg.form_var.set(f)
+            show(fg.show_constructions)()
+    ctx.add("render.show_constructions.all", timed(constructions, ctx.repeat))
+
+    def builtin_table(_):
+        show(fg.show_conjugation_table)()
+    ctx.add("render.show_conjugation_table.builtin", timed(
+        builtin_table, ctx.repeat, setup=lambda: setattr(fg, "_table_key", None)))
+
+    n = 1000 if ctx.quick else 10_000
+    verbs = synthetic.verbs(n, random.Random(2))
+
+    def cold():
+        conjugation._forms.cache_clear()
+        fg._table_key = None
+    ctx.add(f"render.conjugation_table.verbs_{n}", timed(
+        lambda _: show(fg.show_verbs, verbs)(), ctx.repeat, setup=cold))
+
+    if root is not None:
+        root.destroy()
+        if proc := getattr(root, "_xvfb", None):
+            proc.terminate()
+
+
+# ─────────────────── сравнение с базовой линией ───────────────────
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    print(f"\n{'бенчмарк':<44} {'было, ms':>10} {'стало, ms':>10} {'×':>6}")
+    for name, now in results.items():
+        was = baseline.get(name)
+        if was is None:
+            continue
+        ratio = now["ms"] / was["ms"] if was["ms"] else float("inf")
+        slow = ratio > 1 + tolerance and now["ms"] - was["ms"] > NOISE_MS
+        if slow:
+            regressions.append(name)
+        print(f"{name:<44} {was['ms']:>10.3f} {now['ms']:>10.3f} {ratio:>6.2f}"
+              f"{'  ← регрессия' if slow else ''}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Бенчмарки Japanese Trainer.")
+    ap.add_argument("--quick", action="store_true", help="меньше повторов и размеров")
+    ap.add_argument("--only", nargs="+", metavar="GROUP",
+                    help="startup content sampling persistence render")
+    ap.add_argument("--tk", choices=("auto", "xvfb", "stub"), default="auto")
+    ap.add_argument("--scale", type=int, default=0,
+                    help="синтетический контент ×scale вместо data/*.json (0 — встроенный)")
+    ap.add_argument("--out", default=RESULTS)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args(argv)
+
+    tmp = tempfile.mkdtemp(prefix="jt-bench-")
+    cwd = os.getcwd()
+    try:
+        import content, synthetic
+        data = os.path.join(tmp, "data")
+        if args.scale:
+            synthetic.write_data_dir(data, args.scale)
+        else:
+            os.makedirs(data)
+            for fname in content.DATASETS.values():
+                shutil.copy2(os.path.join(ROOT, fname), data)
+        os.chdir(tmp)                              # пути "data/…" — во временной папке
+
+        ctx = Ctx(tmp, args.quick, args.tk)
+        for group, fn in BENCHES:
+            if args.only and group not in args.only:
+                continue
+            print(f"[{group}] {fn.__name__}")
+            fn(ctx)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick, "scale": args.scale, "tk": ctx.tk_mode,
+        },
+        "results": ctx.results,
+    }
+    target = args.baseline if args.save_baseline else args.out
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    print(f"\n→ {target}")
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    if base["meta"].get("quick") != args.quick or base["meta"].get("scale") != args.scale:
+        print("(базовая линия снята с другими --quick/--scale — сравнение приблизительное)")
+    regressions = compare(ctx.results, base["results"], args.tolerance)
+    if regressions:
+        print(f"\nРегрессии ({len(regressions)}): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
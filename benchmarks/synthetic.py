@@ -0,0 +1,105 @@
+# ─── benchmarks/synthetic.py ───────────────────────────────────────────────
+"""
+Синтетический контент в формате data/*.json любого размера.
+
+Структура записей та же, что у встроенных файлов (grammar_n5.json,
+lessons.json, grammar_constructions.json, …), тексты — случайные, но
+воспроизводимые (random.Random(seed)). write_data_dir() раскладывает
+полный набор файлов content.DATASETS в указанную папку.
+"""
+import json, os, random, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import conjugation, content
+from session import BUILTIN_FORMS
+
+KANA  = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+KANJI = "日本語学生先時間人食飲見行来話読書聞言思知分出入上下中大小"
+RU    = ("когда", "если", "хотя", "чтобы", "пока", "даже", "после", "перед",
+         "можно", "нужно", "нельзя", "кажется", "говорят", "вместо", "только")
+
+
+def _ja(rng, n) -> str:
+    return "".join(rng.choice(KANJI if rng.random() < 0.3 else KANA) for _ in range(n))
+
+
+def _ru(rng, n) -> str:
+    return " ".join(rng.choice(RU) for _ in range(n)).capitalize() + "."
+
+
+def _example(rng) -> dict:
+    return {"ja": _ja(rng, 12) + "。", "hiragana": "".join(rng.choice(KANA) for _ in range(14)),
+            "ru": _ru(rng, 6)}
+
+
+def grammar_list(n: int, rng) -> list[dict]:
+    """Список в формате grammar_n5.json; заголовки уникальны."""
+    return [{"title": f"{_ja(rng, rng.randint(2, 5))}〜{i}", "comment": _ru(rng, 5)}
+            for i in range(n)]
+
+
+def imported_items(n: int, rng) -> list:
+    """Элементы импортированного списка: строки и пары (title, comment)."""
+    return [f"{_ja(rng, 4)}{i}" if i % 3 else (f"{_ja(rng, 4)}{i}", _ru(rng, 4))
+            for i in range(n)]
+
+
+def lessons(n_forms: int, rng, cases: int = 5, examples: int = 3) -> dict:
+    forms = [BUILTIN_FORMS[i % len(BUILTIN_FORMS)] + ("" if i < len(BUILTIN_FORMS) else f"-{i}")
+             for i in range(n_forms)]
+    return {f: {
+        "title": f"{f}（{_ja(rng, 3)}形）",
+        "description": _ru(rng, 40),
+        "use_cases": {f"Случай {c}": {"note": _ru(rng, 20),
+                                      "examples": [_example(rng) for _ in range(examples)]}
+                      for c in range(cases)},
+        "formation": {
+            "overview": _ru(rng, 30),
+            "group_1": {"rule": "五段動詞", "patterns": {k: _ja(rng, 6) for k in ("う・つ・る", "ぶ・む・ぬ", "く", "ぐ", "す")}},
+            "group_2": {"rule": "一段動詞", "patterns": {"る": _ja(rng, 6)}},
+            "group_3": {"rule": "不規則動詞", "patterns": {"する": _ja(rng, 4), "来る": _ja(rng, 4)}},
+        },
+    } for f in forms}
+
+
+def constructions(n: int, forms, rng) -> list[dict]:
+    return [{"title": f"〜{_ja(rng, 3)}{i}", "form": rng.choice(forms),
+             "jlpt": rng.choice(("N5", "N4", "N3")), "frequency": rng.randint(1, 100),
+             "comment": _ru(rng, 15), "examples": [_example(rng) for _ in range(2)]}
+            for i in range(n)]
+
+
+def verbs(n: int, rng) -> list[str]:
+    ends = ("む", "く", "す", "つ", "ぬ", "ぶ", "ぐ", "う", "る", "べる", "める", "する")
+    out, seen = [], set()
+    while len(out) < n:
+        v = "".join(rng.choices(KANJI, k=rng.randint(1, 3))) + rng.choice(ends)
+        if v not in seen:
+            seen.add(v)
+            out.append(v)
+    return out
+
+
+def write_data_dir(path: str, scale: int = 1, seed: int = 0) -> dict[str, int]:
+    """
+    Полный набор content.DATASETS в папке path. scale=1 ≈ размер встроенных
+    данных, дальше — линейно. Возвращает число записей по наборам.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    les = lessons(15 * scale, rng)
+    table, _ = conjugation.table(verbs(12 * scale, rng))
+    data = {
+        "facts": [_ru(rng, 12) for _ in range(200 * scale)],
+        "lessons": les,
+        "grammar_n5": grammar_list(100 * scale, rng),
+        "grammar_n4": grammar_list(130 * scale, rng),
+        "grammar_n3": grammar_list(200 * scale, rng),
+        "constructions": constructions(94 * scale, list(les), rng),
+        "conjugation": table,
+    }
+    for name, obj in data.items():
+        with open(os.path.join(path, content.DATASETS[name]), "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False)
+    return {name: len(obj["columns"] if name == "conjugation" else obj)
+            for name, obj in data.items()}
@@ -0,0 +1,172 @@
+# ─── classroom.py ──────────────────────────────────────────────────────────
+"""
+Пакетная генерация «элементов на сегодня» для группы учеников (без окна).
+
+Ростер — JSON-массив объектов или CSV с колонками
+    name, level, mode, count[, srs]
+(level: N5/N4/N3, mode: grammar/forms/constructions). Для каждого ученика создаётся
+Session; его прогресс хранится в --state-dir/<имя>.json (тот же формат,
+что data/progress.json), поэтому завтрашний запуск не повторит
+сегодняшние элементы. Результат — <out>/<имя>.json или .csv.
+
+Генератор случайных чисел у каждого ученика свой и выводится из
+--seed и имени: результат не зависит ни от порядка учеников в
+ростере, ни от числа процессов.
+
+    python classroom.py roster.csv --out sessions --seed 42
+    python classroom.py roster.json --format csv --workers 8
+"""
+import argparse, csv, json, os, random, re, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+from progress_store import ProgressJournal
+from session import Session, LEVELS
+from srs import SRSStore
+from utils import ensure_data_dir
+
+POOL_MIN_LEARNERS = 64               # меньше — быстрее без процессов
+CSV_FIELDS = ("n", "title", "comment")
+
+
+# ─────────────────── ростер ───────────────────
+def read_roster(path: str) -> list[dict]:
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8-sig") as f:
+            rows = json.load(f)
+    else:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f, delimiter="\t" if path.lower().endswith(".tsv") else ","))
+
+    roster, names = [], set()
+    for i, r in enumerate(rows, start=1):
+        name = str(r.get("name") or "").strip()
+        if not name:
+            raise ValueError(f"{path}: строка {i}: нет имени")
+        if safe_name(name) in names:                # одно имя файла на ученика
+            raise ValueError(f"{path}: ученик «{name}» указан дважды")
+        names.add(safe_name(name))
+        level = str(r.get("level") or "N5").upper()
+        if level not in LEVELS:
+            raise ValueError(f"{path}: {name}: неизвестный уровень {level}")
+        roster.append({
+            "name": name,
+            "level": level,
+            "mode": str(r.get("mode") or "grammar"),
+            "count": int(r.get("count") or 5),
+            "srs": str(r.get("srs", "")).lower() in ("1", "true", "yes", "да"),
+        })
+    return roster
+
+
+def safe_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name).strip("._") or "learner"
+
+
+# ─────────────────── один ученик ───────────────────
+def learner_session(learner: dict, seed, state_dir: str | None, out_dir: str,
+                    fmt: str, dry_run: bool = False) -> dict:
+    """Элементы на сегодня для одного ученика → файл; сводка для отчёта."""
+    name = learner["name"]
+    session = Session()
+    journal = srs = None
+    if state_dir:
+        base = os.path.join(state_dir, safe_name(name))
+        journal = ProgressJournal(base + ".json", session.snapshot)
+        if (data := journal.load()) is not None:
+            session.apply(data)
+        if learner["srs"]:
+            srs = SRSStore(base + ".srs.json")
+            srs.load()
+
+    # настройки ростера главнее сохранённых; смена уровня — новый пул
+    if session.user_level != learner["level"] and session.grammar_source == "builtin":
+        session.grammar_pool.clear()
+    session.user_name = name
+    session.user_level = learner["level"]
+    session.mode = learner["mode"]
+    session.selected_count = learner["count"]
+    session.srs_enabled = srs is not None
+
+    rng = random.Random(f"{seed}:{name}")
+    items = session.today_items(rng=rng, srs=srs)
+
+    if journal is not None and not dry_run:
+        journal.write([], journal.prepare_snapshot())
+
+    path = os.path.join(out_dir, f"{safe_name(name)}.{fmt}")
+    rows = [(x if isinstance(x, (list, tuple)) else (x, "")) for x in items]
+    if fmt == "csv":
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(CSV_FIELDS)
+            w.writerows((i, t, c) for i, (t, c) in enumerate(rows, start=1))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "name": name, "level": session.user_level, "mode": session.mode,
+                "seed": seed, "srs": session.srs_enabled,
+                "items": [{"title": t, "comment": c} for t, c in rows],
+                "remaining": {"grammar": len(session.grammar_pool),
+                              "forms": len(session.forms_pool),
+                              **({"constructions": len(session.constructions_pool)}
+                                 if session.constructions_pool is not None else {})},
+            }, f, ensure_ascii=False, indent=2)
+    return {"name": name, "items": len(items), "file": path}
+
+
+def _run_chunk(args) -> list[dict]:
+    chunk, seed, state_dir, out_dir, fmt, dry_run = args
+    return [learner_session(l, seed, state_dir, out_dir, fmt, dry_run) for l in chunk]
+
+
+def generate(roster, seed, out_dir, fmt="json", state_dir=None,
+             workers=None, dry_run=False) -> list[dict]:
+    """
+    Сессии для всего ростера. Большие ростеры делятся на куски и идут
+    в пул процессов (каждый процесс читает контент один раз).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if state_dir:
+        os.makedirs(state_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(roster) < POOL_MIN_LEARNERS:
+        return _run_chunk((roster, seed, state_dir, out_dir, fmt, dry_run))
+
+    size = max(8, len(roster) // (workers * 4))
+    chunks = [(roster[i:i + size], seed, state_dir, out_dir, fmt, dry_run)
+              for i in range(0, len(roster), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [r for part in pool.map(_run_chunk, chunks) for r in part]
+
+
+# ─────────────────── точка входа ───────────────────
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Сессии на сегодня для группы учеников.")
+    ap.add_argument("roster", help="JSON / CSV / TSV: name, level, mode, count[, srs]")
+    ap.add_argument("--out", default="sessions", help="папка для файлов учеников")
+    ap.add_argument("--format", choices=("json", "csv"), default="json")
+    ap.add_argument("--seed", default="0", help="один seed → одинаковые сессии")
+    ap.add_argument("--state-dir", default="data/classroom",
+                    help="прогресс учеников ('' — не сохранять)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--dry-run", action="store_true", help="не записывать прогресс")
+    args = ap.parse_args(argv)
+
+    try:
+        roster = read_roster(args.roster)
+    except (OSError, ValueError) as e:
+        print(f"[LOAD ERROR] {e}", file=sys.stderr)
+        return 1
+
+    ensure_data_dir()
+    t0 = time.perf_counter()
+    results = generate(roster, args.seed, args.out, args.format,
+                       args.state_dir or None, args.workers, args.dry_run)
+    dt = time.perf_counter() - t0
+    print(f"{len(results)} учеников, {sum(r['items'] for r in results)} элементов "
+          f"за {dt:.2f} с → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# ─── conjugation.py ────────────────────────────────────────────────────────
+"""
+Спряжение глаголов по правилам из lessons.json (formation.group_1/2/3).
+
+classify() относит глагол в словарной форме к 五段 / 一段 / неправильным
+(する, 来る, 行く, ある, вежливые 〜る с основой на 〜い) с учётом списка
+исключений 〜いる/〜える, которые спрягаются как 五段. する — только сам
+по себе или после существительного (勉強する, コピーする, びっくりする):
+こする, さする — обычные 五段; 出来る — 一段, а не 来る. conjugate()
+запоминает результат для каждого глагола; conjugate_many() / table()
+спрягают сразу тысячи глаголов (таблица — в формате
+conjugation_table_with_translations.json, её понимает FormGuide).
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+# порядок форм = порядок строк таблицы; покрывает MainMenu.BUILTIN_FORMS
+FORMS = (
+    "Plain-form", "Masu-form", "Masu-stem", "Te-form", "Ta-form",
+    "Progressive-form", "Negative-form", "Past-negative-form",
+    "Passive-form", "Causative-form", "Causative-passive-form",
+    "Imperative-form", "Command-form", "Ba-form", "Tara-form",
+    "Potential-form", "Volitional-form",
+)
+
+GODAN, ICHIDAN, SURU, KURU = "godan", "ichidan", "suru", "kuru"
+
+# окончание 五段 → (あ, い, え, お)-ряд
+_ROWS = {
+    "う": "わいえお", "く": "かきけこ", "ぐ": "がぎげご", "す": "さしせそ",
+    "つ": "たちてと", "ぬ": "なにねの", "ぶ": "ばびべぼ", "む": "まみめも",
+    "る": "らりれろ",
+}
+# окончание 五段 → окончание て-формы
+_TE = {"う": "って", "つ": "って", "る": "って", "む": "んで", "ぶ": "んで",
+       "ぬ": "んで", "く": "いて", "ぐ": "いで", "す": "して"}
+
+_I_E_KANA = set("いきぎしじちぢにひびぴみりえけげせぜてでねへべぺめれ")
+
+# 〜いる / 〜える, спрягающиеся как 五段
+# (кана без иероглифа — только однозначные: きる/かえる/へる читаются двояко)
+GODAN_RU = frozenset("""
+帰る 入る 走る 知る 切る 要る 減る 喋る 滑る 握る 限る 蹴る 焦る 参る 散る
+茂る 湿る 嘲る 遮る 罵る 捻る 翻る 覆る 混じる 交じる 練る 照る 陥る 甦る
+蘇る 弄る 詰る 耽る 謙る 煎る 炒る 湿気る
+はいる はしる しる しゃべる すべる にぎる かぎる ける あせる まいる いじる
+""".split())
+_GODAN_RU_SUFFIX = tuple(x for x in GODAN_RU if len(x) > 2)
+
+# 一段, где перед る стоит один иероглиф (見る, 寝る, 居る …)
+ICHIDAN_KANJI = frozenset("""
+見る 寝る 居る 着る 出る 似る 煮る 得る 経る 射る 鋳る 干る
+""".split())
+
+# вежливые глаголы: ます-основа на い (いらっしゃる → いらっしゃいます)
+HONORIFIC = frozenset("""
+いらっしゃる おっしゃる くださる 下さる なさる ござる 仰る
+""".split())
+_HONORIFIC_SUFFIX = tuple(HONORIFIC)
+
+
+_HIRAGANA = set(chr(c) for c in range(ord("ぁ"), ord("ゖ") + 1))
+
+
+# ─────────────────── классификация ───────────────────
+def _is_suru(verb: str) -> bool:
+    """する или существительное + する; одна кана перед する — 五段 (こする, かする)."""
+    if not verb.endswith("する"):
+        return False
+    noun = verb[:-2]
+    return not noun or len(noun) > 1 or noun not in _HIRAGANA
+
+
+def classify(verb: str) -> str:
+    """Группа глагола; ValueError, если это не словарная форма."""
+    if _is_suru(verb):
+        return SURU
+    if verb.endswith("出来る"):
+        return ICHIDAN                               # できる, не 来る
+    if verb == "くる" or verb.endswith(("来る", "てくる", "でくる")):
+        return KURU                                  # 持って来る, 持ってくる; не つくる
+    last = verb[-1:]
+    if last not in _ROWS:
+        raise ValueError(f"«{verb}» — не глагол в словарной форме")
+    if last != "る" or len(verb) < 2:
+        return GODAN
+    if verb in GODAN_RU or verb.endswith(_GODAN_RU_SUFFIX):
+        return GODAN
+    if verb[-2] in _I_E_KANA:
+        return ICHIDAN
+    return ICHIDAN if verb in ICHIDAN_KANJI or verb[-2:] in ICHIDAN_KANJI else GODAN
+
+
+# ─────────────────── образование форм ───────────────────
+def _ichidan(stem: str) -> tuple:
+    return (stem + "る", stem + "ます", stem, stem + "て", stem + "た",
+            stem + "ている", stem + "ない", stem + "なかった",
+            stem + "られる", stem + "させる", stem + "させられる",
+            stem + "ろ", stem + "なさい", stem + "れば", stem + "たら",
+            stem + "られる", stem + "よう")
+
+
+def _godan(verb: str) -> tuple:
+    stem, end = verb[:-1], verb[-1]
+    a, i, e, o = _ROWS[end]
+    te = _TE[end]
+    if verb.endswith(("行く", "いく", "逝く")):
+        te = "って"                                   # 行く → 行って
+    if verb.endswith(_HONORIFIC_SUFFIX):
+        i = e = "い"                                  # いらっしゃいます / いらっしゃい
+    ta, masu = te[0] + ("た" if te[1] == "て" else "だ"), stem + i
+    neg = stem + a + "ない"
+    if verb in ("ある", "有る", "在る"):
+        neg = "ない"
+    return (verb, masu + "ます", masu, stem + te, stem + ta,
+            stem + te + "いる", neg, neg[:-1] + "かった",
+            stem + a + "れる", stem + a + "せる", stem + a + "せられる",
+            stem + e, masu + "なさい", stem + _ROWS[end][2] + "ば", stem + ta + "ら",
+            stem + _ROWS[end][2] + "る", stem + o + "う")
+
+
+def _suru(verb: str) -> tuple:
+    p = verb[:-2]
+    return (verb, p + "します", p + "し", p + "して", p + "した",
+            p + "している", p + "しない", p + "しなかった",
+            p + "される", p + "させる", p + "させられる",
+            p + "しろ", p + "しなさい", p + "すれば", p + "したら",
+            p + "できる", p + "しよう")
+
+
+def _kuru(verb: str) -> tuple:
+    p = verb[:-2]
+    if verb.endswith("来る"):                        # кандзи один на все основы
+        ki = ko = ku = p + "来"
+    else:
+        ki, ko, ku = p + "き", p + "こ", p + "く"
+    return (verb, ki + "ます", ki, ki + "て", ki + "た",
+            ki + "ている", ko + "ない", ko + "なかった",
+            ko + "られる", ko + "させる", ko + "させられる",
+            ko + "い", ki + "なさい", ku + "れば", ki + "たら",
+            ko + "られる", ko + "よう")
+
+
+@lru_cache(maxsize=8192)                # ~1.5 КБ на глагол
+def _forms(verb: str) -> tuple:
+    group = classify(verb)
+    if group == ICHIDAN:
+        return _ichidan(verb[:-1])
+    if group == SURU:
+        return _suru(verb)
+    if group == KURU:
+        return _kuru(verb)
+    return _godan(verb)
+
+
+def conjugate(verb: str) -> MappingProxyType:
+    """Все формы из FORMS для одного глагола (результат запоминается)."""
+    return MappingProxyType(dict(zip(FORMS, _forms(verb.strip()))))
+
+
+def conjugate_many(verbs) -> tuple[list[tuple[str, tuple]], list[str]]:
+    """
+    Пачка глаголов → ([(глагол, формы в порядке FORMS), …], отвергнутые).
+    Повторы спрягаются один раз, порядок первого появления сохраняется.
+    """
+    out, rejected, seen = [], [], set()
+    forms = _forms
+    for v in verbs:
+        v = v.strip()
+        if not v or v in seen:
+            continue
+        seen.add(v)
+        try:
+            out.append((v, forms(v)))
+        except ValueError:
+            rejected.append(v)
+    return out, rejected
+
+
+def table(verbs) -> tuple[dict, list[str]]:
+    """Таблица {"columns": глаголы, "rows": [{"form", "values"}]} + отвергнутые."""
+    done, rejected = conjugate_many(verbs)
+    columns = [v for v, _ in done]
+    rows = [{"form": name, "values": [f[i] for _, f in done]}
+            for i, name in enumerate(FORMS)]
+    return {"columns": columns, "rows": rows}, rejected
+
+
+def cache_info():
+    return _forms.cache_info()
@@ -0,0 +1,402 @@
+# ─── content.py ────────────────────────────────────────────────────────────
+"""
+Общий репозиторий учебного контента (*.json сборки и правки в data/).
+
+Каждый набор данных читается с диска один раз и отдаётся всем окнам
+в виде read-only представления: записи records.py (уроки, конструкции,
+грамматика, строки спряжения), прочие dict → MappingProxyType, list → tuple.
+Кэш сбрасывается только если у файла изменились mtime или размер.
+Счётчики hits / misses показывают, сколько раз обращения обошлись без диска.
+
+Источник набора — слои overlay.py, без копирования при первом запуске:
+    1. data/<файл> — если пользователь его добавил или изменил;
+    2. content.pack (см. content_pack.py), если он не старше JSON сборки:
+       пакет отображается в память, записи декодируются по требованию;
+    3. JSON сборки (рядом с программой или в _MEIPASS).
+"""
+import json, os, shutil, threading
+
+import perf
+import records
+from content_pack import ContentPack, PACK_NAME
+from overlay import DataOverlay, file_sha1, file_stamp as _stamp
+from utils import resource_path
+
+DATA_DIR = "data"
+
+# имя набора → файл в data/
+DATASETS = {
+    "facts":        "facts_200.json",
+    "lessons":      "lessons.json",
+    "grammar_n5":   "grammar_n5.json",
+    "grammar_n4":   "grammar_n4.json",
+    "grammar_n3":   "grammar_n3.json",
+    "constructions": "grammar_constructions.json",
+    "conjugation":  "conjugation_table_with_translations.json",
+}
+
+
+def _require(ok: bool, name: str, what: str) -> None:
+    if not ok:
+        raise ValueError(f"{DATASETS[name]}: {what}")
+
+
+def validate(name: str, data) -> None:
+    """
+    Проверка формы набора до того, как он заменит прежнюю версию:
+    полусохранённый или испорченный руками файл не должен ломать окна.
+    """
+    if name == "lessons":
+        _require(isinstance(data, dict) and data, name, "ожидался непустой объект {форма: урок}")
+        for form, lesson in data.items():
+            _require(isinstance(lesson, dict), name, f"{form}: урок должен быть объектом")
+    elif name == "conjugation":
+        _require(isinstance(data, dict) and isinstance(data.get("columns"), list)
+                 and isinstance(data.get("rows"), list), name, "нужны списки columns и rows")
+    elif name == "facts":
+        _require(isinstance(data, list) and all(isinstance(x, str) for x in data),
+                 name, "ожидался список строк")
+    else:                                         # grammar_n*, constructions
+        _require(isinstance(data, list), name, "ожидался список записей")
+        for i, x in enumerate(data):
+            _require(isinstance(x, dict) and isinstance(x.get("title"), str),
+                     name, f"запись {i}: нет title")
+
+
+class ContentRepository:
+    """Ленивый кэш наборов данных с инвалидацией по mtime/size."""
+
+    def __init__(self, data_dir: str = DATA_DIR,
+                 pack_path: str | None = None, bundle_dir: str | None = None):
+        self.data_dir = data_dir
+        self.pack_path = pack_path or resource_path(PACK_NAME)
+        self.overlay = DataOverlay(data_dir, bundle_dir or resource_path(""))
+        self._pack: ContentPack | None = None
+        self._pack_stamp = None
+        self._cache: dict[str, tuple[tuple, object]] = {}
+        self._sources: dict[str, str] = {}      # имя → откуда взята версия в кэше
+        self._bundle_sha: dict[str, tuple] = {}  # путь → (штамп, sha1) JSON сборки
+        self._paths = {name: (self.overlay.user_path(f), self.overlay.bundle_path(f))
+                       for name, f in DATASETS.items()}
+        self._versions: dict[str, int] = {}
+        self._rejected: dict[str, tuple] = {}    # штамп файла, не прошедшего проверку
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def path(self, name: str) -> str:
+        """data/<файл>: пользовательская версия набора (может и не существовать)."""
+        return self._paths[name][0]
+
+    def bundle_path(self, name: str) -> str:
+        return self._paths[name][1]
+
+    def _stamps(self, name: str) -> tuple:
+        """(data/, JSON сборки, пакет) — смена любого штампа → перечитать."""
+        user, bundle = self._paths[name]
+        return _stamp(user), _stamp(bundle), self._pack_stamp
+
+    def get(self, name: str):
+        """
+        Возвращает набор `name` (read-only). Файл перечитывается только
+        если изменился его штамп (mtime, size) или пересобран пакет.
+        Ошибки чтения/парсинга пробрасываются вызывающему коду, если
+        прежней версии нет; если есть — остаётся она (файл сохраняют
+        прямо сейчас или испортили), ошибка пишется в лог.
+        Потокобезопасно: окна грузят наборы через tk_executor.
+        """
+        with self._lock:                     # загрузка может идти из пула потоков
+            pack = self.pack()
+            stamp = self._stamps(name)
+            cached = self._cache.get(name)
+            if cached is not None and stamp in (cached[0], self._rejected.get(name)):
+                self.hits += 1
+                return cached[1]
+
+            self.misses += 1
+            try:
+                value, source = self._load(name, pack, stamp)
+            except (OSError, ValueError) as e:
+                if cached is None:
+                    raise
+                self._rejected[name] = stamp
+                perf.error("LOAD ERROR", e)
+                return cached[1]
+            self._swap(name, stamp, value, source)
+            return value
+
+    def cached(self, name: str):
+        """
+        Набор из кэша без проверки штампа файла — для частых мелких выборок
+        (факт / совет в главном окне). Правки файла сюда приходят через
+        reload() от наблюдателя data/; пока набора в кэше нет — как get().
+        """
+        entry = self._cache.get(name)
+        if entry is None:
+            return self.get(name)
+        self.hits += 1
+        return entry[1]
+
+    def peek(self, name: str):
+        """Набор из кэша или None — без обращения к диску (для потока Tk)."""
+        entry = self._cache.get(name)
+        return None if entry is None else entry[1]
+
+    def reload(self, name: str) -> bool:
+        """
+        Перечитать набор после правки файла (наблюдатель data/, фоновый
+        поток). Разбор и проверка идут вне блокировки, подмена — под ней:
+        читатели видят либо старую версию, либо новую целиком. True —
+        версия сменилась; OSError / ValueError — файл битый, в кэше
+        остаётся прежняя версия.
+        """
+        with self._lock:
+            pack = self.pack()
+            stamp = self._stamps(name)
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == stamp:
+                return False
+        try:
+            value, source = self._load(name, pack, stamp)
+        except (OSError, ValueError):
+            with self._lock:
+                self._rejected[name] = stamp
+            raise
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is not None and cached[0] == stamp:
+                return False                  # get() успел первым
+            self._swap(name, stamp, value, source)
+        return True
+
+    def _load(self, name: str, pack, stamp: tuple) -> tuple[object, str]:
+        """(набор, источник): user:<штамп> / pack:<sha1> / bundle:<штамп>."""
+        user_stamp, bundle_stamp, _ = stamp
+        packed = pack is not None and pack.is_fresh(name, bundle_stamp)
+        user = self.overlay.resolve(
+            DATASETS[name], lambda: self._bundle_sha1(name, pack if packed else None))
+        if not user and packed:
+            with perf.span("content.load", name=name, source="pack"):
+                return (pack.load(name, records.decoder(name)),
+                        "pack:" + pack.datasets[name].sha1.hex())
+        path, layer, file_stamp = ((user, "user", user_stamp) if user
+                                   else (self.bundle_path(name), "bundle", bundle_stamp))
+        with perf.span("content.load", name=name, source=layer):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            validate(name, data)
+            return (records.freeze_dataset(name, data),
+                    f"{layer}:{file_stamp[0]}:{file_stamp[1]}")
+
+    def _bundle_sha1(self, name: str, pack) -> str | None:
+        """sha1 текущей версии набора в сборке (для штампов overlay)."""
+        if pack is not None:
+            return pack.datasets[name].sha1.hex()
+        path = self.bundle_path(name)
+        stamp = _stamp(path)
+        if stamp is None:
+            return None
+        known = self._bundle_sha.get(path)
+        if known is None or known[0] != stamp:
+            known = self._bundle_sha[path] = (stamp, file_sha1(path))
+        return known[1]
+
+    def _swap(self, name: str, stamp: tuple, value, source: str) -> None:
+        self._cache[name] = (stamp, value)
+        self._sources[name] = source
+        self._versions[name] = self._versions.get(name, 0) + 1
+        self._rejected.pop(name, None)
+
+    def pack(self) -> ContentPack | None:
+        """content.pack (если есть); переоткрывается при пересборке."""
+        stamp = _stamp(self.pack_path)
+        if stamp != self._pack_stamp:
+            # старый пакет не закрываем: его PackedList / PackedMapping могут
+            # держать окна, пулы и индекс поиска; mmap закроется сборщиком,
+            # когда отпустят последнее представление
+            self._pack = ContentPack.open(self.pack_path) if stamp else None
+            self._pack_stamp = stamp
+            self._cache.clear()
+        return self._pack
+
+    def version(self, name: str) -> int:
+        """Номер версии набора: растёт при каждой (пере)загрузке файла."""
+        return self._versions.get(name, 0)
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Сбросить кэш одного набора (или всех)."""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def source_stamp(self, name: str) -> str:
+        """
+        Отпечаток источника набора, переживающий перезапуск программы
+        (для кэшей на диске, например индекса поиска).
+        """
+        self.get(name)
+        with self._lock:
+            return self._sources[name]
+
+    def extract(self, names=None) -> list[str]:
+        """
+        JSON сборки → data/ для правки (content.pack не редактируется).
+        Файлы, которые в data/ уже есть, не трогаются; копия совпадает со
+        сборкой и остаётся нетронутой, пока её не изменят. Возвращает
+        пути записанных файлов.
+        """
+        os.makedirs(self.data_dir, exist_ok=True)
+        written = []
+        for name in names or DATASETS:
+            user, bundle = self._paths[name]
+            if os.path.exists(user) or not os.path.exists(bundle):
+                continue
+            shutil.copyfile(bundle, user)
+            self.overlay.add_copy(DATASETS[name])
+            written.append(user)
+        return written
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "loaded": sorted(self._cache),
+            "pack": self._pack.path if self._pack else None,
+            "sources": {name: src.split(":", 1)[0] for name, src in self._sources.items()},
+            "overrides": self.overlay.overrides(),
+        }
+
+
+# ─────────────────── индекс конструкций ───────────────────
+JLPT_ORDER = {"N5": 0, "N4": 1, "N3": 2, "N2": 3, "N1": 4}
+
+# нижняя граница частоты (%) → полоса
+FREQUENCY_BANDS = ((90, "high"), (75, "mid"), (0, "low"))
+
+
+# уровень конструкции минус уровень ученика → множитель веса в выборке
+LEVEL_WEIGHTS = {0: 1.0, -1: 0.5, 1: 0.3}         # свой / на ступень проще / сложнее
+OTHER_LEVEL_WEIGHT = 0.1
+MIN_FREQUENCY = 1                                 # частота не указана или 0 → всё же шанс есть
+
+
+def construction_weight(c, level: str) -> float:
+    """Вес конструкции для ученика уровня level: частота (%) × близость уровня."""
+    freq = max(c.get("frequency") or 0, MIN_FREQUENCY)
+    diff = JLPT_ORDER.get(c.get("jlpt", "N5"), 5) - JLPT_ORDER.get(level, 0)
+    return freq * LEVEL_WEIGHTS.get(diff, OTHER_LEVEL_WEIGHT)
+
+
+def frequency_band(freq) -> str:
+    for low, band in FREQUENCY_BANDS:
+        if (freq or 0) >= low:
+            return band
+    return FREQUENCY_BANDS[-1][1]
+
+
+class ConstructionIndex:
+    """
+    Предрасчитанные корзины конструкций: форма / уровень JLPT / полоса частоты.
+    Все корзины — кортежи, уже отсортированные по JLPT (N5 → N1),
+    внутри уровня сохраняется порядок из файла.
+    """
+
+    version: tuple = ()
+
+    def __init__(self, constructions, forms=()):
+        ordered = sorted(constructions,
+                         key=lambda c: JLPT_ORDER.get(c.get("jlpt", "N5"), 5))
+
+        by_form:  dict[str, list] = {f: [] for f in forms}
+        by_jlpt:  dict[str, list] = {}
+        by_band:  dict[str, list] = {}
+        for c in ordered:
+            by_form.setdefault(c.get("form"), []).append(c)
+            by_jlpt.setdefault(c.get("jlpt", "N5"), []).append(c)
+            by_band.setdefault(frequency_band(c.get("frequency")), []).append(c)
+
+        self.by_form = {k: tuple(v) for k, v in by_form.items()}
+        self.by_jlpt = {k: tuple(v) for k, v in by_jlpt.items()}
+        self.by_band = {k: tuple(v) for k, v in by_band.items()}
+
+    def for_form(self, form: str) -> tuple:
+        return self.by_form.get(form, ())
+
+    def for_level(self, level: str) -> tuple:
+        return self.by_jlpt.get(level, ())
+
+    def for_band(self, band: str) -> tuple:
+        return self.by_band.get(band, ())
+
+    def forms(self) -> list[str]:
+        return list(self.by_form)
+
+
+# ─────────────────── общий экземпляр для всех окон ───────────────────
+repo = ContentRepository()
+
+_index_cache: dict[tuple, ConstructionIndex] = {}
+_weights_cache: dict[tuple, tuple] = {}
+
+
+def get(name: str):
+    return repo.get(name)
+
+
+def cached(name: str):
+    return repo.cached(name)
+
+
+def peek(name: str):
+    return repo.peek(name)
+
+
+def reload(names) -> tuple[set[str], dict[str, Exception]]:
+    """Перечитать изменённые наборы: (сменившие версию, {имя: ошибка})."""
+    changed, errors = set(), {}
+    for name in names:
+        try:
+            if repo.reload(name):
+                changed.add(name)
+        except (OSError, ValueError) as e:
+            errors[name] = e
+    return changed, errors
+
+
+def grammar(level: str):
+    """Встроенный список грамматики уровня N5/N4/N3."""
+    return repo.get(f"grammar_{level.lower()}")
+
+
+def construction_index(forms=()) -> ConstructionIndex:
+    """
+    Индекс конструкций для текущей версии данных. Строится один раз на
+    версию grammar_constructions.json + lessons.json (+ список `forms`,
+    например MainMenu.BUILTIN_FORMS), дальше отдаётся из кэша.
+    """
+    data = repo.get("constructions")
+    lessons = repo.get("lessons")
+    key = (repo.version("constructions"), repo.version("lessons"), tuple(forms))
+    idx = _index_cache.get(key)
+    if idx is None:
+        _index_cache.clear()                 # старые версии больше не нужны
+        idx = _index_cache[key] = ConstructionIndex(data, (*lessons, *forms))
+        idx.version = key[:2]                # для кэшей, построенных поверх индекса
+    return idx
+
+
+def construction_weights(level: str) -> tuple[float, ...]:
+    """
+    Веса всех конструкций (по порядку файла) для уровня level. Один
+    кортеж на версию grammar_constructions.json и уровень: по тождеству
+    кортежа Session понимает, что веса пула устарели.
+    """
+    data = repo.get("constructions")
+    key = (repo.version("constructions"), level)
+    weights = _weights_cache.get(key)
+    if weights is None:
+        if len(_weights_cache) > 8:
+            _weights_cache.clear()
+        weights = _weights_cache[key] = tuple(construction_weight(c, level) for c in data)
+    return weights
@@ -0,0 +1,230 @@
+# ─── content_pack.py ───────────────────────────────────────────────────────
+"""
+Скомпилированный бинарный пакет контента (content.pack).
+
+Сборка:   python content_pack.py [out.pack]   (вызывается и из .spec)
+Чтение:   ContentPack.open(path) → mmap, записи декодируются по требованию.
+
+Формат (little-endian):
+    header   : b"JTPK" | u16 FORMAT_VERSION | u16 кол-во наборов | u64 время сборки
+    dataset  : u8 len | имя (utf-8) | u8 kind | u64 size | u64 mtime_ns
+               | 20 байт sha1 исходника | u32 кол-во записей | u64 смещение таблицы
+               | u64 смещение ключей | u32 длина ключей
+    таблица  : на каждую запись  u64 offset | u32 length
+    записи   : компактный JSON (utf-8): элемент списка / значение dict-набора
+    ключи    : у dict-наборов — JSON-массив ключей по порядку записей
+               (открытие набора читает только его, значения — по требованию)
+
+Пакет собирается из JSON сборки (они лежат рядом с content.pack): если
+такой JSON новее или другого размера, чем при сборке пакета, пакет для
+этого набора считается устаревшим (см. ContentPack.is_fresh). Правки
+пользователя в data/ сюда не относятся — их поверх сборки накладывает
+overlay.DataOverlay.
+"""
+import hashlib, json, mmap, os, struct, sys, time
+from collections.abc import Mapping, Sequence
+
+MAGIC = b"JTPK"
+FORMAT_VERSION = 2                       # 2: ключи dict-наборов — отдельной секцией
+PACK_NAME = "content.pack"
+
+KIND_LIST, KIND_DICT = 0, 1
+
+_HEADER = struct.Struct("<4sHHQ")
+_ENTRY = struct.Struct("<BQQ20sIQQI")
+_SLOT = struct.Struct("<QI")
+
+
+# ─────────────────── сборка ───────────────────
+def _compact(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def build(out_path: str, sources: dict[str, str]) -> None:
+    """
+    Компилирует наборы `sources` (имя → путь к JSON) в один пакет.
+    Файл пишется во временный и атомарно подменяет старый.
+    """
+    datasets = []
+    for name, path in sources.items():
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw.decode("utf-8"))
+        st = os.stat(path)
+        if isinstance(data, dict):
+            kind, items, keys = KIND_DICT, list(data.values()), _compact(list(data))
+        elif isinstance(data, list):
+            kind, items, keys = KIND_LIST, data, b""
+        else:
+            raise ValueError(f"{path}: ожидался list или dict")
+        records = [_compact(x) for x in items]
+        datasets.append((name, kind, st.st_size, st.st_mtime_ns,
+                         hashlib.sha1(raw).digest(), records, keys))
+
+    # сначала считаем размер заголовков, чтобы знать абсолютные смещения
+    head_len = _HEADER.size + sum(1 + len(n.encode("utf-8")) + _ENTRY.size
+                                  for n, *_ in datasets)
+    body = bytearray()
+    entries = []
+    for name, kind, size, mtime, sha, records, keys in datasets:
+        slots = bytearray()
+        for rec in records:
+            slots += _SLOT.pack(head_len + len(body), len(rec))
+            body += rec
+        table_off = head_len + len(body)
+        body += slots
+        entries.append((name, kind, size, mtime, sha, len(records), table_off,
+                        head_len + len(body), len(keys)))
+        body += keys
+
+    out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), time.time_ns()))
+    for name, *entry in entries:
+        bname = name.encode("utf-8")
+        out += bytes([len(bname)]) + bname
+        out += _ENTRY.pack(*entry)
+    out += body
+
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(out)
+    os.replace(tmp, out_path)
+
+
+# ─────────────────── чтение ───────────────────
+class _Dataset:
+    __slots__ = ("name", "kind", "size", "mtime_ns", "sha1", "count", "table",
+                 "keys_off", "keys_len")
+
+    def __init__(self, name, kind, size, mtime_ns, sha1, count, table, keys_off, keys_len):
+        self.name, self.kind = name, kind
+        self.size, self.mtime_ns, self.sha1 = size, mtime_ns, sha1
+        self.count, self.table = count, table
+        self.keys_off, self.keys_len = keys_off, keys_len
+
+
+class PackedList(Sequence):
+    """Read-only список, записи которого декодируются при первом обращении."""
+
+    def __init__(self, pack, ds, decode):
+        self._pack, self._ds, self._decode = pack, ds, decode
+        self._cache: dict[int, object] = {}
+
+    def __len__(self):
+        return self._ds.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self[j] for j in range(*i.indices(len(self))))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < self._ds.count:
+            raise IndexError(i)
+        try:
+            return self._cache[i]
+        except KeyError:
+            v = self._cache[i] = self._decode(self._pack._record(self._ds, i))
+            return v
+
+
+class PackedMapping(Mapping):
+    """Read-only dict: ключи — из секции ключей сразу, значения — по требованию."""
+
+    def __init__(self, pack, ds, decode):
+        self._items = PackedList(pack, ds, decode)
+        self._keys = {k: i for i, k in enumerate(pack._keys(ds))}
+
+    def __getitem__(self, key):
+        return self._items[self._keys[key]]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class ContentPack:
+    def __init__(self, path: str, mm: mmap.mmap, built_ns: int,
+                 datasets: dict[str, _Dataset]):
+        self.path = path
+        self.built_ns = built_ns
+        self.datasets = datasets
+        self._mm = mm
+
+    @classmethod
+    def open(cls, path: str):
+        """Открывает пакет; None если файла нет или формат не тот."""
+        try:
+            f = open(path, "rb")
+        except OSError:
+            return None
+        with f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:                    # пустой файл
+                return None
+        try:
+            magic, ver, n, built = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or ver != FORMAT_VERSION:
+                mm.close()
+                return None
+            pos, datasets = _HEADER.size, {}
+            for _ in range(n):
+                ln = mm[pos]
+                name = mm[pos + 1:pos + 1 + ln].decode("utf-8")
+                pos += 1 + ln
+                datasets[name] = _Dataset(name, *_ENTRY.unpack_from(mm, pos))
+                pos += _ENTRY.size
+        except (struct.error, IndexError, UnicodeDecodeError):
+            mm.close()
+            return None
+        return cls(path, mm, built, datasets)
+
+    def __contains__(self, name):
+        return name in self.datasets
+
+    def is_fresh(self, name: str, stamp) -> bool:
+        """
+        Пакет актуален для набора, если JSON сборки рядом с пакетом
+        отсутствует (stamp=None) либо совпадает по размеру и не новее
+        исходника на момент сборки.
+        """
+        ds = self.datasets.get(name)
+        if ds is None:
+            return False
+        if stamp is None:
+            return True
+        mtime_ns, size = stamp
+        return size == ds.size and mtime_ns <= ds.mtime_ns
+
+    def _record(self, ds: _Dataset, i: int):
+        off, ln = _SLOT.unpack_from(self._mm, ds.table + i * _SLOT.size)
+        return json.loads(self._mm[off:off + ln].decode("utf-8"))
+
+    def _keys(self, ds: _Dataset) -> list:
+        return json.loads(self._mm[ds.keys_off:ds.keys_off + ds.keys_len].decode("utf-8"))
+
+    def load(self, name: str, decode=lambda x: x):
+        """Ленивое представление набора (PackedList / PackedMapping)."""
+        ds = self.datasets[name]
+        if ds.kind == KIND_DICT:
+            return PackedMapping(self, ds, decode)
+        return PackedList(self, ds, decode)
+
+    def close(self):
+        """
+        Явное закрытие — только когда представлений набора (PackedList /
+        PackedMapping) гарантированно не осталось; иначе достаточно отпустить
+        ссылку: mmap закроется сборщиком вместе с последним представлением.
+        """
+        self._mm.close()
+
+
+# ─────────────────── шаг сборки ───────────────────
+if __name__ == "__main__":
+    import content
+    from utils import resource_path
+
+    out = sys.argv[1] if len(sys.argv) > 1 else resource_path(PACK_NAME)
+    build(out, {name: resource_path(fname) for name, fname in content.DATASETS.items()})
+    print(f"[PACK] {out}: {os.path.getsize(out)} байт, {len(content.DATASETS)} наборов")
@@ -0,0 +1,218 @@
+# ─── drill.py ──────────────────────────────────────────────────────────────
+"""
+Тренировка спряжения без Tk: «Дайте Ta-form от 飲む».
+
+Вопросы — пары (глагол, форма) из conjugation_table_with_translations.json
+и форм MainMenu.BUILTIN_FORMS. Верные ответы на каждую пару считаются
+заранее (AnswerTable, один раз на версию таблицы) и хранятся в
+нормализованном виде, так что проверка ответа — поиск во множестве:
+
+    • значение из таблицы (見(ら)れる → 見られる и 見れる);
+    • форма от генератора conjugation.py — для того же глагола и для его
+      чтения каной (飲んだ / のんだ);
+    • ввод приводится normalize(): NFKC (полу/полноширинные), катакана →
+      хирагана, ромадзи → кана (nonda, nomimasu, tabesaserareru).
+
+Drill держит следующий вопрос наготове, считает точность и время ответа
+по формам и сообщает каждый ответ через log("answer", …) — это записи
+для ProfileJournal("drill").
+"""
+import random, re, time
+
+import conjugation
+import content
+from search import fold
+from session import BUILTIN_FORMS
+
+# строки таблицы → названия форм BUILTIN_FORMS / conjugation.FORMS
+TABLE_FORMS = {
+    "Dictionary Form": "Plain-form", "Polite Form": "Masu-form",
+    "Masu Stem": "Masu-stem", "Te-Form": "Te-form", "Past Tense": "Ta-form",
+    "Continuous Form": "Progressive-form", "Negative Form": "Negative-form",
+    "Past-Negative Form": "Past-negative-form", "Passive Form": "Passive-form",
+    "Causative Form": "Causative-form", "Causative Passive Form": "Causative-passive-form",
+    "Imperative Form": "Imperative-form", "BA Hypothetical Form": "Ba-form",
+    "TARA Conditional Form": "Tara-form", "Potential Form": "Potential-form",
+    "Volitional Form": "Volitional-form",
+}
+
+# чтения глаголов встроенной таблицы: ответ каной тоже верен
+READINGS = {
+    "見る": "みる", "食べる": "たべる", "寝る": "ねる", "居る": "いる",
+    "考える": "かんがえる", "飲む": "のむ", "聞く": "きく", "死ぬ": "しぬ",
+    "急ぐ": "いそぐ", "話す": "はなす", "来る": "くる", "する": "する",
+}
+
+
+# ─────────────────── нормализация ответа ───────────────────
+_ROMAJI: dict[str, str] = {}
+for _c, _kana in {"": "あいうえお", "k": "かきくけこ", "g": "がぎぐげご",
+                  "s": "さしすせそ", "z": "ざじずぜぞ", "t": "たちつてと",
+                  "d": "だぢづでど", "n": "なにぬねの", "h": "はひふへほ",
+                  "b": "ばびぶべぼ", "p": "ぱぴぷぺぽ", "m": "まみむめも",
+                  "r": "らりるれろ"}.items():
+    _ROMAJI.update((_c + v, k) for v, k in zip("aiueo", _kana))
+for _c, _i in {"ky": "き", "gy": "ぎ", "ny": "に", "hy": "ひ", "by": "び",
+               "py": "ぴ", "my": "み", "ry": "り", "sh": "し", "ch": "ち",
+               "j": "じ", "sy": "し", "ty": "ち", "zy": "じ", "jy": "じ"}.items():
+    _ROMAJI.update((_c + v, _i + s) for v, s in zip("auo", "ゃゅょ"))
+_ROMAJI.update({"shi": "し", "chi": "ち", "tsu": "つ", "fu": "ふ", "ji": "じ",
+                "ya": "や", "yu": "ゆ", "yo": "よ", "wa": "わ", "wo": "を",
+                "n'": "ん", "-": "ー"})
+_VOWELS = set("aiueoy")
+_LATIN = re.compile(r"[a-z]")
+_PARENS = re.compile(r"\(([^)]*)\)")
+
+
+def romaji_to_kana(text: str) -> str:
+    """Хепбёрн / кунрэй → хирагана; незнакомые символы остаются как есть."""
+    out, i, n = [], 0, len(text)
+    while i < n:
+        c = text[i]
+        if c == text[i + 1:i + 2] and c.isalpha() and c not in _VOWELS and c != "n":
+            out.append("っ")                         # nomitta, kitte
+            i += 1
+            continue
+        for ln in (3, 2, 1):
+            kana = _ROMAJI.get(text[i:i + ln])
+            if kana is not None:
+                out.append(kana)
+                i += ln
+                break
+        else:
+            out.append("ん" if c == "n" else c)      # n перед согласной / в конце
+            i += 1
+    return "".join(out)
+
+
+def normalize(text: str) -> str:
+    """Ответ → каноническая запись для сравнения."""
+    text = fold(text).replace(" ", "").strip("。.")
+    return romaji_to_kana(text) if _LATIN.search(text) else text
+
+
+def variants(value: str) -> list[str]:
+    """見(ら)れる → [見られる, 見れる]."""
+    if "(" not in value:
+        return [value]
+    return [_PARENS.sub(r"\1", value), _PARENS.sub("", value)]
+
+
+# ─────────────────── таблица ответов ───────────────────
+class AnswerTable:
+    """(глагол, форма) → множество нормализованных верных ответов."""
+
+    __slots__ = ("answers", "shown", "hints", "questions", "version")
+
+    def __init__(self, table, forms=BUILTIN_FORMS, version=0):
+        rows = {TABLE_FORMS.get(r["form"], r["form"]): r["values"] for r in table["rows"]}
+        self.answers: dict[tuple, frozenset] = {}
+        self.shown: dict[tuple, str] = {}           # что показать как верный ответ
+        self.hints = {x["value"]: x["label"] for x in table.get("filter_labels", ())}
+        self.version = version
+
+        for col, verb in enumerate(table["columns"]):
+            generated = []
+            for v in (verb, READINGS.get(verb)):
+                try:
+                    generated.append(conjugation.conjugate(v) if v else {})
+                except ValueError:
+                    generated.append({})
+            for form in forms:
+                found = variants(rows[form][col]) if form in rows else []
+                found += [g[form] for g in generated if form in g]
+                if found:
+                    self.answers[(verb, form)] = frozenset(map(normalize, found))
+                    self.shown[(verb, form)] = rows[form][col] if form in rows else found[0]
+        self.questions = list(self.answers)
+
+    def check(self, question: tuple, text: str) -> bool:
+        return normalize(text) in self.answers[question]
+
+
+_tables: dict[int, AnswerTable] = {}
+
+
+def answer_table() -> AnswerTable:
+    """Таблица ответов для текущей версии conjugation_table_with_translations.json."""
+    table = content.get("conjugation")
+    version = content.repo.version("conjugation")
+    at = _tables.get(version)
+    if at is None:
+        _tables.clear()
+        at = _tables[version] = AnswerTable(table, version=version)
+    return at
+
+
+# ─────────────────── статистика по формам ───────────────────
+class FormStats:
+    __slots__ = ("attempts", "correct", "total_ms")
+
+    def __init__(self, attempts=0, correct=0, total_ms=0):
+        self.attempts = attempts
+        self.correct = correct
+        self.total_ms = total_ms
+
+    def add(self, ok: bool, ms: int) -> None:
+        self.attempts += 1
+        self.correct += ok
+        self.total_ms += ms
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.attempts if self.attempts else 0.0
+
+
+def _no_log(op: str, **fields) -> None:
+    pass
+
+
+# ─────────────────── тренировка ───────────────────
+class Drill:
+    """Очередь вопросов, проверка ответов и статистика одного ученика."""
+
+    def __init__(self, answers: AnswerTable, stats: dict | None = None,
+                 rng=random, log=None):
+        self.answers = answers
+        self.rng = rng
+        self.log = log or _no_log
+        self.stats = {f: FormStats(*v) for f, v in (stats or {}).items()}
+        self.pool = answers.questions
+        self.current: tuple | None = None
+        self.asked_at = 0.0
+        self._next = self._pick()
+
+    def set_forms(self, forms=None) -> None:
+        """Только выбранные формы (None — все); следующий вопрос — из них."""
+        self.pool = [q for q in self.answers.questions if forms is None or q[1] in forms]
+        self._next = self._pick()
+
+    def _pick(self) -> tuple | None:
+        if not self.pool:
+            return None
+        q = self.rng.choice(self.pool)
+        if q == self.current and len(self.pool) > 1:     # не повторять подряд
+            q = self.rng.choice(self.pool)
+        return q
+
+    def ask(self) -> tuple | None:
+        """Следующий вопрос (уже выбран); сразу выбираем ещё один про запас."""
+        self.current, self._next = self._next, None
+        self._next = self._pick()
+        self.asked_at = time.perf_counter()
+        return self.current
+
+    def answer(self, text: str) -> tuple[bool, str, int]:
+        """(верно ли, правильный ответ, время ответа в мс)."""
+        ms = round((time.perf_counter() - self.asked_at) * 1000)
+        q = self.current
+        ok = self.answers.check(q, text)
+        verb, form = q
+        self.stats.setdefault(form, FormStats()).add(ok, ms)
+        self.log("answer", verb=verb, form=form, answer=text.strip(),
+                 ok=ok, ms=ms, ts=time.time())
+        return ok, self.answers.shown[q], ms
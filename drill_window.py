@@ -0,0 +1,127 @@
+# ─── drill_window.py ───────────────────────────────────────────────────────
+"""
+Окно тренировки спряжения (кнопка в главном меню). Логика — в drill.py,
+здесь только вопрос, поле ответа, отклик и точность по формам.
+Таблица ответов и статистика профиля читаются в фоне; следующий вопрос
+выбран заранее, поэтому отклик и новый вопрос появляются сразу по Enter.
+"""
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+import drill
+from session import BUILTIN_FORMS
+
+ALL_FORMS = "Все формы"
+STATS_COLUMNS = (("form", "форма", 150), ("attempts", "ответов", 70),
+                 ("accuracy", "верно, %", 80), ("mean", "ср. время, с", 90))
+
+
+class DrillWindow:
+    def __init__(self, root, io, load_stats, log, ready=None):
+        self.root = root
+        self.root.title("Тренировка спряжения")
+        self.io = io
+        self.log = log                           # → ProfileJournal("drill")
+        self.ready = ready                       # False — профиль переключается
+        self.drill: drill.Drill | None = None
+
+        bar = tb.Frame(root)
+        bar.pack(fill=X, padx=10, pady=(10, 4))
+        tb.Label(bar, text="Форма:").pack(side=LEFT)
+        self.form_var = tb.StringVar(value=ALL_FORMS)
+        form_box = tb.Combobox(bar, textvariable=self.form_var, state="readonly",
+                               values=[ALL_FORMS, *BUILTIN_FORMS], width=18)
+        form_box.pack(side=LEFT, padx=6)
+        form_box.bind("<<ComboboxSelected>>", lambda e: self.set_forms())
+
+        self.question = tb.Label(root, text="Загрузка…", font=("Segoe UI", 18, "bold"),
+                                 bootstyle="primary")
+        self.question.pack(padx=10, pady=(10, 0))
+        self.hint = tb.Label(root, bootstyle="secondary")
+        self.hint.pack(padx=10)
+
+        self.answer_var = tb.StringVar()
+        self.entry = tb.Entry(root, textvariable=self.answer_var,
+                              font=("Segoe UI", 14), width=24, justify="center")
+        self.entry.pack(padx=10, pady=8)
+        self.entry.bind("<Return>", lambda e: self.check())
+        tb.Label(root, text="кана, кандзи или ромадзи (nonda)",
+                 bootstyle="light").pack()
+
+        self.feedback = tb.Label(root, font=("Segoe UI", 11, "bold"))
+        self.feedback.pack(padx=10, pady=6)
+
+        self.stats = tb.Treeview(root, columns=[c for c, *_ in STATS_COLUMNS],
+                                 show="headings", height=8)
+        for col, text, width in STATS_COLUMNS:
+            self.stats.heading(col, text=text)
+            self.stats.column(col, width=width, anchor="w" if col == "form" else "e")
+        self.stats.pack(fill=BOTH, expand=YES, padx=10, pady=4)
+
+        tb.Button(root, text="Закрыть", bootstyle="danger, outline",
+                  command=root.destroy).pack(pady=(4, 10))
+
+        root.bind("<Destroy>", self._on_destroy, add="+")
+        self.io.submit(lambda: (drill.answer_table(), load_stats()),
+                       on_done=self._loaded, on_error=self.show_error, owner=self)
+
+    def _loaded(self, result):
+        answers, stats = result
+        self.drill = drill.Drill(answers, stats, log=self.log)
+        for form in self.drill.stats:
+            self.update_stats(form)
+        self.set_forms()
+        self.entry.focus_set()
+
+    def _on_destroy(self, event):
+        if event.widget is self.root:
+            self.io.cancel(self)
+
+    def show_error(self, e):
+        self.question.config(text=f"Ошибка: {e}")
+
+    # ────────────── вопрос / ответ ──────────────
+    def set_forms(self):
+        if self.drill is None:
+            return
+        form = self.form_var.get()
+        self.drill.set_forms(None if form == ALL_FORMS else {form})
+        self.next_question()
+
+    def next_question(self):
+        q = self.drill.ask()
+        if q is None:
+            self.question.config(text="Для этой формы в таблице нет глаголов")
+            self.hint.config(text="")
+            return
+        verb, form = q
+        self.question.config(text=f"Дайте {form} от {verb}")
+        self.hint.config(text=self.drill.answers.hints.get(verb, ""))
+
+    def check(self):
+        text = self.answer_var.get()
+        if self.drill is None or self.drill.current is None or not text.strip():
+            return
+        if self.ready is not None and not self.ready():
+            self.feedback.config(text="Профиль переключается — подождите…",
+                                 bootstyle="warning")
+            return
+        ok, expected, ms = self.drill.answer(text)
+        form = self.drill.current[1]
+        if ok:
+            self.feedback.config(text=f"✔ Верно: {expected}  ({ms / 1000:.1f} с)",
+                                 bootstyle="success")
+        else:
+            self.feedback.config(text=f"✘ Нужно: {expected}  (вы: {text.strip()})",
+                                 bootstyle="danger")
+        self.update_stats(form)
+        self.answer_var.set("")
+        self.next_question()
+
+    def update_stats(self, form):
+        st = self.drill.stats[form]
+        values = (form, st.attempts, f"{st.accuracy * 100:.0f}", f"{st.mean_ms / 1000:.1f}")
+        if self.stats.exists(form):
+            self.stats.item(form, values=values)
+        else:
+            self.stats.insert("", "end", iid=form, values=values)
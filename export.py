@@ -0,0 +1,243 @@
+# ─── export.py ─────────────────────────────────────────────────────────────
+"""
+Потоковая выгрузка карточек в CSV / TSV и в текстовый формат импорта Anki.
+
+Источники:
+  • examples      — примеры из уроков (ja → ru, в note — hiragana);
+  • constructions — grammar_constructions.json (title → comment);
+  • grammar       — списки JLPT N5/N4/N3;
+  • conjugation   — таблица спряжения (глагол · форма → значение,
+                    в note — перевод глагола из filter_labels);
+  • due           — карточки SRS профиля с наступившим сроком (только чтение:
+                    очередь и пулы не меняются, можно гонять по расписанию);
+  • items()       — произвольные элементы, например «на сегодня» из окна сессии.
+
+Каждый источник — генератор Card, запись идёт построчно через csv.writer
+во временный файл (потом os.replace): колода целиком в памяти не
+собирается, расход не зависит от числа карточек. Замер на 100 000
+карточек — benchmarks/bench_export.py.
+
+Anki — не .apkg, а .txt с заголовками (#separator, #html, #columns,
+#tags column): «Файл → Импорт» сразу раскладывает колонки по полям.
+
+    python export.py --out deck.txt                       # всё, формат Anki
+    python export.py grammar --level N4 --out n4.csv
+    python export.py due --profile Анна --mode forms --out due.tsv
+"""
+import argparse, csv, os, sys, time
+from collections.abc import Mapping
+from typing import NamedTuple
+
+import content
+from session import LEVELS
+
+COLUMNS = ("front", "back", "note", "tags")
+DELIMITERS = {"csv": ",", "tsv": "\t", "anki": "\t"}
+EXTENSIONS = {".csv": "csv", ".tsv": "tsv", ".txt": "anki"}
+
+FILETYPES = [
+    ("Anki (текст)", "*.txt"),
+    ("CSV", "*.csv"),
+    ("TSV", "*.tsv"),
+]
+
+
+class Card(NamedTuple):
+    """Строка выгрузки: лицевая сторона, оборот, пояснение, теги через пробел."""
+
+    front: str
+    back: str = ""
+    note: str = ""
+    tags: str = ""
+
+
+def _tag(text: str) -> str:
+    """Тег Anki не может содержать пробелов."""
+    return "_".join(str(text).split())
+
+
+# ─────────────────── источники ───────────────────
+def examples(repo=None):
+    """Примеры употребления из lessons.json; тег — форма урока."""
+    repo = repo or content.repo
+    for form, lesson in repo.get("lessons").items():
+        tags = f"example {_tag(form)}"
+        use_cases = lesson.get("use_cases")
+        for case in (use_cases.values() if isinstance(use_cases, Mapping) else ()):
+            if not isinstance(case, Mapping):
+                continue
+            for ex in case.get("examples") or ():
+                if isinstance(ex, Mapping) and ex.get("ja"):
+                    yield Card(ex["ja"], ex.get("ru") or "", ex.get("hiragana") or "", tags)
+
+
+def constructions(repo=None):
+    """Конструкции: title → comment; теги — форма и уровень JLPT."""
+    repo = repo or content.repo
+    for c in repo.get("constructions"):
+        tags = " ".join(_tag(t) for t in ("construction", c.get("form"), c.get("jlpt")) if t)
+        yield Card(c["title"], c.get("comment") or "", "", tags)
+
+
+def grammar(repo=None, levels=LEVELS):
+    """Встроенные списки уровней levels."""
+    repo = repo or content.repo
+    for level in levels:
+        tags = f"grammar {level}"
+        for g in repo.get(f"grammar_{level.lower()}"):
+            yield Card(g.title, g.comment, "", tags)
+
+
+def conjugation(repo=None):
+    """Таблица спряжения: карточка на клетку «глагол · форма»."""
+    repo = repo or content.repo
+    data = repo.get("conjugation")
+    hints = {x["value"]: x["label"] for x in data.get("filter_labels", ())}
+    columns = data["columns"]
+    for row in data["rows"]:
+        form = row["form"]
+        tags = f"conjugation {_tag(form)}"
+        for verb, value in zip(columns, row["values"]):
+            if value:
+                yield Card(f"{verb} · {form}", value, hints.get(verb, ""), tags)
+
+
+def items(rows, tags: str = "today"):
+    """Элементы сессии (строки или пары title, comment) → карточки."""
+    for x in rows:
+        title, comment = x if isinstance(x, (list, tuple)) and len(x) == 2 else (x, "")
+        yield Card(title, comment or "", "", tags)
+
+
+def due(profile: str | None = None, mode: str = "grammar", limit: int = 100,
+        db_path: str | None = None):
+    """
+    Карточки профиля с наступившим сроком (колода режима mode, для
+    grammar — уровень профиля). Ничего не записывает: take_due оставляет
+    карточки в очереди до оценки.
+    """
+    from profile_store import DB_PATH, ProfileStore, ProfileJournal
+    from session import Session
+    from srs import SRSStore
+
+    db_path = db_path or DB_PATH
+    if not os.path.exists(db_path):
+        raise ValueError(f"{db_path}: профилей ещё нет")
+    store = ProfileStore(db_path)
+    store.open()
+    try:
+        pid = store.profile_id(profile, create=False) if profile else store.current_profile()
+        if pid is None:
+            raise ValueError(f"профиль «{profile}» не найден")
+        session = Session()
+        session.apply(store.read_progress(pid))
+        session.mode = mode
+        journal = ProfileJournal(store, "srs")
+        journal.profile = pid
+        srs = SRSStore(journal=journal)
+        srs.load()
+        rows = session.due_items(srs, limit)
+        tags = f"due {_tag(session.srs_deck_name())}"
+    finally:
+        store.close()
+    yield from items(rows, tags)
+
+
+SOURCES = {
+    "examples":      examples,
+    "constructions": constructions,
+    "grammar":       grammar,
+    "conjugation":   conjugation,
+}
+
+
+# ─────────────────── запись ───────────────────
+def format_for(path: str) -> str:
+    """Формат по расширению файла (.csv / .tsv / .txt → anki)."""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "anki")
+
+
+def write(cards, f, fmt: str = "anki", deck: str | None = None) -> int:
+    """Карточки → открытый текстовый файл f (newline=''); число строк."""
+    sep = DELIMITERS[fmt]
+    w = csv.writer(f, delimiter=sep, lineterminator="\n")
+    if fmt == "anki":
+        f.write(f"#separator:tab\n#html:false\n#columns:{sep.join(COLUMNS)}\n"
+                f"#tags column:{COLUMNS.index('tags') + 1}\n")
+        if deck:
+            f.write(f"#deck:{deck}\n")
+    else:
+        w.writerow(COLUMNS)
+    n = 0
+    for n, card in enumerate(cards, start=1):
+        w.writerow(card)
+    return n
+
+
+def export(path: str, cards, fmt: str | None = None, deck: str | None = None) -> int:
+    """
+    Запись в path через временный файл: оборванная выгрузка не затирает
+    вчерашнюю. path '-' — stdout. Возвращает число карточек.
+    """
+    fmt = fmt or format_for(path)
+    if path == "-":
+        return write(cards, sys.stdout, fmt, deck)
+    tmp = path + ".tmp"
+    try:
+        # BOM — только для CSV (Excel); Anki ждёт #separator в самом начале файла
+        with open(tmp, "w", encoding="utf-8-sig" if fmt == "csv" else "utf-8",
+                  newline="") as f:
+            n = write(cards, f, fmt, deck)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return n
+
+
+# ─────────────────── точка входа ───────────────────
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Выгрузка карточек в CSV / TSV / Anki.")
+    ap.add_argument("sources", nargs="*", metavar="source",
+                    help=f"{', '.join(SOURCES)}, due (по умолчанию — весь контент, без due)")
+    ap.add_argument("--out", default="deck.txt", help="файл ('-' — stdout)")
+    ap.add_argument("--format", choices=tuple(DELIMITERS), default=None,
+                    help="по умолчанию — по расширению --out")
+    ap.add_argument("--level", nargs="+", choices=LEVELS, default=list(LEVELS),
+                    help="уровни для grammar")
+    ap.add_argument("--deck", default=None, help="колода Anki (#deck:)")
+    ap.add_argument("--profile", default=None, help="профиль для due (по умолчанию — последний)")
+    ap.add_argument("--mode", choices=("grammar", "forms", "constructions"),
+                    default="grammar", help="колода SRS для due")
+    ap.add_argument("--limit", type=int, default=100, help="карточек due, не больше")
+    args = ap.parse_args(argv)
+    if unknown := [s for s in args.sources if s not in SOURCES and s != "due"]:
+        ap.error(f"неизвестный источник: {', '.join(unknown)}")
+
+    def cards():
+        for name in args.sources or SOURCES:
+            if name == "due":
+                yield from due(args.profile, args.mode, args.limit)
+            elif name == "grammar":
+                yield from grammar(levels=args.level)
+            else:
+                yield from SOURCES[name]()
+
+    t0 = time.perf_counter()
+    try:
+        n = export(args.out, cards(), args.format, args.deck)
+    except (KeyError, ValueError) as e:
+        print(f"[LOAD ERROR] {e}", file=sys.stderr)
+        return 1
+    except OSError as e:
+        print(f"[SAVE ERROR] {e}", file=sys.stderr)
+        return 1
+    print(f"{n} карточек за {time.perf_counter() - t0:.2f} с → {args.out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
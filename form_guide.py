@@ -1,12 +1,102 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
-import json
+import content
+import conjugation
+import perf
+import search
+from tk_executor import TkExecutor
+from virtual_table import VirtualTable
 
 
 # ─────────────────── вспомогательные ───────────────────
-def load_lessons(fname="lessons.json"):
-    with open(f"data/{fname}", encoding="utf-8") as f:
-        return json.load(f)
+def load_lessons():
+    return content.get("lessons")
+
+
+RENDER_CHUNK      = 200       # сегментов на одну вставку в Text
+RENDER_CACHE_SIZE = 64        # готовых видов в кэше окна
+TRANSPOSE_AT      = 16        # больше глаголов — показываем их строками
+
+
+def merge_segments(segments) -> tuple:
+    """Склеивает соседние сегменты с одинаковым тегом: меньше работы для Tk."""
+    out = []
+    for text, tag in segments:
+        if out and out[-1][1] == tag:
+            out[-1][0].append(text)
+        else:
+            out.append(([text], tag))
+    return tuple(("".join(parts), tag) for parts, tag in out)
+
+
+def lesson_segments(lesson):
+    """Методичка → сегменты (текст, тег)."""
+    yield lesson["title"] + "\n\n", "title"
+
+    yield "📌 Описание:\n", "subheading"
+    yield lesson["description"] + "\n\n", ""
+
+    yield "🧠 Юзкейсы:\n", "subheading"
+    for case, data in lesson["use_cases"].items():
+        yield case + "\n", "case"
+        if note := data.get("note"):
+            yield "　" + note + "\n", ""
+        for ex in data["examples"]:
+            yield f"  ・{ex['ja']}\n    {ex['hiragana']}\n    {ex['ru']}\n\n", ""
+
+    yield "🔧 Образование:\n", "subheading"
+    form = lesson["formation"]
+    if ov := form.get("overview"):
+        yield ov + "\n\n", ""
+
+    for grp in ("group_1", "group_2", "group_3"):
+        if grp_data := form.get(grp):
+            yield f"【{grp_data['rule']}】\n", "case"
+            for pat, ex in grp_data["patterns"].items():
+                yield f"  - {pat}: {ex}\n", ""
+            yield "\n", ""
+
+
+def construction_segments(form, items):
+    """Конструкции одной формы → сегменты (текст, тег)."""
+    yield f"📚 Грамматические конструкции: {form}\n\n", "title"
+    for it in items:
+        yield (f"🔹 {it['title']} — JLPT {it['jlpt']} — частота: {it['frequency']}%\n",
+               "case")
+        yield it["comment"] + "\n\n", ""
+        for ex in it["examples"]:
+            yield f"・{ex['ja']}\n　{ex['hiragana']}\n　{ex['ru']}\n\n", ""
+        yield "―" * 40 + "\n\n", ""
+
+
+def search_segments(query, hits, ms):
+    """Результаты поиска → сегменты (текст, тег)."""
+    yield f"🔍 «{query}»: найдено {len(hits)} ({ms:.1f} мс)\n\n", "title"
+    if not hits:
+        yield "Ничего не найдено.\n", ""
+    for score, source, title, snippet, ref in hits:
+        label = search.SOURCE_LABELS.get(source, source)
+        where = f" — {ref}" if source in ("lessons", "constructions") else ""
+        yield f"🔹 {title}\n", "case"
+        yield f"　{label}{where}\n", "subheading"
+        if snippet:
+            yield snippet + "\n", ""
+        yield "\n", ""
+
+
+def conjugation_rows(table) -> tuple[list, list]:
+    """
+    Таблица спряжений → (заголовки, строки). Пока глаголов немного,
+    как в файле: строка = форма, колонка = глагол. Для длинных списков
+    глаголов таблица транспонируется (строка = глагол), чтобы число
+    колонок оставалось постоянным, а строки — виртуализировались.
+    """
+    verbs, forms = table["columns"], table["rows"]
+    if len(verbs) <= TRANSPOSE_AT:
+        return (["Форма", *verbs],
+                [(r["form"], *r["values"]) for r in forms])
+    return (["Глагол", *(r["form"] for r in forms)],
+            [(v, *(r["values"][i] for r in forms)) for i, v in enumerate(verbs)])
 
 
 # ─────────────────── основное приложение ───────────────────
@@ -16,27 +106,37 @@ class FormGuide:
       • методички по каждой форме
       • список конструкций этой формы
       • таблица спряжения по глаголам
+      • поиск по методичкам, конструкциям и спискам JLPT
     Можно вернуться в главное меню.
+    Чтение данных идёт в фоне через TkExecutor (общий с главным меню).
     """
 
     # ────────────── инициализация ──────────────
-    def __init__(self, root, main_menu_root):
+    def __init__(self, root, main_menu_root, io: TkExecutor | None = None):
         self.root = root
         self.root.title("Шпаргалка: формы глаголов")
         self.main_menu_root = main_menu_root     # понадобится для «Назад»
 
-        self.lessons = load_lessons()
+        self.own_io = io is None
+        self.io = io or TkExecutor(root)
+        self.lessons = {}                        # придут из фона
+        self.lessons_version = 0
+        self._render_cache: dict[tuple, tuple] = {}
+        self._render_token = 0
+        self._request_id = 0                     # последний запрошенный вид (см. _request)
+        self.view = "lesson"                     # lesson | constructions | search | table
 
         # ---------- верхняя панель ----------
-        self.form_var = tb.StringVar(value=list(self.lessons.keys())[0])
+        self.form_var = tb.StringVar()
 
-        tb.Combobox(
+        self.form_box = tb.Combobox(
             root,
             textvariable=self.form_var,
-            values=list(self.lessons.keys()),
+            values=[],
             state="readonly",
             width=18
-        ).grid(row=0, column=0, padx=8, pady=6)
+        )
+        self.form_box.grid(row=0, column=0, padx=8, pady=6)
 
         tb.Button(root, text="Показать методичку",
                   bootstyle="primary, outline",
@@ -54,9 +154,17 @@ class FormGuide:
                   bootstyle="danger, outline",
                   command=self.go_back).grid(row=0, column=4, padx=10, pady=6)
 
+        # ---------- поиск ----------
+        self.query_var = tb.StringVar()
+        query_entry = tb.Entry(root, textvariable=self.query_var, width=22)
+        query_entry.grid(row=0, column=5, padx=(10, 2), pady=6)
+        query_entry.bind("<Return>", lambda e: self.show_search())
+        tb.Button(root, text="🔍", bootstyle="secondary, outline",
+                  command=self.show_search).grid(row=0, column=6, padx=(2, 8), pady=6)
+
         # ---------- прокручиваемый Text ----------
-        txt_fr = tb.Frame(root)
-        txt_fr.grid(row=1, column=0, columnspan=5, sticky="nsew", padx=10, pady=10)
+        txt_fr = self.txt_fr = tb.Frame(root)
+        txt_fr.grid(row=1, column=0, columnspan=7, sticky="nsew", padx=10, pady=10)
 
         root.grid_rowconfigure(1, weight=1)
         root.grid_columnconfigure(0, weight=1)
@@ -86,9 +194,74 @@ class FormGuide:
         self.text_box.tag_configure("case",       font=("Segoe UI", 13, "bold"),
                                     foreground="#444444")
 
-        # показать первую методичку
+        # ---------- таблица спряжений: строится один раз, лежит под текстом ----------
+        conj_fr = self.conj_fr = tb.Frame(root)
+        conj_fr.grid(row=1, column=0, columnspan=7, sticky="nsew", padx=10, pady=10)
+        conj_fr.grid_rowconfigure(1, weight=1)
+        conj_fr.grid_columnconfigure(1, weight=1)
+
+        # свои глаголы: через пробел / запятую или списком из файла
+        self.verbs_var = tb.StringVar()
+        tb.Label(conj_fr, text="Свои глаголы:").grid(row=0, column=0, padx=(0, 6), pady=(0, 6))
+        verbs_entry = tb.Entry(conj_fr, textvariable=self.verbs_var)
+        verbs_entry.grid(row=0, column=1, sticky="ew", pady=(0, 6))
+        verbs_entry.bind("<Return>", lambda e: self.show_conjugation_table())
+        tb.Button(conj_fr, text="Спрягать", bootstyle="primary, outline",
+                  command=self.show_conjugation_table).grid(row=0, column=2, padx=4, pady=(0, 6))
+        tb.Button(conj_fr, text="Из файла…", bootstyle="secondary, outline",
+                  command=self.conjugate_file).grid(row=0, column=3, padx=(4, 0), pady=(0, 6))
+
+        self.table = VirtualTable(conj_fr, height=28)
+        self.table.frame.grid(row=1, column=0, columnspan=4, sticky="nsew")
+        self._table_key = None
+        txt_fr.tkraise()
+
+        # закрытие окна отменяет ещё не завершённые загрузки
+        root.bind("<Destroy>", self._on_destroy, add="+")
+
+        # показать первую методичку, как только прочитается lessons.json
+        self.io.submit(load_lessons, on_done=self._lessons_loaded,
+                       on_error=self.show_error, owner=self)
+
+    def _lessons_loaded(self, lessons):
+        self.lessons = lessons
+        self.lessons_version = content.repo.version("lessons")
+        keys = list(lessons.keys())
+        self.form_box.config(values=keys)
+        if keys and not self.form_var.get():
+            self.form_var.set(keys[0])
         self.show_lesson()
 
+    def content_changed(self, names):
+        """Файлы data/ перечитаны на лету: обновить только задетый вид."""
+        if not self.root.winfo_exists():
+            return
+        if "lessons" in names:                   # от уроков зависят и конструкции
+            self.io.submit(load_lessons, on_done=self._lessons_reloaded,
+                           on_error=self.show_error, owner=self)
+        elif self.view == "constructions" and "constructions" in names:
+            self.show_constructions()
+        if self.view == "search" and names & set(search.SOURCES):
+            self.show_search()
+        if (self.view == "table" and "conjugation" in names
+                and self._table_key and self._table_key[0] == "builtin"):
+            self.show_conjugation_table()
+
+    def _lessons_reloaded(self, lessons):
+        self.lessons = lessons
+        self.lessons_version = content.repo.version("lessons")
+        self.form_box.config(values=list(lessons))
+        if self.view == "lesson":
+            self.show_lesson()
+        elif self.view == "constructions":
+            self.show_constructions()
+
+    def _on_destroy(self, event):
+        if event.widget is self.root:
+            self.io.cancel(self)
+            if self.own_io:
+                self.io.shutdown(wait=False)
+
     # ────────────── служебное ──────────────
     def show_ctx_menu(self, event):
         try:
@@ -104,110 +277,169 @@ class FormGuide:
         except Exception:
             pass
 
-    # ---------- helper: убрать Treeview ----------
-    def _remove_treeview(self):
-        for w in self.root.winfo_children():
-            if isinstance(w, tb.Treeview):
-                w.destroy()
+    def show_error(self, e):
+        self._render_token += 1               # остановить дорисовку
+        self._show_text()
+        self.text_box.delete("1.0", "end")
+        self.text_box.insert("end", f"Ошибка: {e}")
+
+    def _request(self, view):
+        """Новый вид: ответы фона на прежние запросы больше не рисуются."""
+        self.view = view
+        self._request_id += 1
+        return self._request_id
+
+    def _if_current(self, req, callback):
+        """on_done / on_error, срабатывающий, только если вид req ещё не сменили."""
+        def call(*args):
+            if req == self._request_id:
+                callback(*args)
+        return call
+
+    # ---------- helper: показать текст поверх таблицы ----------
+    def _show_text(self):
+        self.txt_fr.tkraise()
 
     # ────────────── вывод методички ──────────────
     def show_lesson(self):
-        self._remove_treeview()               # <── главное добавление
+        self._request("lesson")
+        self._show_text()
         key = self.form_var.get()
         lesson = self.lessons.get(key)
         if not lesson:
             return
-        tbx = self.text_box
-        tbx.delete("1.0", "end")
-
-        tbx.insert("end", lesson["title"] + "\n\n", "title")
-
-        tbx.insert("end", "📌 Описание:\n", "subheading")
-        tbx.insert("end", lesson["description"] + "\n\n")
-
-        tbx.insert("end", "🧠 Юзкейсы:\n", "subheading")
-        for case, data in lesson["use_cases"].items():
-            tbx.insert("end", case + "\n", "case")
-            if note := data.get("note"):
-                tbx.insert("end", "　" + note + "\n")
-            for ex in data["examples"]:
-                tbx.insert("end",
-                           f"  ・{ex['ja']}\n    {ex['hiragana']}\n    {ex['ru']}\n\n")
-
-        tbx.insert("end", "🔧 Образование:\n", "subheading")
-        form = lesson["formation"]
-        if ov := form.get("overview"):
-            tbx.insert("end", ov + "\n\n")
-
-        for grp in ("group_1", "group_2", "group_3"):
-            if grp_data := form.get(grp):
-                tbx.insert("end", f"【{grp_data['rule']}】\n", "case")
-                for pat, ex in grp_data["patterns"].items():
-                    tbx.insert("end", f"  - {pat}: {ex}\n")
-                tbx.insert("end", "\n")
+        self.render(("lesson", key, self.lessons_version),
+                    lambda: lesson_segments(lesson))
 
     # ────────────── конструкции ──────────────
     def show_constructions(self):
-        self._remove_treeview()               # <── тоже добавили
-        try:
-            with open("data/grammar_constructions.json", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            self.text_box.delete("1.0", "end")
-            self.text_box.insert("end", f"Ошибка: {e}")
-            return
-
+        req = self._request("constructions")
+        self._show_text()
         form = self.form_var.get()
-        items = [c for c in data if c.get("form") == form]
+        self.io.submit(content.construction_index,
+                       on_done=self._if_current(
+                           req, lambda index: self._render_constructions(form, index)),
+                       on_error=self._if_current(req, self.show_error), owner=self)
+
+    def _render_constructions(self, form, index):
+        items = index.for_form(form)          # уже отсортировано по JLPT
         if not items:
+            self._render_token += 1
             self.text_box.delete("1.0", "end")
             self.text_box.insert("end", f"Конструкций для {form} нет.")
             return
-
-        jlpt_order = {"N5": 0, "N4": 1, "N3": 2, "N2": 3, "N1": 4}
-        items.sort(key=lambda x: jlpt_order.get(x.get("jlpt", "N5"), 5))
-
+        self.render(("constructions", form, index.version),
+                    lambda: construction_segments(form, items))
+
+    # ────────────── поиск ──────────────
+    def show_search(self):
+        """Поиск по всем данным; индекс строится/читается в фоне."""
+        query = self.query_var.get().strip()
+        if not query:
+            return
+        req = self._request("search")
+        self._show_text()
+        self.io.submit(search.timed_search, query,
+                       on_done=self._if_current(
+                           req, lambda res: self._render_search(query, *res)),
+                       on_error=self._if_current(req, self.show_error), owner=self)
+
+    def _render_search(self, query, hits, ms, version):
+        self.render(("search", query, version),
+                    lambda: search_segments(query, hits, ms))
+
+    # ────────────── вывод сегментов ──────────────
+    def render(self, key, build):
+        """
+        Вид = список сегментов (текст, тег), собранный один раз на
+        (вид, форма, версия данных). Вставка — пачками по RENDER_CHUNK
+        сегментов за один вызов Tcl; длинные виды дорисовываются через
+        after(), первый экран появляется сразу.
+        """
+        segs = self._render_cache.get(key)
+        if segs is None:
+            if len(self._render_cache) >= RENDER_CACHE_SIZE:
+                self._render_cache.clear()
+            with perf.span("render.build", view=key[0]):
+                segs = self._render_cache[key] = merge_segments(build())
+
+        self._render_token += 1
+        token = self._render_token
         tbx = self.text_box
         tbx.delete("1.0", "end")
-        tbx.insert("end", f"📚 Грамматические конструкции: {form}\n\n", "title")
 
-        for it in items:
-            tbx.insert("end",
-                       f"🔹 {it['title']} — JLPT {it['jlpt']} — частота: {it['frequency']}%\n",
-                       "case")
-            tbx.insert("end", it["comment"] + "\n\n")
-            for ex in it["examples"]:
-                tbx.insert("end", f"・{ex['ja']}\n　{ex['hiragana']}\n　{ex['ru']}\n\n")
-            tbx.insert("end", "―" * 40 + "\n\n")
+        def step(start):
+            if token != self._render_token:   # пользователь уже открыл другой вид
+                return
+            flat = [x for seg in segs[start:start + RENDER_CHUNK] for x in seg]
+            tbx.insert("end", *flat)
+            if start + RENDER_CHUNK < len(segs):
+                tbx.after(1, step, start + RENDER_CHUNK)
+
+        if segs:
+            with perf.span("render.first", view=key[0], segments=len(segs)):
+                step(0)
 
     # ────────────── таблица спряжений ──────────────
     def show_conjugation_table(self):
-        # если уже открыт Treeview, сначала убрать его, чтоб не плодились
-        self._remove_treeview()
-
-        try:
-            with open("data/conjugation_table_with_translations.json",
-                      encoding="utf-8") as f:
-                table = json.load(f)
-        except Exception as e:
-            self.text_box.delete("1.0", "end")
-            self.text_box.insert("end", f"Ошибка: {e}")
+        """Встроенная таблица или, если введены свои глаголы, — сгенерированная."""
+        verbs = self.verbs_var.get().replace(",", " ").replace("、", " ").split()
+        if verbs:
+            self.show_verbs(verbs)
+            return
+        req = self._request("table")
+        self.io.submit(content.get, "conjugation",
+                       on_done=self._if_current(req, lambda table: self._render_conjugation_table(
+                           ("builtin", content.repo.version("conjugation")), table)),
+                       on_error=self._if_current(req, self.show_error), owner=self)
+
+    def show_verbs(self, verbs):
+        key = ("verbs", tuple(verbs))
+        req = self._request("table")
+        if key == self._table_key:
+            self._raise_table()
+            return
+        self.io.submit(conjugation.table, verbs,
+                       on_done=self._if_current(req, lambda res: self._render_verbs(key, *res)),
+                       on_error=self._if_current(req, self.show_error), owner=self)
+
+    def conjugate_file(self):
+        """Список глаголов из текстового файла (по одному или через пробел)."""
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(parent=self.root,
+                                          filetypes=[("Text files", "*.txt")])
+        if not path:
             return
 
-        tv = tb.Treeview(self.root, show="headings", height=28)
-        tv.grid(row=1, column=0, columnspan=5, sticky="nsew",
-                padx=10, pady=10)
-
-        columns = ["Форма"] + table["columns"]
-        tv["columns"] = columns
-        for col in columns:
-            tv.heading(col, text=col)
-            tv.column(col, width=110, anchor="center")
-
-        for row in table["rows"]:
-            tv.insert("", "end", values=[row["form"]] + row["values"])
-
-        tv.focus_set()       # чтобы Tab-ы не «улетали»
+        def read():
+            with open(path, encoding="utf-8-sig") as f:
+                return f.read().replace(",", " ").replace("、", " ").split()
+
+        req = self._request("table")
+        self.io.submit(read, on_done=self._if_current(req, self.show_verbs),
+                       on_error=self._if_current(req, self.show_error), owner=self)
+
+    def _render_verbs(self, key, table, rejected):
+        if rejected:
+            from tkinter import messagebox
+            more = f" и ещё {len(rejected) - 10}" if len(rejected) > 10 else ""
+            messagebox.showwarning("Спряжение",
+                                   "Не похоже на глагол в словарной форме:\n"
+                                   + "、".join(rejected[:10]) + more,
+                                   parent=self.root)
+        if table["columns"]:
+            self._render_conjugation_table(key, table)
+
+    def _render_conjugation_table(self, key, table):
+        if self._table_key != key:            # данные изменились → diff по слотам
+            with perf.span("render.table", view=key[0]):
+                self.table.set_data(*conjugation_rows(table))
+            self._table_key = key
+        self._raise_table()
+
+    def _raise_table(self):
+        self.conj_fr.tkraise()
+        self.table.tv.focus_set()       # чтобы Tab-ы не «улетали»
 
     # ────────────── назад в меню ──────────────
     def go_back(self):
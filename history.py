@@ -0,0 +1,124 @@
+# ─── history.py ────────────────────────────────────────────────────────────
+"""
+История сессий «на сегодня» и статистика по ней (без Tk).
+
+Каждая выдача элементов — запись журнала history (op "session": время,
+режим, источник — колода SRS, уровень, ключи элементов и их группы
+покрытия). profile_store дописывает её в таблицу history (только
+добавление) и той же транзакцией обновляет агрегаты профиля:
+
+    Totals   — сессии, элементы, активные дни, серия дней подряд;
+    по дням  — сессии и элементы за календарный день;
+    покрытие — сколько разных элементов группы уже встречалось:
+               N5/N4/N3 (список уровня + конструкции этого уровня JLPT),
+               form:<форма> (конструкции формы), forms, imported.
+
+Обновление — O(1) на сессию (плюс по строке на впервые встреченный
+элемент). Окно статистики читает только агрегаты и последние дни, а не
+историю, поэтому открывается сразу и через годы ежедневных занятий.
+"""
+import time
+from datetime import date
+
+import content
+from session import BUILTIN_FORMS, LEVELS, srs_key
+
+RECENT_DAYS = 14                         # дней в таблице окна статистики
+
+_groups_cache: dict[int, tuple[dict, dict]] = {}
+
+
+def day_of(ts: float) -> int:
+    """Номер локального календарного дня (date.toordinal)."""
+    return date.fromtimestamp(ts).toordinal()
+
+
+class Totals:
+    """Итоги профиля; add() — одна сессия, O(1)."""
+
+    __slots__ = ("sessions", "items", "days", "first_day", "last_day",
+                 "streak", "best_streak")
+
+    def __init__(self, sessions=0, items=0, days=0, first_day=0, last_day=0,
+                 streak=0, best_streak=0):
+        self.sessions, self.items, self.days = sessions, items, days
+        self.first_day, self.last_day = first_day, last_day
+        self.streak, self.best_streak = streak, best_streak
+
+    def add(self, day: int, n: int) -> None:
+        """Сессия из n элементов в день day (часы назад — тот же последний день)."""
+        if day > self.last_day:
+            self.streak = self.streak + 1 if day == self.last_day + 1 else 1
+            self.best_streak = max(self.best_streak, self.streak)
+            self.first_day = self.first_day or day
+            self.last_day = day
+            self.days += 1
+        self.sessions += 1
+        self.items += n
+
+    def dump(self) -> tuple:
+        return tuple(getattr(self, f) for f in self.__slots__)
+
+    def current_streak(self, today: int) -> int:
+        """Серия на сегодня: жива, если занимались сегодня или вчера."""
+        return self.streak if today - self.last_day <= 1 else 0
+
+    @property
+    def items_per_day(self) -> float:
+        return self.items / self.days if self.days else 0.0
+
+    @property
+    def items_per_session(self) -> float:
+        return self.items / self.sessions if self.sessions else 0.0
+
+    def days_to_finish(self, remaining: int) -> float | None:
+        """Активных дней до конца пула при среднем темпе (None — темпа ещё нет)."""
+        rate = self.items_per_day
+        return remaining / rate if rate else None
+
+
+# ─────────────────── группы покрытия ───────────────────
+def _construction_groups() -> tuple[dict, dict]:
+    """(title → группы, группа → число конструкций) для текущей версии файла."""
+    data = content.get("constructions")
+    version = content.repo.version("constructions")
+    cached = _groups_cache.get(version)
+    if cached is None:
+        groups, sizes = {}, {}
+        for c in data:
+            gs = tuple(g for g in (c.get("jlpt"), c.get("form") and f"form:{c['form']}") if g)
+            groups[c["title"]] = gs
+            for g in gs:
+                sizes[g] = sizes.get(g, 0) + 1
+        _groups_cache.clear()
+        cached = _groups_cache[version] = (groups, sizes)
+    return cached
+
+
+def groups(deck: str, item) -> tuple[str, ...]:
+    """Группы покрытия элемента колоды deck (см. Session.srs_deck_name)."""
+    if deck in ("forms", "imported"):
+        return (deck,)
+    if deck == "constructions":
+        return _construction_groups()[0].get(srs_key(item), ())
+    return (deck.rsplit("_", 1)[-1].upper(),)          # grammar_n5 → N5
+
+
+def catalog_sizes(imported: int = 0) -> dict[str, int]:
+    """Группа покрытия → элементов в ней всего (знаменатель процента)."""
+    sizes = {level: len(content.grammar(level)) for level in LEVELS}
+    for g, n in _construction_groups()[1].items():
+        sizes[g] = sizes.get(g, 0) + n
+    sizes["forms"] = len(BUILTIN_FORMS)
+    if imported:
+        sizes["imported"] = imported
+    return sizes
+
+
+def entry(session, items, ts: float | None = None) -> dict:
+    """Поля записи журнала "session" для элементов items, выданных session."""
+    deck = session.srs_deck_name()
+    return {"ts": time.time() if ts is None else ts, "mode": session.mode,
+            "source": deck, "level": session.user_level,
+            "items": [srs_key(x) for x in items],
+            "groups": [groups(deck, x) for x in items]}
@@ -0,0 +1,175 @@
+# ─── importer.py ───────────────────────────────────────────────────────────
+"""
+Потоковый импорт списков грамматики.
+
+Форматы:
+  • .txt        — одна конструкция на строку;
+  • .csv / .tsv — title[,comment] (строка-заголовок title,comment пропускается);
+  • .json       — массив объектов как в grammar_n5.json: {"title", "comment"}.
+
+Файл читается по строкам/кускам в фоновом потоке, дубликаты отсекаются
+множеством уже встреченных записей. Окно опрашивает ImportJob через
+root.after — поток Tk не блокируется, импорт можно отменить.
+"""
+import codecs, csv, json, os, threading, time
+
+FILETYPES = [
+    ("Списки грамматики", "*.txt *.csv *.tsv *.json"),
+    ("Text files", "*.txt"),
+    ("CSV / TSV", "*.csv *.tsv"),
+    ("JSON", "*.json"),
+]
+
+CHUNK = 64 * 1024
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def _entry(title, comment=""):
+    title, comment = (title or "").strip(), (comment or "").strip()
+    if not title:
+        return None
+    return (title, comment) if comment else title
+
+
+class ImportJob:
+    """
+    Импорт одного файла в отдельном потоке. Поля счётчиков читаются
+    из потока Tk без блокировок (простые присваивания атомарны под GIL).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.lines = 0
+        self.duplicates = 0
+        self.items: list = []
+        self.error: Exception | None = None
+        self.done = False
+        self.started = self.finished = 0.0
+        self._cancel = threading.Event()
+
+    # ---------- управление ----------
+    def start(self, submit=None) -> "ImportJob":
+        """
+        Запуск в фоне: через submit (например, TkExecutor.submit) или,
+        если его нет, в собственном потоке.
+        """
+        self.started = time.perf_counter()
+        if submit is not None:
+            submit(self.run)
+        else:
+            threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def lines_per_sec(self) -> float:
+        return self.lines / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    # ---------- рабочий поток ----------
+    def run(self):
+        try:
+            seen = set()
+            for e in self.entries():
+                if e in seen:
+                    self.duplicates += 1
+                    continue
+                seen.add(e)
+                self.items.append(e)
+        except ImportCancelled:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = time.perf_counter()
+            self.done = True
+
+    def entries(self):
+        ext = os.path.splitext(self.path)[1].lower()
+        if ext == ".json":
+            yield from self._json_entries()
+        elif ext in (".csv", ".tsv"):
+            yield from self._csv_entries("\t" if ext == ".tsv" else ",")
+        else:
+            for ln in self._lines():
+                if (e := _entry(ln)) is not None:
+                    yield e
+
+    def _lines(self):
+        """Строки файла (utf-8, BOM допускается) + учёт прогресса/отмены."""
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if self._cancel.is_set():
+                    raise ImportCancelled
+                self.bytes_read += len(raw)
+                self.lines += 1
+                line = raw.decode("utf-8")
+                if self.lines == 1:
+                    line = line.lstrip("\ufeff")
+                yield line.rstrip("\r\n")
+
+    def _csv_entries(self, delimiter: str):
+        for i, row in enumerate(csv.reader(self._lines(), delimiter=delimiter)):
+            if not row:
+                continue
+            if i == 0 and row[0].strip().lower() == "title":
+                continue                                 # строка-заголовок
+            if (e := _entry(row[0], row[1] if len(row) > 1 else "")) is not None:
+                yield e
+
+    def _json_entries(self):
+        """Потоковый разбор массива объектов без чтения файла целиком."""
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8-sig")()
+        buf, pos, started = "", 0, False
+        with open(self.path, "rb") as f:
+            eof = False
+            while True:
+                if self._cancel.is_set():
+                    raise ImportCancelled
+                # пропускаем пробелы / запятые / открывающую скобку
+                while pos < len(buf) and (buf[pos].isspace() or buf[pos] == ","
+                                          or (not started and buf[pos] == "[")):
+                    started = started or buf[pos] == "["
+                    pos += 1
+                if pos < len(buf) and buf[pos] == "]":
+                    return
+                try:
+                    if pos >= len(buf):
+                        raise ValueError
+                    obj, end = decoder.raw_decode(buf, pos)
+                except ValueError:
+                    if eof:
+                        if buf[pos:].strip():
+                            raise ValueError(f"{self.path}: неполный JSON")
+                        return
+                    chunk = f.read(CHUNK)
+                    self.bytes_read += len(chunk)
+                    eof = not chunk
+                    buf = buf[pos:] + utf8.decode(chunk, final=eof)
+                    pos = 0
+                    continue
+                pos = end
+                self.lines += 1
+                if not isinstance(obj, dict):
+                    raise ValueError(f"{self.path}: ожидались объекты {{title, comment}}")
+                if (e := _entry(obj.get("title"), obj.get("comment"))) is not None:
+                    yield e
@@ -1,13 +1,32 @@
 # ─── menu.py ───────────────────────────────────────────────────────────────
-import random, json, sys, os, pathlib
+import time
+_T_START = time.perf_counter()           # отсчёт для --startup-profile
+
+import os, sys, queue, weakref
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
-from tkinter import filedialog, messagebox
 import tkinter as tk   
-from utils import resource_path, ensure_data_dir
-import form_guide                        # окно-шпаргалка
-
-PROGRESS_PATH = "data/progress.json"
+from utils import ensure_data_dir
+import content                           # общий кэш data/*.json
+import perf
+from pools import fingerprint
+from session import Session, BUILTIN_FORMS, srs_key
+# tk_executor, profile_store (sqlite3), srs — в finish_startup, после первого кадра;
+# history, importer, watcher, form_guide, drill_window, stats_window, perf_overlay,
+# export, tkinter.filedialog / messagebox импортируются при первом использовании
+
+PROGRESS_PATH = "data/progress.json"    # старый однопользовательский файл → импорт в БД
+FLUSH_DELAY_MS  = 1000                   # пачка изменений прогресса → 1 запись журнала
+STARTUP_LOG   = "data/startup_profile.log"
+WATCH_POLL_MS = 250                      # поток наблюдателя data/ → поток Tk
+IMPORT_TIME   = time.perf_counter() - _T_START
+
+ADVICE = (
+    "Повторяйте вслух для лучшей памяти.",
+    "Используйте интервальное повторение.",
+    "Смотрите видео на японском с субтитрами.",
+    "Ведите краткий дневник на японском.",
+)
 # --------------------------------------------------------------------------
 
 
@@ -42,24 +61,32 @@ def init_custom_styles(style: tb.Style) -> None:
 # --------------------------------------------------------------------------
 
 
+def write_journals(batch) -> None:
+    """
+    Фоновая задача: [(journal, records, snapshot|None), …] → диск. Только
+    в MainMenu.writer: пачки из одного потока ложатся в БД в порядке
+    pending_writes, поздняя не обгонит раннюю.
+    """
+    with perf.span("save", records=sum(len(r) for _, r, _ in batch),
+                   snapshot=any(s is not None for *_, s in batch)):
+        for journal, records, snap in batch:
+            journal.write(records, snap)
+
+
 class MainMenu:
     """Стартовое меню тренажёра грамматических конструкций и форм."""
 
-    BUILTIN_FORMS = [
-        "Te-form", "Negative-form", "Masu-form", "Ta-form",
-        "Potential-form", "Passive-form", "Causative-form", "Imperative-form",
-        "Volitional-form", "Ba-form", "Tara-form",
-        "Masu-stem", "Progressive-form", "Command-form"
-    ]
+    BUILTIN_FORMS = BUILTIN_FORMS
 
     # ─────────────────── инициализация ───────────────────
-    def __init__(self):
-        # ── копируем data/ при первом запуске ──
-        ensure_data_dir([
-            "facts_200.json", "lessons.json",
-            "grammar_n5.json", "grammar_n4.json", "grammar_n3.json",
-            "grammar_constructions.json", "conjugation_table_with_translations.json"
-        ])
+    def __init__(self, startup_profile: bool = False):
+        """
+        Быстрый старт: сначала рисуем окно, а копирование data/, загрузку
+        прогресса и контента выполняем в idle-колбэке после первой отрисовки.
+        """
+        self.startup_profile = startup_profile
+        self.ready = False
+        self.loaded = False                     # прогресс профиля уже в Session
 
         # ── корневое окно TTK-Bootstrap ──
         self.root = tb.Window(themename="minty")
@@ -69,18 +96,26 @@ class MainMenu:
 
         init_custom_styles(self.root.style)    # регистрируем стиль кнопок
 
-        # ── переменные состояния ──
+        # ── переменные окна (настройки); состояние прогресса — в Session ──
         self.user_name      = tb.StringVar()
         self.user_level     = tb.StringVar(value="N5")
         self.mode           = tb.StringVar(value="grammar")
-        self.grammar_source = tb.StringVar(value="builtin")
-
-        self.imported_grammar  : list[str]        = []
-        self.remaining_grammar : list             = []
-        self.remaining_forms   = MainMenu.BUILTIN_FORMS.copy()
-        self.selected_count    = tb.IntVar(value=5)
-
-        self.load_progress()      # восстановим (если есть)
+        self.selected_count = tb.IntVar(value=5)
+        self.srs_enabled    = tb.BooleanVar(value=False)
+
+        self.session    = Session(log=self.log_progress)
+        # фоновые исполнители, профили и журналы заводит finish_startup
+        self.io = self.writer = self.store = None
+        self.progress = self.srs = self.drill_journal = self.history_journal = None
+        self.profile_name = ""
+        self._showing   = False                     # show_session: не считать сменой уровня
+        self._flush_job = None
+        self._import_job = None
+        self._level_loading = None                  # уровень, который читает load_builtin_level
+        self._perf_overlay = None
+        self.watcher = None                         # правка data/ на лету
+        self._changed: queue.SimpleQueue = queue.SimpleQueue()
+        self.views = weakref.WeakSet()              # открытые шпаргалки
 
         # ── статические метки ──
         lbl_font = ("Segoe UI", 10, "bold")
@@ -102,16 +137,102 @@ class MainMenu:
 
         self.counts_label = tb.Label(self.root, bootstyle="light")
 
+        self.build_ui()
+        self.root.bind_all("<Control-P>", lambda e: self.toggle_perf_overlay())   # Ctrl+Shift+P
+
+        # всё, что трогает диск, — после первой отрисовки окна
+        self.root.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        """Отложенная часть инициализации (idle-колбэк после первого кадра)."""
+        self.root.update_idletasks()           # кадр гарантированно нарисован
+        self.t_paint = time.perf_counter() - _T_START
+
+        from profile_store import ProfileStore, ProfileJournal
+        from srs import SRSStore
+        from tk_executor import TkExecutor
+        self.io         = TkExecutor(self.root)     # вся работа с диском — в фоне
+        self.writer     = TkExecutor(self.root, workers=1)   # запись в БД — по порядку
+        self.store      = ProfileStore()            # профили: data/profiles.db
+        self.progress   = ProfileJournal(self.store, "progress", self.progress_snapshot)
+        self.srs        = SRSStore(journal=ProfileJournal(self.store, "srs"))
+        self.drill_journal = ProfileJournal(self.store, "drill")   # ответы тренировки
+        self.history_journal = ProfileJournal(self.store, "history")  # сессии «на сегодня»
+        for button in self._actions:            # обработчикам уже есть чем работать
+            button.config(state="normal")
+
+        def failed(e):
+            perf.error("LOAD ERROR", e)
+            self.apply_saved_state(None)
+
+        self.io.submit(self.read_saved_state,
+                       on_done=self.apply_saved_state, on_error=failed)
+
+    def read_saved_state(self) -> tuple:
+        """Фоновый поток: всё чтение с диска при запуске (без Tk), см. read_profile."""
+        from srs import SRS_PATH
+        # ── папка для прогресса и правок (контент читается из сборки) ──
+        ensure_data_dir()
+        self.store.open()
+        self.store.import_legacy(PROGRESS_PATH, SRS_PATH)   # один раз
+        profile = self.read_profile(self.store.current_profile())
+
+        # прогреем кэш контента, который понадобится сразу
+        try:
+            content.get("facts")
+            content.grammar((profile[1] or {}).get("user_level", "N5"))
+        except Exception:
+            pass                               # ошибку покажут сами окна
+        return profile
+
+    def apply_saved_state(self, profile: tuple | None):
+        """Поток Tk: прочитанное с диска → переменные и метки окна."""
+        if profile is not None:
+            self.apply_progress(self.use_profile(profile))   # восстановим (если есть)
+        self.profile_box.config(values=self.store.names)
+
         # наполним случайной информацией
         self.fact_label  .config(text=self.get_random_fact())
         self.advice_label.config(text=self.get_random_advice())
 
-        self.build_ui()
         # когда пользователь переключает N5/N4/N3, счётчик также меняется
-        self.user_level.trace_add("write", lambda *_: self.use_builtin_grammar())
+        self.user_level.trace_add(
+            "write", lambda *_: self._showing or self.use_builtin_grammar())
 
         # нарисуем первую актуальную цифру
         self.update_counts_label()
+        self.ready = self.loaded = True
+
+        perf.record("startup.first_paint", self.t_paint)
+        perf.record("startup.ready", time.perf_counter() - _T_START)
+        if self.startup_profile:
+            self.report_startup(self.t_paint, time.perf_counter() - _T_START)
+
+        # модуль шпаргалки подгрузим, пока пользователь осматривается
+        self.root.after(500, self.preload_form_guide)
+        self.start_watcher()
+
+    @staticmethod
+    def preload_form_guide():
+        import form_guide                  # noqa: F401 — только прогрев
+
+    def report_startup(self, t_paint: float, t_ready: float):
+        """--startup-profile: в консоль, а в оконной сборке (.exe) — в лог."""
+        lines = [
+            f"[STARTUP] import:      {IMPORT_TIME * 1000:8.1f} ms",
+            f"[STARTUP] first paint: {t_paint * 1000:8.1f} ms",
+            f"[STARTUP] ready:       {t_ready * 1000:8.1f} ms",
+            f"[STARTUP] io:          {self.io.metrics()}",
+        ]
+        if sys.stdout is not None:
+            print("\n".join(lines))
+        if sys.stdout is None or getattr(sys, "frozen", False):
+            try:
+                with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+                    f.write(time.strftime("%Y-%m-%d %H:%M:%S ") +
+                            " | ".join(lines) + "\n")
+            except OSError:
+                pass
 
     # ─────────────────── «каркас» UI ───────────────────
     def build_ui(self):
@@ -132,12 +253,19 @@ class MainMenu:
         ).pack(pady=(0, 10))
 
         # --- поля ввода / настройки ---------------------------------------
-        tb.Label(fr, text="Имя:").pack(anchor="w")
-        tb.Entry(fr, textvariable=self.user_name).pack(fill=X)
+        tb.Label(fr, text="Имя (профиль):").pack(anchor="w")
+        self.profile_box = tb.Combobox(fr, textvariable=self.user_name, values=[])
+        self.profile_box.pack(fill=X)
+        self.profile_box.bind("<<ComboboxSelected>>", lambda e: self.switch_profile())
+        self.profile_box.bind("<Return>", lambda e: self.switch_profile())
 
         tb.Label(fr, text="Повторяем:").pack(anchor="w", pady=(10, 0))
         tb.Combobox(fr, textvariable=self.mode,
-                    values=["grammar", "forms"], state="readonly").pack(fill=X)
+                    values=["grammar", "forms", "constructions"],
+                    state="readonly").pack(fill=X)
+        tb.Checkbutton(fr, text="Интервальное повторение (SRS)",
+                       variable=self.srs_enabled,
+                       bootstyle="round-toggle").pack(anchor="w", pady=(6, 0))
 
         tb.Label(fr, text="Уровень (для грамматики):").pack(anchor="w", pady=(10, 0))
         tb.Combobox(fr, textvariable=self.user_level,
@@ -153,7 +281,7 @@ class MainMenu:
         tb.Button(
             fr, text="🎲 Случайная грамматика",
             style=BTN_STYLE_NAME,
-            command=lambda: self.grammar_label.config(text=self.get_random_grammar())
+            command=self.show_random_grammar
         ).pack(pady=5)
 
         self.fact_label.pack(pady=3)
@@ -175,146 +303,292 @@ class MainMenu:
 
         tb.Button(fr, text="📖 Шпаргалка по формам",
                   style=BTN_STYLE_NAME, command=self.open_form_guide).pack(pady=(6, 0))
+        tb.Button(fr, text="✍ Тренировка спряжения",
+                  style=BTN_STYLE_NAME, command=self.open_drill).pack(pady=(6, 0))
+        tb.Button(fr, text="📊 Статистика",
+                  style=BTN_STYLE_NAME, command=self.open_stats).pack(pady=(6, 0))
+        tb.Button(fr, text="📝 Контент для правки",
+                  style=BTN_STYLE_NAME, command=self.extract_content).pack(pady=(6, 0))
+
+        # до finish_startup нет исполнителей и журналов — кнопки включит он
+        self._actions = [w for w in fr.winfo_children() if isinstance(w, tb.Button)]
+        for button in self._actions:
+            button.config(state="disabled")
                   
         self.counts_label.pack(pady=(10, 0)) 
 
     
     def use_builtin_grammar(self):
         """Переключаемся на встроенный список (N5/N4/N3)."""
-        self.grammar_source.set("builtin")
-        self.remaining_grammar.clear()       # заставим перечитать файл
-        self.update_counts_label()
+        self.sync_session().use_builtin_grammar()
+        self.update_counts_label()              # новый уровень читается в фоне
         
     # ─────────────────── «случайные» тексты ───────────────────────────────
+    def pick(self, pool: str, items):
+        """
+        Следующий элемент ротации `pool` — без повторов, пока не пройден
+        весь список; круг и курсор свои у профиля и у каждого уровня.
+        """
+        return items[self.session.rotate(pool, len(items), fp=fingerprint(items))]
+
     def get_random_fact(self):
         try:
-            with open("data/facts_200.json", encoding="utf-8") as f:
-                return "🎌 " + random.choice(json.load(f))
+            return "🎌 " + self.pick("facts", content.cached("facts"))
         except Exception as e:
             return f"🎌 (факт не загружен: {e})"
 
     def get_random_advice(self):
-        tips = [
-            "Повторяйте вслух для лучшей памяти.",
-            "Используйте интервальное повторение.",
-            "Смотрите видео на японском с субтитрами.",
-            "Ведите краткий дневник на японском."
-        ]
-        return "💡 " + random.choice(tips)
+        return "💡 " + self.pick("advice", ADVICE)
 
     def get_random_grammar(self):
+        pool = f"grammar_{self.user_level.get().lower()}"
         try:
-            lvl = self.user_level.get().lower()
-            with open(f"data/grammar_{lvl}.json", encoding="utf-8") as f:
-                g = random.choice(json.load(f))
+            g = self.pick(pool, content.cached(pool))
             return f"📚 {g['title']} — {g['comment']}"
         except Exception as e:
             return f"📚 (грамматика не загружена: {e})"
 
+    def show_random_grammar(self):
+        """Кнопка «🎲»: список уровня читается в фоне (если ещё не в кэше)."""
+        pool = f"grammar_{self.user_level.get().lower()}"
+
+        def show(level):
+            g = self.pick(pool, level)
+            self.grammar_label.config(text=f"📚 {g['title']} — {g['comment']}")
+
+        self.io.submit(
+            content.cached, pool, on_done=show,
+            on_error=lambda e: self.grammar_label.config(
+                text=f"📚 (грамматика не загружена: {e})"))
+
     # ─────────────────── импорт / сброс / подсчёт ─────────────────────────
     def import_grammar_list(self):
+        from tkinter import filedialog, messagebox
+        import importer
         path = filedialog.askopenfilename(
-            title="Выберите .txt со списком конструкций",
-            filetypes=[("Text files", "*.txt")])
+            title="Выберите список конструкций",
+            filetypes=importer.FILETYPES)
 
         # Подсказка о формате
         messagebox.showinfo(
             "Формат файла",
-            "В файле каждая конструкция должна быть\n"
-            "расположена на отдельной строке.\n"
-            "Пустые строки игнорируются."
+            ".txt — каждая конструкция на отдельной строке,\n"
+            "пустые строки игнорируются.\n"
+            ".csv / .tsv — колонки title, comment.\n"
+            ".json — как grammar_n5.json: [{\"title\", \"comment\"}, …].\n"
+            "Повторяющиеся записи отбрасываются."
         )
         if not path:
             return
         try:
-            with open(path, encoding="utf-8") as f:
-                self.imported_grammar = [ln.strip() for ln in f if ln.strip()]
-                if not self.imported_grammar:
-                    messagebox.showwarning("Импорт", "Файл пуст или все строки пустые!")
-                    return
-            self.remaining_grammar = self.imported_grammar.copy()
-            self.grammar_source.set("imported")
-            messagebox.showinfo("Импорт", f"Импортировано {len(self.imported_grammar)} конструкций.")
-            self.update_counts_label()
-            self.save_progress()
+            job = self._import_job = importer.ImportJob(path).start(submit=self.io.submit)
         except Exception as e:
             messagebox.showerror("Ошибка импорта", e)
+            return
+
+        # окно прогресса: опрашиваем поток импорта через after()
+        win = tb.Toplevel(self.root)
+        win.title("Импорт")
+        win.resizable(False, False)
+        status = tb.Label(win, text="Чтение файла…", width=48)
+        status.pack(padx=10, pady=(10, 4))
+        bar = tb.Progressbar(win, maximum=100, length=320, bootstyle="info-striped")
+        bar.pack(padx=10, pady=4)
+        tb.Button(win, text="Отмена", style=BTN_STYLE_NAME,
+                  command=job.cancel).pack(pady=(4, 10))
+        win.protocol("WM_DELETE_WINDOW", job.cancel)
+
+        def poll():
+            bar["value"] = job.fraction * 100
+            status.config(text=f"{job.lines} строк · {len(job.items)} конструкций · "
+                               f"{job.lines_per_sec:,.0f} строк/с")
+            if not job.done:
+                win.after(100, poll)
+                return
+            win.destroy()
+            self.finish_import(job)
+
+        poll()
+
+    def finish_import(self, job):
+        """Результат потока импорта → новый источник грамматики."""
+        from tkinter import messagebox
+        if job.cancelled:
+            return
+        if job.error is not None:
+            messagebox.showerror("Ошибка импорта", job.error)
+            return
+        if not job.items:
+            messagebox.showwarning("Импорт", "Файл пуст или все строки пустые!")
+            return
+
+        perf.record("import", job.elapsed, {"lines": job.lines, "items": len(job.items)})
+        self.sync_session().import_items(job.items)
+        self.update_counts_label()
+        messagebox.showinfo(
+            "Импорт",
+            f"Импортировано {len(job.items)} конструкций "
+            f"(дубликатов пропущено: {job.duplicates}).\n"
+            f"{job.lines} строк за {job.elapsed:.2f} с — "
+            f"{job.lines_per_sec:,.0f} строк/с."
+        )
 
     def reset_progress(self):
         """Полный сброс: снова встроенные списки + обнулить счётчики."""
-        self.grammar_source.set("builtin")          # ← ключевая строка
-        self.remaining_forms   = MainMenu.BUILTIN_FORMS.copy()
-        self.remaining_grammar = []                 # будет перезаполнен
-        self.ensure_builtin_loaded()
+        from tkinter import messagebox
+        try:
+            self.sync_session().reset()
+        except Exception as e:
+            messagebox.showerror("Ошибка", e)
         self.update_counts_label()
         messagebox.showinfo("Сброс", "Прогресс обнулён.")
         self.save_progress()
 
     # помощник: загружаем встроенный список N5/N4/N3 при первом обращении
     def ensure_builtin_loaded(self):
-        if self.remaining_grammar:
-            return
-        lvl = self.user_level.get().lower()
+        from tkinter import messagebox
         try:
-            with open(f"data/grammar_{lvl}.json", encoding="utf-8") as f:
-                self.remaining_grammar = [
-                    (g["title"], g.get("comment", "")) for g in json.load(f)
-                ]
+            self.sync_session().ensure_builtin_loaded()
         except Exception as e:
             messagebox.showerror("Ошибка", e)
+
+    # ─────────────────── окно ↔ Session ───────────────────
+    def sync_session(self) -> Session:
+        """Значения переменных окна → Session (перед любой операцией с ним)."""
+        s = self.session
+        s.user_name      = self.user_name.get()
+        s.user_level     = self.user_level.get()
+        s.mode           = self.mode.get()
+        s.selected_count = self.selected_count.get()
+        s.srs_enabled    = self.srs_enabled.get()
+        return s
+
+    def show_session(self):
+        """Session → переменные окна (после загрузки прогресса)."""
+        s = self.session
+        self._showing = True
+        try:
+            self.user_name.set(s.user_name)
+            self.user_level.set(s.user_level)
+            self.selected_count.set(s.selected_count)
+            self.srs_enabled.set(s.srs_enabled)
+        finally:
+            self._showing = False
             
         # ─────────────────── счёт оставшихся конструкций ───────────────────
     ### BEGIN get_remaining_grammar_count ###
-    def get_remaining_grammar_count(self) -> int:
+    def get_remaining_grammar_count(self) -> int | None:
         """
         Возвращает количество непройденных грамматических конструкций
         для текущего источника (builtin N5/N4/N3 или imported).
+        None — список уровня ещё читается в фоне, счётчик обновится сам.
         """
-        if self.grammar_source.get() == "builtin":
-            # загружаем список, если ещё не загружен
-            self.ensure_builtin_loaded()
-        return len(self.remaining_grammar)
+        s = self.sync_session()
+        if s.grammar_source == "builtin" and not s.grammar_pool:
+            # список берём только из кэша: с диска его читает self.io
+            level = content.peek(f"grammar_{s.user_level.lower()}")
+            if level is None:
+                self.load_builtin_level()
+                return None
+            s.ensure_builtin_loaded(level)
+        return len(s.grammar_pool)
     ### END get_remaining_grammar_count ###
 
-    def update_counts_label(self):
+    def load_builtin_level(self):
+        """Фоновое чтение списка уровня; по готовности — снова счётчик."""
+        from tkinter import messagebox
+        level = self.user_level.get()
+        if self._level_loading == level:
+            return
+        self._level_loading = level
+
+        def done(_):
+            self._level_loading = None
+            self.update_counts_label()
+
+        def failed(e):
+            self._level_loading = None
+            messagebox.showerror("Ошибка", e)
+
+        self.io.submit(content.grammar, level, on_done=done, on_error=failed)
+
+    def remaining_counts(self) -> dict[str, int | None]:
+        """
+        Подпись пула → сколько в нём осталось (метка счётчиков, статистика);
+        None — ещё неизвестно (список уровня читается).
+        """
         g_left = self.get_remaining_grammar_count()
-        f_left = len(self.remaining_forms)
 
         # Читаем, откуда берутся конструкции
-        if self.grammar_source.get() == "imported":
+        if self.session.grammar_source == "imported":
             src = "импорт"
         else:
             src = self.user_level.get()
 
-        self.counts_label.config(
-            text=f"Осталось   грамматика ({src}) — {g_left}   ·   формы — {f_left}"
-        )
+        counts = {f"грамматика ({src})": g_left, "формы": len(self.session.forms_pool)}
+        if (pool := self.session.constructions_pool) is not None:
+            counts["конструкции"] = len(pool)
+        return counts
+
+    def update_counts_label(self):
+        text = "   ·   ".join(f"{k} — {'…' if v is None else v}"
+                               for k, v in self.remaining_counts().items())
+        self.counts_label.config(text=f"Осталось   {text}")
 
     # ─────────────────── сессия «сегодняшние элементы» ────────────────────
     def get_today_items(self):
-        n = max(1, self.selected_count.get())
-        if self.mode.get() == "forms":
-            items = random.sample(self.remaining_forms, min(n, len(self.remaining_forms)))
-            self.remaining_forms = [x for x in self.remaining_forms if x not in items]
-            self.save_progress()
-            return items
-
-        if self.grammar_source.get() == "builtin":
-            self.ensure_builtin_loaded()
-        src = self.remaining_grammar
-        items = random.sample(src, min(n, len(src)))
-        self.remaining_grammar = [x for x in src if x not in items]
-        self.save_progress()
-        return items
+        s = self.sync_session()
+        if not s.srs_enabled and s.mode == "grammar" and s.grammar_source == "builtin":
+            self.ensure_builtin_loaded()        # ошибку чтения покажем окном
+        return s.today_items(srs=self.srs)
+
+    # ─────────────────── SRS: оценки ───────────────────
+    def build_grade_panel(self, win, items) -> tb.Frame:
+        """Строка на элемент: заголовок + кнопки оценки SM-2."""
+        from srs import GRADES
+        deck = self.session.srs_deck_name()
+        panel = tb.Frame(win)
+        tb.Label(panel, text="Оцените, насколько легко вспомнилось:",
+                 bootstyle="info").grid(row=0, column=0, columnspan=5, sticky="w")
+
+        for r, item in enumerate(items, start=1):
+            key = srs_key(item)
+            lbl = tb.Label(panel, text=key, width=18)
+            lbl.grid(row=r, column=0, sticky="w")
+            buttons = []
+
+            def grade(q, key=key, lbl=lbl, buttons=buttons):
+                if not self.ready:              # колоды ещё от прежнего профиля
+                    return
+                card = self.srs.grade(deck, key, q)
+                for b in buttons:
+                    b.config(state="disabled")
+                lbl.config(text=f"{key} → {card.interval} дн.")
+                self.schedule_flush()
+
+            for c, (label, q) in enumerate(GRADES, start=1):
+                b = tb.Button(panel, text=label, bootstyle="secondary-outline",
+                              command=lambda q=q, g=grade: g(q))
+                b.grid(row=r, column=c, padx=2, pady=1)
+                buttons.append(b)
+        return panel
 
     def start_session(self):
+        if not self.ready:                      # профиль ещё переключается
+            return
+        if self.user_name.get().strip() != self.profile_name:
+            self.switch_profile(then=self.start_session)   # сначала — профиль
+            return
         if (name := self.user_name.get().strip()):
             self.greeting_label.config(text=f"👋 Привет, {name}! Поехали!")
+        t0 = time.perf_counter()
         try:
             items = self.get_today_items()
         except Exception as e:
+            from tkinter import messagebox
             messagebox.showerror("Ошибка", e)
             return
+        self.log_history(items)
 
         win = tb.Toplevel(self.root)
         win.title("Сегодня нужно повторить")
@@ -322,6 +596,14 @@ class MainMenu:
                  font=("Segoe UI", 11, "bold"),
                  bootstyle="primary").pack(pady=5)
 
+        if self.srs_enabled.get():
+            if not items:
+                tb.Label(win, text="На сегодня всё повторено 🎉",
+                         bootstyle="success").pack(pady=5)
+            else:
+                self.build_grade_panel(win, items).pack(side="bottom", fill=X,
+                                                        padx=10, pady=5)
+
         tbx = tb.Text(win, width=40, height=15, font=("Segoe UI", 12), wrap="word")
         tbx.pack(side="left", fill="both", expand=True, padx=10, pady=5)
         scr = tb.Scrollbar(win, orient="vertical", command=tbx.yview)
@@ -360,66 +642,288 @@ class MainMenu:
         win.clipboard_clear()
         win.clipboard_append(tbx.get("1.0", "end").strip())
 
+        tb.Button(win, text="💾 Экспорт…", style=BTN_STYLE_NAME,
+                  command=lambda: self.export_items(items)).pack(pady=(5, 0))
         tb.Button(win, text="Закрыть", style=BTN_STYLE_NAME, command=win.destroy).pack(pady=5)
-        print("[DEBUG]", items, file=sys.stderr)
+        perf.record("window.session", time.perf_counter() - t0, {"items": len(items)})
 
         self.update_counts_label()
 
+    def export_items(self, items):
+        """Элементы окна сессии → файл CSV / TSV / Anki (export.py)."""
+        from tkinter import filedialog, messagebox
+        import export
+        path = filedialog.asksaveasfilename(
+            title="Экспорт карточек", defaultextension=".txt",
+            filetypes=export.FILETYPES)
+        if not path:
+            return
+        try:
+            n = export.export(path, export.items(items, f"today {self.session.mode}"))
+        except OSError as e:
+            messagebox.showerror("Ошибка экспорта", e)
+            return
+        messagebox.showinfo("Экспорт", f"Карточек: {n}\n{path}")
+
     # ─────────────────── окно-шпаргалка ───────────────────────────────────
     def open_form_guide(self):
         """Скрываем главное меню → открываем окно-шпаргалку."""
+        import form_guide                  # первый вызов импортирует модуль
         self.root.withdraw()
         top = tb.Toplevel(self.root)
 
         # создаём шпаргалку
-        form_guide.FormGuide(top, self.root)
+        with perf.span("window.form_guide"):
+            self.views.add(form_guide.FormGuide(top, self.root, self.io))
 
         def on_close():
             top.destroy()
             self.root.deiconify()
         top.protocol("WM_DELETE_WINDOW", on_close)
 
+    # ─────────────────── тренировка спряжения ─────────────────────────────
+    def open_drill(self):
+        import drill_window                # первый вызов импортирует модуль
+        top = tb.Toplevel(self.root)
+        with perf.span("window.drill"):
+            drill_window.DrillWindow(top, self.io, self.drill_journal.load, self.log_drill,
+                                     ready=lambda: self.ready)
+
+    def log_drill(self, op: str, **fields):
+        """Ответ тренировки → в БД той же отложенной пачкой, что и прогресс."""
+        self.drill_journal.append(op, **fields)
+        self.schedule_flush()
+
+    # ─────────────────── история и статистика ───────────────────────────
+    def log_history(self, items):
+        """Выданные элементы → запись истории (агрегаты обновит БД)."""
+        import history
+        if items:
+            self.history_journal.append("session", **history.entry(self.session, items))
+            self.schedule_flush()
+
+    def open_stats(self):
+        import history, stats_window
+        s = self.sync_session()
+        remaining = {k: v for k, v in self.remaining_counts().items() if v is not None}
+        self.flush_progress()                  # последние сессии — в БД до чтения
+
+        def load():
+            return self.history_journal.load(), history.catalog_sizes(len(s.imported_grammar))
+
+        top = tb.Toplevel(self.root)
+        with perf.span("window.stats"):       # чтение — в writer, после записи
+            stats_window.StatsWindow(top, self.writer, load, remaining)
+
+    # ─────────────────── профили ───────────────────────────────────────────
+    def read_profile(self, pid: int) -> tuple:
+        """
+        Фоновый поток: прогресс и колоды SRS профиля pid → (pid, прогресс,
+        колоды). Журналы и self.srs не трогаем — пока чтение идёт, поток Tk
+        ещё пишет в текущий профиль; переключает use_profile.
+        """
+        from srs import SRSStore
+        with perf.span("load.profile", pid=pid):
+            self.store.touch(pid)
+            data = self.store.read_progress(pid)
+            try:
+                decks = SRSStore.decks_from(self.store.read_srs(pid))
+            except Exception as e:
+                perf.error("LOAD ERROR", e)
+                decks = {}
+        return pid, data, decks
+
+    def use_profile(self, profile: tuple) -> dict:
+        """Поток Tk: прочитанный профиль становится текущим; его прогресс."""
+        pid, data, decks = profile
+        self.progress.profile = self.srs.journal.profile = pid
+        self.drill_journal.profile = self.history_journal.profile = pid
+        self.srs.decks = decks
+        return data
+
+    def switch_profile(self, then=None):
+        """
+        Другое имя → другой профиль (новое имя — новый профиль). Изменения
+        текущего профиля записываются той же фоновой задачей, до чтения
+        следующего.
+        """
+        from profile_store import DEFAULT_PROFILE
+        name = self.user_name.get().strip() or DEFAULT_PROFILE
+        if not self.ready or name == self.profile_name:
+            return
+        self.ready = False
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+            self._flush_job = None
+        self.sync_session().log_settings()
+        batch = self.pending_writes()
+
+        def work():
+            write_journals(batch)
+            return self.read_profile(self.store.profile_id(name))
+
+        def done(profile):
+            self.session = Session(log=self.log_progress)
+            self.apply_progress(self.use_profile(profile))
+            self.profile_box.config(values=self.store.names)
+            self.update_counts_label()
+            self.ready = True
+            if then is not None:
+                then()
+
+        def failed(e):
+            perf.error("LOAD ERROR", e)
+            self.user_name.set(self.profile_name)
+            self.ready = True
+
+        self.writer.submit(work, on_done=done, on_error=failed)
+
     # ─────────────────── сохранение / загрузка прогресса ──────────────────
+    def progress_snapshot(self) -> dict:
+        """Полное состояние прогресса (снимок для progress.json)."""
+        return self.sync_session().snapshot()
+
     def save_progress(self):
-        data = {
-            "remaining_grammar": self.remaining_grammar,
-            "remaining_forms": self.remaining_forms,
-            "grammar_source": self.grammar_source.get(),
-            "user_level": self.user_level.get(),
-            "imported_grammar": self.imported_grammar,
-            "selected_count": self.selected_count.get(),
-            "user_name": self.user_name.get(),
-        }
-        try:
-            with open(PROGRESS_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[SAVE ERROR] {e}")
+        """
+        Сброс, выход из программы: настройки + накопленные изменения.
+        В БД это несколько UPDATE строк, а не перезапись всего прогресса.
+        """
+        self.sync_session().log_settings()
+        self.flush_progress()
+
+    def log_progress(self, op: str, **fields):
+        """
+        Мелкое изменение → в журнал. Запись на диск откладывается на
+        FLUSH_DELAY_MS, чтобы серия действий стала одной операцией.
+        """
+        self.progress.append(op, **fields)
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self._flush_job is None:
+            self._flush_job = self.root.after(FLUSH_DELAY_MS, self.flush_progress)
+
+    def flush_progress(self):
+        """Накопленные записи журналов → одна фоновая задача записи."""
+        self._flush_job = None
+        if batch := self.pending_writes():
+            self.writer.submit(write_journals, batch,
+                           on_error=lambda e: perf.error("SAVE ERROR", e))
+
+    def pending_writes(self) -> list:
+        batch = []
+        for journal in (self.progress, self.srs.journal, self.drill_journal,
+                        self.history_journal):
+            records = journal.take_pending()
+            snap = (journal.prepare_snapshot()
+                    if journal.compaction_due(len(records)) else None)
+            if records or snap is not None:
+                batch.append((journal, records, snap))
+        return batch
 
     def load_progress(self):
-        if not os.path.exists(PROGRESS_PATH):
+        """Синхронная загрузка (при запуске чтение идёт в фоне, см. finish_startup)."""
+        self.apply_progress(self.progress.load())
+
+    def apply_progress(self, data: dict | None):
+        if data is None:
             return
         try:
-            with open(PROGRESS_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # конвертируем ["title", "comment"] → ("title", "comment")
-            def list2tuple(x):
-                return tuple(x) if isinstance(x, list) and len(x) == 2 else x
-
-            self.remaining_grammar = [list2tuple(x) for x in data.get("remaining_grammar", [])]
-            self.remaining_forms   = data.get("remaining_forms", MainMenu.BUILTIN_FORMS.copy())
-            self.grammar_source.set(data.get("grammar_source", "builtin"))
-            self.user_level.set(data.get("user_level", "N5"))
-            self.imported_grammar  = data.get("imported_grammar", [])
-            self.selected_count.set(data.get("selected_count", 5))
-            self.user_name.set(data.get("user_name", ""))
+            migrated = self.session.apply(data)
+            self.show_session()
+            self.profile_name = self.session.user_name
+            if migrated:
+                self.save_progress()         # журнал пишется поверх формата 2
         except Exception as e:
-            print(f"[LOAD ERROR] {e}")
+            perf.error("LOAD ERROR", e)
+
+    # ─────────────────── правка data/ на лету ───────────────────────────────
+    def extract_content(self):
+        """
+        JSON наборов из сборки → data/ (в .exe контент — только пакет и
+        JSON внутри сборки). Правки копий подхватываются на лету.
+        """
+        from tkinter import messagebox
+
+        def done(written):
+            text = ("Скопировано:\n" + "\n".join(os.path.basename(p) for p in written)
+                    if written else "Все наборы уже лежат в папке data.")
+            messagebox.showinfo("Контент для правки",
+                                f"{text}\n\nПапка: {os.path.abspath(content.repo.data_dir)}")
+
+        self.io.submit(content.repo.extract, on_done=done,
+                       on_error=lambda e: messagebox.showerror("Контент для правки", e))
+
+    def start_watcher(self):
+        """
+        Учителя правят data/*.json при открытой программе: наблюдатель
+        отдаёт имена изменённых файлов, перечитываются только они.
+        """
+        from watcher import FileWatcher
+        paths = {name: content.repo.path(name) for name in content.DATASETS}
+        try:
+            self.watcher = FileWatcher(paths, self._changed.put).start()
+        except OSError as e:
+            perf.error("IO ERROR", e)
+            return
+        self.root.after(WATCH_POLL_MS, self.poll_content_changes)
+
+    def poll_content_changes(self):
+        names = set()
+        while not self._changed.empty():
+            names |= self._changed.get_nowait()
+        if names:
+            self.io.submit(content.reload, names, on_done=self.content_reloaded)
+        self.root.after(WATCH_POLL_MS, self.poll_content_changes)
+
+    def content_reloaded(self, result):
+        """Новые версии уже в кэше content → счётчики и открытые окна."""
+        changed, errors = result
+        for e in errors.values():                # остаётся прежняя версия
+            perf.error("LOAD ERROR", e)
+        if not changed:
+            return
+        self.sync_session().content_changed(changed)
+        if "facts" in changed:
+            self.fact_label.config(text=self.get_random_fact())
+        self.update_counts_label()
+        for view in list(self.views):
+            view.content_changed(changed)
+
+    # ─────────────────── производительность ───────────────────────────────
+    def toggle_perf_overlay(self):
+        """
+        Ctrl+Shift+P: включить трассировку и открыть окно с цифрами;
+        повторное нажатие закрывает его (трассировка остаётся включённой
+        только если её включили через JT_PERF).
+        """
+        if self.io is None:                    # до finish_startup
+            return
+        import perf_overlay
+        if self._perf_overlay is not None and self._perf_overlay.alive():
+            self._perf_overlay.close()
+            return
+        perf.enable(True)
+
+        def closed():
+            self._perf_overlay = None
+            perf.enable(perf.from_env())
+
+        self._perf_overlay = perf_overlay.PerfOverlay(self.root, self.io, on_close=closed)
 
     # ─────────────────── выход — сохраняем прогресс ───────────────────────
     def on_close(self):
-        self.save_progress()
+        if self._flush_job is not None:
+            self.root.after_cancel(self._flush_job)
+        if self.loaded:           # и во время switch_profile (ready=False): настройки текущего
+            self.save_progress()  # профиля + журналы одной пачкой
+        if self._import_job is not None:
+            self._import_job.cancel()        # не ждём недочитанный импорт
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.io is not None:              # до finish_startup исполнителей нет
+            self.writer.shutdown(wait=True)  # дождёмся записи на диск
+            self.io.shutdown(wait=True)
         self.root.destroy()
 
     # ─────────────────── точка входа ───────────────────────────────────────
@@ -429,5 +933,5 @@ class MainMenu:
 
 # ─── запуск как основной скрипт ───────────────────────────────────────────
 if __name__ == "__main__":
-    MainMenu().run()
+    MainMenu(startup_profile="--startup-profile" in sys.argv).run()
 # ───────────────────────────────────────────────────────────────────────────
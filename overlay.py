@@ -0,0 +1,187 @@
+# ─── overlay.py ────────────────────────────────────────────────────────────
+"""
+Слои папки данных: сборка (файлы рядом с программой или в _MEIPASS,
+либо скомпилированный content.pack) и пользовательские файлы в data/.
+
+При первом запуске ничего не копируется — наборы читаются прямо из
+сборки. В data/ лежат только файлы, которые пользователь добавил или
+изменил, и они главнее сборки. data/overlay.json хранит штамп по файлу:
+
+    {"lessons.json": {"size": …, "mtime_ns": …, "sha1": "…", "base": "…"}}
+
+sha1 — содержимое файла в data/, base — sha1 файла сборки на момент,
+когда файл в data/ впервые встретился. sha1 == base — это нетронутая
+копия, читается сборка (в том числе обновлённая); иначе — правка
+пользователя. Хэш пересчитывается, только если у файла изменились
+размер или mtime; base не меняется, пока файл не удалят.
+
+Прежние версии при первом запуске копировали в data/ всё. Файл набора,
+который уже лежит в data/, когда манифеста ещё нет (первый запуск этой
+версии): совпадает с текущей сборкой — нетронутая копия; совпадает
+побайтно с одной из прежних сборок (SHIPPED_SHA1) — устаревшая копия,
+переносится в data/legacy/ и не закрывает обновлённый контент; иначе —
+правка пользователя, остаётся на месте. Манифест создаётся при первом
+же чтении, так что добавленные позже файлы — уже правки.
+"""
+import hashlib, json, os, threading
+
+import perf
+
+MANIFEST_NAME = "overlay.json"
+LEGACY_DIR = "legacy"                    # data/legacy/ — копии прежних версий
+
+# sha1 каждой выпущенной версии файлов наборов (их копировали в data/).
+# При правке JSON в репозитории — дописать sha1 прежней версии:
+#     git log --format=%h -- <файл> | while read c; do git show $c:<файл> | sha1sum; done
+SHIPPED_SHA1 = {
+    "facts_200.json": ("3b2d1e858140926d9ab529e1c0784dcc6aa62421",),
+    "lessons.json": ("fff1023635e25c8a38c50b28a7458549f2c7ee52",),
+    "grammar_n5.json": ("cab58e88f2caf61f6c3dd605ed4926cd3b977a26",),
+    "grammar_n4.json": ("9e7816767fdef555f99d23edcb11755342ff5b87",),
+    "grammar_n3.json": ("02b91679d2117be87dd6afd81cb1fd409f5808cd",),
+    "grammar_constructions.json": ("f508e5ce7f246e9132de0fa868aa10295bf1b566",),
+    "conjugation_table_with_translations.json": ("91ff62204bc8a047bdae22e32989d69aafee2178",),
+}
+
+
+def file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DataOverlay:
+    """Какой слой отдаёт файл: пользовательский (data/) или сборка."""
+
+    def __init__(self, user_dir: str, bundle_dir: str):
+        self.user_dir = user_dir
+        self.bundle_dir = bundle_dir
+        self.manifest_path = os.path.join(user_dir, MANIFEST_NAME)
+        self._entries: dict[str, dict] | None = None     # читается при первом resolve
+        self._legacy: set[str] = set()          # файлы data/ до появления манифеста
+        self._lock = threading.Lock()
+
+    def user_path(self, fname: str) -> str:
+        return os.path.join(self.user_dir, fname)
+
+    def bundle_path(self, fname: str) -> str:
+        return os.path.join(self.bundle_dir, fname)
+
+    def resolve(self, fname: str, bundle_sha1) -> str | None:
+        """
+        Путь к файлу в data/, если он главнее сборки; None — читать сборку.
+        bundle_sha1 — sha1 текущего файла сборки (hex) или None, если в
+        сборке такого файла нет; вызывается только когда файл в data/ есть
+        и либо не встречался, либо изменился — поэтому может быть функцией.
+        Звать и когда файла в data/ нет: первый вызов создаёт манифест, и
+        файлы, добавленные после, уже не примут за копии прежней версии.
+        """
+        path = self.user_path(fname)
+        if os.path.abspath(path) == os.path.abspath(self.bundle_path(fname)):
+            return None
+        with self._lock:
+            entries = self._load()             # первый вызов заводит манифест
+            stamp = file_stamp(path)
+            if stamp is None:
+                return None
+            entry = entries.get(fname)
+            if entry is None and fname in self._legacy:
+                self._legacy.discard(fname)
+                if not self._adopt_legacy(fname, path, stamp, bundle_sha1):
+                    return None
+                entry = entries.get(fname)
+            if entry is None or (entry["mtime_ns"], entry["size"]) != stamp:
+                base = entry["base"] if entry else (
+                    bundle_sha1() if callable(bundle_sha1) else bundle_sha1)
+                entries[fname] = entry = {"mtime_ns": stamp[0], "size": stamp[1],
+                                          "sha1": file_sha1(path), "base": base}
+                self._save()
+        return path if entry["sha1"] != entry["base"] else None
+
+    def _adopt_legacy(self, fname: str, path: str, stamp, bundle_sha1) -> bool:
+        """
+        Файл data/, лежавший там до манифеста. Совпадает с текущей сборкой —
+        в манифест как нетронутый (True); с прежней сборкой — устаревшая
+        копия, в data/legacy/ (False: читать сборку); иначе (правка, набор,
+        которого нет в сборке) — не трогаем, это правка пользователя (True).
+        """
+        base = bundle_sha1() if callable(bundle_sha1) else bundle_sha1
+        if base is None:
+            return True
+        sha1 = file_sha1(path)
+        if sha1 == base:
+            self._entries[fname] = {"mtime_ns": stamp[0], "size": stamp[1],
+                                    "sha1": sha1, "base": base}
+            self._save()
+            return True
+        if sha1 not in SHIPPED_SHA1.get(fname, ()):
+            return True
+        target = os.path.join(self.user_dir, LEGACY_DIR, fname)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+        except OSError as e:                      # не вышло — пусть остаётся правкой
+            perf.error("SAVE ERROR", f"{path}: {e}")
+            return True
+        perf.error("LEGACY", f"{path} → {target}: копия прежней версии, читается сборка")
+        return False
+
+    def add_copy(self, fname: str) -> None:
+        """Файл только что скопирован в data/ из сборки: нетронутая копия."""
+        path = self.user_path(fname)
+        with self._lock:
+            entries = self._load()
+            self._legacy.discard(fname)
+            stamp, sha1 = file_stamp(path), file_sha1(path)
+            entries[fname] = {"mtime_ns": stamp[0], "size": stamp[1],
+                              "sha1": sha1, "base": sha1}
+            self._save()
+
+    def overrides(self) -> list[str]:
+        """Файлы data/, которые сейчас главнее сборки."""
+        with self._lock:
+            entries = dict(self._load())
+        return sorted(f for f, e in entries.items()
+                      if e["sha1"] != e["base"] and os.path.exists(self.user_path(f)))
+
+    # ─────────────────── манифест ───────────────────
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    self._entries = dict(json.load(f))
+            except FileNotFoundError:
+                self._entries = {}
+                self._start_manifest()
+            except (OSError, ValueError, TypeError) as e:
+                perf.error("LOAD ERROR", f"{self.manifest_path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def _start_manifest(self) -> None:
+        """Первый запуск с манифестом: запомнить, что в data/ уже лежало."""
+        try:
+            self._legacy = {f for f in os.listdir(self.user_dir)
+                            if os.path.isfile(os.path.join(self.user_dir, f))}
+        except OSError:                           # папки ещё нет — копий тоже
+            return
+        self._save()
+
+    def _save(self) -> None:
+        tmp = self.manifest_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.manifest_path)
+        except OSError as e:                      # только чтение — штампы в памяти
+            perf.error("SAVE ERROR", f"{self.manifest_path}: {e}")
@@ -0,0 +1,192 @@
+# ─── perf.py ───────────────────────────────────────────────────────────────
+"""
+Лёгкая трассировка: именованные интервалы (span) вокруг загрузки
+контента, отрисовки, сохранения, импорта и создания окон.
+
+    with perf.span("content.load", name="lessons"):
+        ...
+
+По каждому имени хранятся последние RING замеров (кольцевой буфер) и
+считаются p50 / p95 / max; каждый замер пишется строкой в data/perf.log
+(с ротацией). Включается переменной окружения JT_PERF=1 или скрытой
+клавишей Ctrl+Shift+P в главном окне (она же открывает окно с цифрами —
+perf_overlay.py). Выключенный span() — одна проверка флага и общий
+пустой контекст-менеджер. Модуль без Tk: работает и в потоках пула,
+и в classroom.py.
+"""
+import functools, logging, os, sys, threading, time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+ENV_VAR     = "JT_PERF"
+LOG_PATH    = "data/perf.log"
+LOG_BYTES   = 512 * 1024                 # × (1 + LOG_BACKUPS) файлов максимум
+LOG_BACKUPS = 3
+RING        = 512                        # замеров на имя
+
+
+def from_env() -> bool:
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+enabled = from_env()
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(p * len(s)))]
+
+
+# ─────────────────── интервалы ───────────────────
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "info", "t0")
+
+    def __init__(self, name: str, info: dict):
+        self.name = name
+        self.info = info
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.t0, self.info,
+               failed=exc_type is not None)
+        return False
+
+
+def span(name: str, /, **info):
+    """Контекст-менеджер замера; info — подробности для строки лога."""
+    if not enabled:
+        return NULL_SPAN
+    return Span(name, info)
+
+
+def traced(name: str):
+    """Декоратор: каждый вызов функции — span(name)."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ─────────────────── статистика ───────────────────
+class SpanStats:
+    __slots__ = ("times", "count", "errors")
+
+    def __init__(self):
+        self.times: deque[float] = deque(maxlen=RING)
+        self.count = 0
+        self.errors = 0
+
+    def summary(self) -> dict:
+        t = list(self.times)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "last_ms": round(t[-1] * 1000, 2) if t else 0.0,
+            "p50_ms": round(percentile(t, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(t, 0.95) * 1000, 2),
+            "max_ms": round(max(t) * 1000, 2) if t else 0.0,
+        }
+
+
+_stats: dict[str, SpanStats] = {}
+_lock = threading.Lock()
+
+
+def record(name: str, seconds: float, info: dict | None = None,
+           failed: bool = False) -> None:
+    """Готовый замер (например, время старта, посчитанное заранее)."""
+    if not enabled:
+        return
+    with _lock:
+        st = _stats.get(name)
+        if st is None:
+            st = _stats[name] = SpanStats()
+        st.times.append(seconds)
+        st.count += 1
+        st.errors += failed
+    extra = "".join(f" {k}={v}" for k, v in (info or {}).items())
+    _write(f"{name} {seconds * 1000:.2f}ms{extra}{' FAILED' if failed else ''}")
+
+
+def summary() -> dict[str, dict]:
+    """Имя → count / errors / last / p50 / p95 / max (мс), по алфавиту."""
+    with _lock:
+        return {name: _stats[name].summary() for name in sorted(_stats)}
+
+
+def reset() -> None:
+    with _lock:
+        _stats.clear()
+
+
+def enable(on: bool = True) -> None:
+    global enabled
+    enabled = on
+    if on:
+        _write(f"tracing on (pid {os.getpid()})")
+
+
+# ─────────────────── лог ───────────────────
+_logger: logging.Logger | None = None
+_log_failed = False
+_log_lock = threading.Lock()
+
+
+def _open_log() -> logging.Logger | None:
+    global _logger, _log_failed
+    with _log_lock:                               # пишут и поток Tk, и пул
+        if _logger is None and not _log_failed:
+            try:
+                os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+                handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_BYTES,
+                                              backupCount=LOG_BACKUPS, encoding="utf-8")
+            except OSError:
+                _log_failed = True                # папка только для чтения и т. п.
+                return None
+            handler.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+            logger = logging.getLogger("jt.perf")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            _logger = logger
+        return _logger
+
+
+def _write(line: str) -> None:
+    logger = _logger or _open_log()
+    if logger is not None:
+        logger.info(line)
+
+
+def error(tag: str, e) -> None:
+    """
+    [LOAD ERROR] / [SAVE ERROR] …: в консоль, как раньше, а если
+    трассировка включена или консоли нет (оконная сборка .exe) — ещё и в лог.
+    """
+    if sys.stdout is not None:
+        print(f"[{tag}] {e}")
+    if enabled or sys.stdout is None:
+        _write(f"[{tag}] {e}")
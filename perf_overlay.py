@@ -0,0 +1,83 @@
+# ─── perf_overlay.py ───────────────────────────────────────────────────────
+"""
+Окно «Производительность» (Ctrl+Shift+P в главном меню): по строке на
+интервал perf — число замеров, последний, p50, p95, максимум — плюс
+очередь и задержки TkExecutor. Обновляется раз в REFRESH_MS, строки
+переиспользуются (меняются только значения).
+"""
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+import perf
+
+REFRESH_MS = 500
+COLUMNS = (("span", "интервал", 170), ("count", "n", 50), ("last_ms", "посл., мс", 80),
+           ("p50_ms", "p50, мс", 80), ("p95_ms", "p95, мс", 80), ("max_ms", "max, мс", 80))
+
+
+class PerfOverlay:
+    def __init__(self, master, io=None, on_close=None):
+        self.io = io
+        self.on_close = on_close
+        self._job = None
+
+        self.win = tb.Toplevel(master)
+        self.win.title("Производительность")
+        self.win.attributes("-topmost", True)
+        self.win.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.tv = tb.Treeview(self.win, columns=[c for c, *_ in COLUMNS],
+                              show="headings", height=14)
+        for col, text, width in COLUMNS:
+            self.tv.heading(col, text=text)
+            self.tv.column(col, width=width, anchor="w" if col == "span" else "e")
+        self.tv.pack(fill=BOTH, expand=YES, padx=6, pady=(6, 2))
+
+        self.io_label = tb.Label(self.win, bootstyle="secondary", font=("Segoe UI", 9))
+        self.io_label.pack(anchor="w", padx=6)
+
+        bar = tb.Frame(self.win)
+        bar.pack(fill=X, padx=6, pady=6)
+        tb.Label(bar, text=f"лог: {perf.LOG_PATH}", bootstyle="secondary",
+                 font=("Segoe UI", 9)).pack(side=LEFT)
+        tb.Button(bar, text="Закрыть", bootstyle="secondary, outline",
+                  command=self.close).pack(side=RIGHT)
+        tb.Button(bar, text="Сбросить", bootstyle="secondary, outline",
+                  command=perf.reset).pack(side=RIGHT, padx=4)
+
+        self.refresh()
+
+    def refresh(self):
+        rows = perf.summary()
+        for iid in self.tv.get_children():
+            if iid not in rows:                   # после «Сбросить»
+                self.tv.delete(iid)
+        for name, st in rows.items():
+            values = (name, st["count"], st["last_ms"], st["p50_ms"],
+                      st["p95_ms"], st["max_ms"])
+            if self.tv.exists(name):
+                self.tv.item(name, values=values)
+            else:
+                self.tv.insert("", "end", iid=name, values=values)
+
+        if self.io is not None:
+            m = self.io.metrics()
+            self.io_label.config(
+                text=f"io: очередь {m['queue_depth']} · выполнено {m['completed']} · "
+                     f"ошибок {m['failed']} · p50 {m['latency_ms_p50']} мс · "
+                     f"p95 {m['latency_ms_p95']} мс")
+        self._job = self.win.after(REFRESH_MS, self.refresh)
+
+    def alive(self) -> bool:
+        try:
+            return bool(self.win.winfo_exists())
+        except Exception:
+            return False
+
+    def close(self):
+        if self._job is not None:
+            self.win.after_cancel(self._job)
+            self._job = None
+        self.win.destroy()
+        if self.on_close is not None:
+            self.on_close()
@@ -0,0 +1,310 @@
+# ─── pools.py ──────────────────────────────────────────────────────────────
+"""
+Пулы «оставшихся» элементов в виде компактных массивов id.
+
+id — это индекс элемента в стабильном каталоге (список грамматики уровня,
+MainMenu.BUILTIN_FORMS, импортированный список). Выборка k элементов —
+k извлечений swap-remove, O(k) вместо O(n·k) сравнений кортежей.
+В progress.json пул хранится битовой картой по размеру каталога и
+отпечатком каталога (fingerprint — хеш заголовков): тот же размер, но
+другие элементы (список отредактировали или заменили) — пул отбрасывается.
+
+ShuffleBag — ротация без повторов (факты, советы, случайная грамматика):
+перестановка каталога с курсором, после конца круга — новая перестановка.
+Хранится не сама перестановка, а зерно + курсор: четыре числа на пул.
+
+WeightedPool — тот же пул id, но выборка пропорциональна весу (частота
+конструкции, её уровень относительно уровня ученика): таблица псевдонимов
+Vose, O(1) на извлечение. Вытянутый id только помечается удалённым, а
+попавший в него бросок повторяется (rejection); таблица пересобирается
+по оставшимся id, лишь когда их суммарный вес падает ниже REBUILD_AT от
+веса таблицы — в среднем не больше 1 / REBUILD_AT бросков на извлечение.
+"""
+import base64, hashlib, random
+from array import array
+from collections.abc import Mapping
+
+_fingerprints: dict[int, tuple[object, str]] = {}    # id(каталог) → (каталог, отпечаток)
+
+
+class IdPool:
+    """Неупорядоченное множество id с O(1) случайным извлечением."""
+
+    __slots__ = ("ids",)
+
+    def __init__(self, ids=()):
+        self.ids = array("I", ids)
+
+    @classmethod
+    def full(cls, size: int) -> "IdPool":
+        return cls(range(size))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __bool__(self):
+        return len(self.ids) > 0
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def clear(self):
+        del self.ids[:]
+
+    def draw(self, k: int, rng=random) -> list[int]:
+        """Случайные k id без повторов; выбранные удаляются из пула."""
+        ids, out = self.ids, []
+        for _ in range(min(k, len(ids))):
+            i = rng.randrange(len(ids))
+            ids[i], ids[-1] = ids[-1], ids[i]
+            out.append(ids.pop())
+        return out
+
+    # ---------- сериализация ----------
+    def to_bitmap(self, size: int) -> str:
+        bits = bytearray((size + 7) // 8)
+        for i in self.ids:
+            bits[i >> 3] |= 1 << (i & 7)
+        return base64.b64encode(bits).decode("ascii")
+
+    @classmethod
+    def from_bitmap(cls, data: str, size: int) -> "IdPool":
+        bits = base64.b64decode(data)
+        return cls(i for i in range(min(size, len(bits) * 8))
+                   if bits[i >> 3] >> (i & 7) & 1)
+
+    def dump(self, size: int, fp: str | None = None) -> dict:
+        data = {"size": size, "bitmap": self.to_bitmap(size)}
+        if fp is not None:
+            data["fp"] = fp
+        return data
+
+    @classmethod
+    def load(cls, data: dict | None, size: int, fp: str | None = None) -> "IdPool | None":
+        """
+        Пул из progress.json; None, если данных нет или каталог с тех пор
+        изменился (id больше не соответствуют элементам): другой размер
+        или другой отпечаток fp. Сохранённый без отпечатка — по размеру.
+        """
+        if not matches(data, size, fp):
+            return None
+        return cls.from_bitmap(data.get("bitmap", ""), size)
+
+
+def matches(data: dict | None, size: int, fp: str | None = None) -> bool:
+    """Сохранённый пул / ротация относится к каталогу размера size с отпечатком fp."""
+    if not data or data.get("size") != size:
+        return False
+    return fp is None or data.get("fp", fp) == fp
+
+
+def fingerprint(catalog) -> str:
+    """
+    Отпечаток каталога: хеш заголовков элементов по порядку (строка,
+    [title, comment], GrammarEntry, словарь с "title"). Неизменяемые
+    каталоги (кортежи из content) считаются один раз на объект.
+    """
+    cached = _fingerprints.get(id(catalog))
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    h = hashlib.blake2b(digest_size=8)
+    for x in catalog:
+        h.update(str(_title(x)).encode("utf-8"))
+        h.update(b"\0")
+    fp = h.hexdigest()
+    if not isinstance(catalog, list):             # список могут дописать на месте
+        if len(_fingerprints) > 16:
+            _fingerprints.clear()
+        _fingerprints[id(catalog)] = (catalog, fp)
+    return fp
+
+
+def _title(x):
+    if isinstance(x, Mapping):
+        return x.get("title")
+    if isinstance(x, (list, tuple)):
+        return x[0] if x else ""
+    return x
+
+
+def ids_from_items(items, catalog) -> list[int]:
+    """
+    Миграция старого progress.json: элементы (строки / [title, comment])
+    → id в каталоге. Дубликаты сопоставляются с разными позициями,
+    элементы, которых в каталоге больше нет, отбрасываются.
+    """
+    positions: dict = {}
+    for i, x in enumerate(catalog):
+        positions.setdefault(_key(x), []).append(i)
+    out = []
+    for x in items:
+        if free := positions.get(_key(x)):
+            out.append(free.pop(0))
+    return out
+
+
+def _key(x):
+    return tuple(x) if isinstance(x, (list, tuple)) else x
+
+
+class ShuffleBag:
+    """
+    Ротация id 0..size-1: каждый по разу в случайном порядке, затем новый
+    круг. Порядок круга восстанавливается из seed; prev — последний id
+    прошлого круга, он не ставится первым (без повтора на стыке кругов).
+    fp — отпечаток каталога (см. fingerprint), если известен.
+    """
+
+    __slots__ = ("size", "seed", "cursor", "prev", "fp", "_order")
+
+    def __init__(self, size: int, seed: int | None = None, cursor: int = 0,
+                 prev: int = -1, rng=random, fp: str | None = None):
+        self.size = size
+        self.fp = fp
+        self.seed = rng.getrandbits(32) if seed is None else seed
+        self.cursor = min(max(cursor, 0), size)
+        self.prev = prev
+        self._order: array | None = None        # строится при первом next()
+
+    def order(self) -> array:
+        if self._order is None:
+            order = array("I", range(self.size))
+            shuffle = random.Random(self.seed)
+            shuffle.shuffle(order)
+            if self.size > 1 and order[0] == self.prev:
+                j = shuffle.randrange(1, self.size)
+                order[0], order[j] = order[j], order[0]
+            self._order = order
+        return self._order
+
+    def next(self, rng=random) -> int:
+        """Следующий id круга, O(1); IndexError — каталог пуст."""
+        if not self.size:
+            raise IndexError("пустой каталог")
+        if self.cursor >= self.size:                # круг пройден → новый
+            self.prev = self.order()[-1]
+            self.seed = rng.getrandbits(32)
+            self.cursor = 0
+            self._order = None
+        i = self.order()[self.cursor]
+        self.cursor += 1
+        return i
+
+    def fits(self, size: int, fp: str | None = None) -> bool:
+        """Ротация всё ещё по каталогу размера size с отпечатком fp."""
+        return self.size == size and (fp is None or self.fp in (None, fp))
+
+    def dump(self) -> dict:
+        data = {"size": self.size, "seed": self.seed,
+                "cursor": self.cursor, "prev": self.prev}
+        if self.fp is not None:
+            data["fp"] = self.fp
+        return data
+
+    @classmethod
+    def load(cls, data: dict | None, size: int, fp: str | None = None) -> "ShuffleBag | None":
+        """Сохранённая ротация; None, если её нет или каталог сменился (размер, fp)."""
+        if not matches(data, size, fp):
+            return None
+        return cls(size, data["seed"], data.get("cursor", 0), data.get("prev", -1),
+                   fp=data.get("fp", fp))
+
+
+REBUILD_AT = 0.5                 # доля живого веса, ниже которой таблица пересобирается
+
+
+class WeightedPool:
+    """
+    Множество id с извлечением пропорционально weights[id]. Интерфейс —
+    как у IdPool (len / iter / clear / draw / dump), поэтому хранится тем же
+    форматом битовой карты; веса не сохраняются, а считаются по каталогу.
+    """
+
+    __slots__ = ("weights", "alive", "count", "live_weight",
+                 "slots", "prob", "alias", "table_weight")
+
+    def __init__(self, ids=(), weights=()):
+        self.weights = weights                  # id → вес > 0 (по всему каталогу)
+        self.alive = bytearray(len(weights))
+        for i in ids:
+            self.alive[i] = 1
+        self.count = sum(self.alive)
+        self.slots = array("I", (i for i in range(len(weights)) if self.alive[i]))
+        self._build()
+
+    @classmethod
+    def full(cls, weights) -> "WeightedPool":
+        return cls(range(len(weights)), weights)
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return (i for i in self.slots if self.alive[i])
+
+    def clear(self):
+        self.alive = bytearray(len(self.weights))
+        self.count = 0
+        self._build()
+
+    def reweight(self, weights) -> None:
+        """Новые веса того же каталога (сменился уровень ученика)."""
+        self.weights = weights
+        self._build()
+
+    # ---------- таблица псевдонимов ----------
+    def _build(self) -> None:
+        """Vose: по оставшимся id, O(n)."""
+        alive, w = self.alive, self.weights
+        slots = self.slots = array("I", (i for i in self.slots if alive[i]))
+        n = len(slots)
+        total = self.table_weight = self.live_weight = float(sum(w[i] for i in slots))
+        prob, alias = array("d", bytes(8 * n)), array("I", bytes(4 * n))
+        scaled = [w[i] * n / total for i in slots] if total else []
+        small = [j for j, p in enumerate(scaled) if p < 1.0]
+        large = [j for j, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for j in large + small:                   # остатки — из-за округления
+            prob[j], alias[j] = 1.0, j
+        self.prob, self.alias = prob, alias
+
+    def sample(self, rng=random) -> int:
+        """Один id ∝ весу, без удаления; IndexError — пул пуст."""
+        if not self.count:
+            raise IndexError("пул пуст")
+        if self.live_weight < self.table_weight * REBUILD_AT:
+            self._build()
+        slots, prob, alias, alive = self.slots, self.prob, self.alias, self.alive
+        n = len(slots)
+        while True:
+            j = int(rng.random() * n)
+            i = slots[j if rng.random() < prob[j] else alias[j]]
+            if alive[i]:
+                return i
+
+    def draw(self, k: int, rng=random) -> list[int]:
+        """k id без повторов, с вероятностью ∝ весу; выбранные удаляются."""
+        out = []
+        for _ in range(min(k, self.count)):
+            i = self.sample(rng)
+            self.alive[i] = 0
+            self.count -= 1
+            self.live_weight -= self.weights[i]
+            out.append(i)
+        return out
+
+    # ---------- сериализация ----------
+    def dump(self, size: int, fp: str | None = None) -> dict:
+        return IdPool(self).dump(size, fp)
+
+    @classmethod
+    def load(cls, data: dict | None, weights, fp: str | None = None) -> "WeightedPool | None":
+        pool = IdPool.load(data, len(weights), fp)
+        return None if pool is None else cls(pool, weights)
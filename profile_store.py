@@ -0,0 +1,532 @@
+# ─── profile_store.py ──────────────────────────────────────────────────────
+"""
+Прогресс нескольких пользователей в SQLite (data/profiles.db, режим WAL).
+
+    profiles — профиль = имя + настройки (уровень, источник, число, SRS)
+    items    — элементы пулов: (профиль, источник, id) + «ещё не пройден»;
+               у импортированных списков — ещё и сам текст
+    catalogs — отпечаток каталога пула (pools.fingerprint) на момент записи
+    reviews  — состояние SRS-карточки (ease, интервал, повторы, срыв, due)
+    drill_answers — каждый ответ тренировки спряжения (для разбора потом)
+    drill_stats   — по форме: попытки, верные, суммарное время ответа
+    rotations     — круги без повторов (факты, советы, грамматика уровня):
+                    зерно перестановки + курсор (+ отпечаток), по строке на пул
+    history       — каждая сессия «на сегодня» (только добавление);
+    history_stats / history_days / history_coverage — её агрегаты:
+                    итоги и серия, сессии по дням, покрытие групп
+                    (history_seen — какие элементы уже встречались)
+
+Источник пула: forms, constructions, grammar_n5/n4/n3 или imported. Индексы — по
+(профиль, источник, remaining) и по (профиль, колода, due).
+
+Запись идёт теми же записями журнала, что и в progress_store
+(set / pool / draw / import / rotate / review; answer — у тренировки,
+session — у истории), но каждая запись — это несколько
+UPDATE/INSERT отдельных строк, а не перезапись файла. ProfileJournal —
+замена ProgressJournal с тем же интерфейсом для MainMenu и SRSStore.
+
+Соединения — по одному на поток: WAL позволяет читать параллельно с
+записью (например, классный журнал читает, пока окно пишет).
+"""
+import json, os, sqlite3, threading, time
+
+from history import RECENT_DAYS, Totals, day_of
+from pools import IdPool
+from session import BUILTIN_FORMS, PROGRESS_FORMAT
+
+DB_PATH = "data/profiles.db"
+DEFAULT_PROFILE = "Гость"
+SCHEMA_VERSION = 2                       # 2: отпечатки каталогов (catalogs, rotations.fp)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    id             INTEGER PRIMARY KEY,
+    name           TEXT NOT NULL UNIQUE,
+    user_level     TEXT NOT NULL DEFAULT 'N5',
+    grammar_source TEXT NOT NULL DEFAULT 'builtin',
+    selected_count INTEGER NOT NULL DEFAULT 5,
+    srs_enabled    INTEGER NOT NULL DEFAULT 0,
+    last_used      REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS items (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    source     TEXT NOT NULL,
+    item_id    INTEGER NOT NULL,
+    title      TEXT,
+    comment    TEXT,
+    remaining  INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (profile_id, source, item_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_by_source ON items (profile_id, source, remaining);
+CREATE TABLE IF NOT EXISTS catalogs (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    source     TEXT NOT NULL,
+    fp         TEXT NOT NULL,
+    PRIMARY KEY (profile_id, source)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reviews (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    deck       TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    ease       REAL NOT NULL,
+    interval   INTEGER NOT NULL,
+    reps       INTEGER NOT NULL,
+    lapses     INTEGER NOT NULL,
+    due        REAL NOT NULL,
+    PRIMARY KEY (profile_id, deck, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS reviews_by_due ON reviews (profile_id, deck, due);
+CREATE TABLE IF NOT EXISTS drill_answers (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    ts         REAL NOT NULL,
+    verb       TEXT NOT NULL,
+    form       TEXT NOT NULL,
+    answer     TEXT NOT NULL,
+    correct    INTEGER NOT NULL,
+    ms         INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS drill_answers_by_form ON drill_answers (profile_id, form, ts);
+CREATE TABLE IF NOT EXISTS drill_stats (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    form       TEXT NOT NULL,
+    attempts   INTEGER NOT NULL,
+    correct    INTEGER NOT NULL,
+    total_ms   INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, form)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rotations (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    pool       TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    seed       INTEGER NOT NULL,
+    cursor     INTEGER NOT NULL,
+    prev       INTEGER NOT NULL,
+    fp         TEXT,
+    PRIMARY KEY (profile_id, pool)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    ts         REAL NOT NULL,
+    mode       TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    level      TEXT NOT NULL,
+    items      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_by_ts ON history (profile_id, ts);
+CREATE TABLE IF NOT EXISTS history_stats (
+    profile_id  INTEGER PRIMARY KEY REFERENCES profiles(id) ON DELETE CASCADE,
+    sessions    INTEGER NOT NULL,
+    items       INTEGER NOT NULL,
+    days        INTEGER NOT NULL,
+    first_day   INTEGER NOT NULL,
+    last_day    INTEGER NOT NULL,
+    streak      INTEGER NOT NULL,
+    best_streak INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history_days (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    day        INTEGER NOT NULL,
+    sessions   INTEGER NOT NULL,
+    items      INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history_seen (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    source     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    PRIMARY KEY (profile_id, source, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history_coverage (
+    profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    grp        TEXT NOT NULL,
+    seen       INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, grp)
+) WITHOUT ROWID;
+"""
+
+SETTINGS = ("user_level", "grammar_source", "selected_count", "srs_enabled")
+
+
+def grammar_source_key(grammar_source: str, user_level: str) -> str:
+    """Источник пула грамматики: imported или grammar_n5/n4/n3."""
+    if grammar_source == "imported":
+        return "imported"
+    return f"grammar_{user_level.lower()}"
+
+
+class ProfileStore:
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.names: list[str] = []             # для списка профилей в окне
+        self._local = threading.local()
+        self._lock = threading.Lock()           # один писатель из процесса
+
+    # ─────────────────── соединение ───────────────────
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")   # в WAL этого достаточно
+            db.execute("PRAGMA foreign_keys=ON")
+            self._local.db = db
+        return db
+
+    def open(self) -> None:
+        """Создать схему (если нужно) и прочитать список профилей."""
+        db = self._db()
+        with self._lock:
+            db.executescript(SCHEMA)
+            if "fp" not in {r[1] for r in db.execute("PRAGMA table_info(rotations)")}:
+                db.execute("ALTER TABLE rotations ADD COLUMN fp TEXT")     # схема 1
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)",
+                       (str(SCHEMA_VERSION),))
+        self._refresh_names()
+
+    def close(self) -> None:
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def _refresh_names(self):
+        self.names = [r[0] for r in self._db().execute(
+            "SELECT name FROM profiles ORDER BY last_used DESC, name")]
+
+    # ─────────────────── профили ───────────────────
+    def profile_id(self, name: str, create: bool = True) -> int | None:
+        """
+        id профиля; новый профиль — с полным пулом форм. INSERT OR IGNORE,
+        затем SELECT: второй процесс с тем же именем не упадёт на UNIQUE.
+        """
+        name = name.strip() or DEFAULT_PROFILE
+        db = self._db()
+        if not create:
+            row = db.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()
+            return row and row[0]
+        with self._lock:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                created = db.execute(
+                    "INSERT OR IGNORE INTO profiles (name, last_used) VALUES (?, ?)",
+                    (name, time.time())).rowcount
+                pid = db.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()[0]
+                if created:
+                    db.executemany(
+                        "INSERT INTO items (profile_id, source, item_id) VALUES (?, 'forms', ?)",
+                        ((pid, i) for i in range(len(BUILTIN_FORMS))))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        if created:
+            self._refresh_names()
+        return pid
+
+    def current_profile(self) -> int:
+        """Последний открытый профиль (или новый «Гость»)."""
+        row = self._db().execute(
+            "SELECT id FROM profiles ORDER BY last_used DESC LIMIT 1").fetchone()
+        return row[0] if row else self.profile_id(DEFAULT_PROFILE)
+
+    def touch(self, pid: int) -> None:
+        with self._lock:
+            self._db().execute("UPDATE profiles SET last_used = ? WHERE id = ?",
+                               (time.time(), pid))
+        self._refresh_names()
+
+    # ─────────────────── чтение ───────────────────
+    def _pool(self, pid: int, source: str) -> dict | None:
+        db = self._db()
+        rows = db.execute(
+            "SELECT item_id, remaining FROM items WHERE profile_id = ? AND source = ?",
+            (pid, source)).fetchall()
+        if not rows:
+            return None
+        fp = db.execute("SELECT fp FROM catalogs WHERE profile_id = ? AND source = ?",
+                        (pid, source)).fetchone()
+        return IdPool(i for i, left in rows if left).dump(len(rows), fp and fp[0])
+
+    def read_progress(self, pid: int) -> dict:
+        """Состояние профиля в формате снимка Session.snapshot()."""
+        db = self._db()
+        name, level, source, count, srs = db.execute(
+            "SELECT name, user_level, grammar_source, selected_count, srs_enabled "
+            "FROM profiles WHERE id = ?", (pid,)).fetchone()
+        imported = [t if c is None else [t, c] for t, c in db.execute(
+            "SELECT title, comment FROM items WHERE profile_id = ? AND source = 'imported' "
+            "ORDER BY item_id", (pid,))]
+        return {
+            "format": PROGRESS_FORMAT,
+            "user_name": name,
+            "user_level": level,
+            "grammar_source": source,
+            "selected_count": count,
+            "srs_enabled": bool(srs),
+            "imported_grammar": imported,
+            "grammar_pool": self._pool(pid, grammar_source_key(source, level)),
+            "forms_pool": self._pool(pid, "forms"),
+            "constructions_pool": self._pool(pid, "constructions"),
+            "rotations": {pool: {"size": size, "seed": seed, "cursor": cursor, "prev": prev,
+                                 **({"fp": fp} if fp else {})}
+                          for pool, size, seed, cursor, prev, fp in db.execute(
+                              "SELECT pool, size, seed, cursor, prev, fp FROM rotations "
+                              "WHERE profile_id = ?", (pid,))},
+        }
+
+    def read_srs(self, pid: int) -> dict:
+        """Колоды профиля в формате SRSStore.snapshot()."""
+        decks: dict[str, dict] = {}
+        for deck, key, *card in self._db().execute(
+                "SELECT deck, key, ease, interval, reps, lapses, due FROM reviews "
+                "WHERE profile_id = ?", (pid,)):
+            decks.setdefault(deck, {})[key] = card
+        return {"decks": decks}
+
+    def read_drill(self, pid: int) -> dict:
+        """Статистика тренировки: форма → [попытки, верные, суммарно мс]."""
+        return {form: list(v) for form, *v in self._db().execute(
+            "SELECT form, attempts, correct, total_ms FROM drill_stats "
+            "WHERE profile_id = ?", (pid,))}
+
+    def read_history(self, pid: int, recent: int = RECENT_DAYS) -> dict:
+        """
+        Агрегаты истории сессий: итоги (Totals.dump()), последние recent
+        дней с занятиями [день, сессии, элементы] и покрытие групп.
+        """
+        db = self._db()
+        totals = db.execute(
+            "SELECT sessions, items, days, first_day, last_day, streak, best_streak "
+            "FROM history_stats WHERE profile_id = ?", (pid,)).fetchone()
+        return {
+            "totals": list(totals or Totals().dump()),
+            "days": [list(r) for r in db.execute(
+                "SELECT day, sessions, items FROM history_days WHERE profile_id = ? "
+                "ORDER BY day DESC LIMIT ?", (pid, recent))],
+            "coverage": dict(db.execute(
+                "SELECT grp, seen FROM history_coverage WHERE profile_id = ?", (pid,))),
+        }
+
+    # ─────────────────── запись ───────────────────
+    def write(self, kind: str, records: list[dict], snapshot: dict | None = None) -> None:
+        """Записи журнала (+ снимок) одной транзакцией."""
+        db = self._db()
+        with self._lock:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if snapshot is not None:
+                    (self._put_progress if kind == "progress" else self._put_srs)(db, snapshot)
+                for rec in records:
+                    self._apply(db, rec)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _apply(self, db, rec: dict) -> None:
+        pid, op = rec["pid"], rec.get("op")
+        if op == "set":
+            values = {k: v for k, v in rec["values"].items() if k in SETTINGS}
+            if values:
+                db.execute(f"UPDATE profiles SET {', '.join(k + ' = ?' for k in values)} "
+                           "WHERE id = ?", (*values.values(), pid))
+        elif op == "pool":                      # source — на момент записи (Session.log_pool)
+            self._set_pool(db, pid, rec["source"], rec["data"])
+        elif op == "draw":
+            db.executemany(
+                "UPDATE items SET remaining = 0 "
+                "WHERE profile_id = ? AND source = ? AND item_id = ?",
+                ((pid, rec["source"], i) for i in rec["ids"]))
+        elif op == "import":
+            db.execute("UPDATE profiles SET grammar_source = 'imported' WHERE id = ?", (pid,))
+            self._set_imported(db, pid, rec["items"], rec["pool"])
+        elif op == "rotate":
+            self._put_rotation(db, pid, rec["pool"], rec["data"])
+        elif op == "review":
+            db.execute("INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       (pid, rec["deck"], rec["key"], *rec["card"]))
+        elif op == "answer":
+            ok = int(rec["ok"])
+            db.execute("INSERT INTO drill_answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (pid, rec["ts"], rec["verb"], rec["form"], rec["answer"], ok, rec["ms"]))
+            db.execute("INSERT INTO drill_stats VALUES (?, ?, 1, ?, ?) "
+                       "ON CONFLICT (profile_id, form) DO UPDATE SET "
+                       "attempts = attempts + 1, correct = correct + excluded.correct, "
+                       "total_ms = total_ms + excluded.total_ms",
+                       (pid, rec["form"], ok, rec["ms"]))
+        elif op == "session":
+            self._put_session(db, pid, rec)
+
+    @staticmethod
+    def _set_pool(db, pid: int, source: str, dump: dict | None) -> None:
+        """Пул целиком (заполнение / сброс); None — пул пуст до перезаполнения."""
+        ProfileStore._put_catalog(db, pid, source, dump)
+        if source == "imported":                  # текст элементов остаётся
+            db.execute("UPDATE items SET remaining = 0 "
+                       "WHERE profile_id = ? AND source = 'imported'", (pid,))
+            if dump is not None:
+                db.executemany("UPDATE items SET remaining = 1 WHERE profile_id = ? "
+                               "AND source = 'imported' AND item_id = ?",
+                               ((pid, i) for i in IdPool.load(dump, dump["size"]) or ()))
+            return
+        db.execute("DELETE FROM items WHERE profile_id = ? AND source = ?", (pid, source))
+        if dump is not None:
+            left = set(IdPool.load(dump, dump["size"]) or ())
+            db.executemany(
+                "INSERT INTO items (profile_id, source, item_id, remaining) VALUES (?, ?, ?, ?)",
+                ((pid, source, i, i in left) for i in range(dump["size"])))
+
+    @staticmethod
+    def _set_imported(db, pid: int, items: list, dump: dict | None) -> None:
+        ProfileStore._put_catalog(db, pid, "imported", dump)
+        left = set(IdPool.load(dump, len(items)) or ()) if dump else set()
+        db.execute("DELETE FROM items WHERE profile_id = ? AND source = 'imported'", (pid,))
+        db.executemany(
+            "INSERT INTO items VALUES (?, 'imported', ?, ?, ?, ?)",
+            ((pid, i, *((x[0], x[1]) if isinstance(x, (list, tuple)) else (x, None)),
+              i in left) for i, x in enumerate(items)))
+
+    @staticmethod
+    def _put_catalog(db, pid: int, source: str, dump: dict | None) -> None:
+        """Отпечаток каталога пула (сохранённый без него — проверка по размеру)."""
+        if dump and dump.get("fp"):
+            db.execute("INSERT OR REPLACE INTO catalogs VALUES (?, ?, ?)",
+                       (pid, source, dump["fp"]))
+        else:
+            db.execute("DELETE FROM catalogs WHERE profile_id = ? AND source = ?",
+                       (pid, source))
+
+    @staticmethod
+    def _put_rotation(db, pid: int, pool: str, d: dict) -> None:
+        db.execute("INSERT OR REPLACE INTO rotations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   (pid, pool, d["size"], d["seed"], d["cursor"], d.get("prev", -1),
+                    d.get("fp")))
+
+    @staticmethod
+    def _put_session(db, pid: int, rec: dict) -> None:
+        """Сессия → history + агрегаты; стоимость не зависит от длины истории."""
+        day, n = day_of(rec["ts"]), len(rec["items"])
+        db.execute("INSERT INTO history VALUES (?, ?, ?, ?, ?, ?)",
+                   (pid, rec["ts"], rec["mode"], rec["source"], rec["level"],
+                    json.dumps(rec["items"], ensure_ascii=False)))
+        row = db.execute(
+            "SELECT sessions, items, days, first_day, last_day, streak, best_streak "
+            "FROM history_stats WHERE profile_id = ?", (pid,)).fetchone()
+        totals = Totals(*row) if row else Totals()
+        totals.add(day, n)
+        db.execute("INSERT OR REPLACE INTO history_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                   (pid, *totals.dump()))
+        db.execute("INSERT INTO history_days VALUES (?, ?, 1, ?) "
+                   "ON CONFLICT (profile_id, day) DO UPDATE SET "
+                   "sessions = sessions + 1, items = items + excluded.items", (pid, day, n))
+        for key, groups in zip(rec["items"], rec["groups"]):
+            if db.execute("INSERT OR IGNORE INTO history_seen VALUES (?, ?, ?)",
+                          (pid, rec["source"], key)).rowcount:
+                db.executemany("INSERT INTO history_coverage VALUES (?, ?, 1) "
+                               "ON CONFLICT (profile_id, grp) DO UPDATE SET seen = seen + 1",
+                               ((pid, g) for g in groups))
+
+    def _put_progress(self, db, snap: dict) -> None:
+        pid = snap["pid"]
+        db.execute("UPDATE profiles SET user_level = ?, grammar_source = ?, "
+                   "selected_count = ?, srs_enabled = ? WHERE id = ?",
+                   (snap["user_level"], snap["grammar_source"],
+                    snap["selected_count"], int(snap["srs_enabled"]), pid))
+        self._set_imported(db, pid, snap.get("imported_grammar", []),
+                           snap["grammar_pool"] if snap["grammar_source"] == "imported" else None)
+        if snap["grammar_source"] != "imported":
+            self._set_pool(db, pid, grammar_source_key(snap["grammar_source"], snap["user_level"]),
+                           snap["grammar_pool"])
+        self._set_pool(db, pid, "forms", snap["forms_pool"])
+        self._set_pool(db, pid, "constructions", snap.get("constructions_pool"))
+        for pool, d in (snap.get("rotations") or {}).items():
+            self._put_rotation(db, pid, pool, d)
+
+    @staticmethod
+    def _put_srs(db, snap: dict) -> None:
+        pid = snap["pid"]
+        db.execute("DELETE FROM reviews WHERE profile_id = ?", (pid,))
+        db.executemany("INSERT INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       ((pid, deck, key, *card)
+                        for deck, cards in snap.get("decks", {}).items()
+                        for key, card in cards.items()))
+
+    # ─────────────────── импорт старого progress.json ───────────────────
+    def import_legacy(self, progress_path: str, srs_path: str) -> int | None:
+        """
+        Один раз переносит data/progress.json (+ журнал) и data/srs.json
+        в профиль с сохранённым именем. Файлы остаются как резервная копия.
+        """
+        db = self._db()
+        if db.execute("SELECT 1 FROM meta WHERE key = 'legacy_import'").fetchone():
+            return None
+        from progress_store import ProgressJournal
+        from session import Session
+        from srs import SRSStore
+
+        def saved(path):                               # снимок или хотя бы журнал
+            return os.path.exists(path) or os.path.exists(path + ".journal")
+
+        pid = None
+        data = ProgressJournal(progress_path, dict).load() if saved(progress_path) else None
+        if data is not None:
+            session = Session()
+            session.apply(data)                       # заодно мигрирует формат 1
+            pid = self.profile_id(session.user_name)
+            self.write("progress", [], dict(session.snapshot(), pid=pid))
+            if saved(srs_path):
+                srs = SRSStore(srs_path)
+                srs.load()
+                self.write("srs", [], dict(srs.snapshot(), pid=pid))
+            self.touch(pid)
+        with self._lock:
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('legacy_import', ?)",
+                       (progress_path if data is not None else "",))
+        return pid
+
+
+class ProfileJournal:
+    """
+    Замена ProgressJournal поверх ProfileStore для одного вида данных
+    (progress / srs / drill / history) текущего профиля. Каждая запись помечается id
+    профиля при добавлении — смена профиля не перепутает очереди.
+    """
+
+    def __init__(self, store: ProfileStore, kind: str, snapshot=None):
+        self.store = store
+        self.kind = kind
+        self.snapshot = snapshot
+        self.profile: int | None = None
+        self._pending: list[dict] = []
+
+    def load(self) -> dict:
+        read = {"progress": self.store.read_progress, "srs": self.store.read_srs,
+                "drill": self.store.read_drill, "history": self.store.read_history}[self.kind]
+        return read(self.profile)
+
+    def append(self, op: str, **fields) -> None:
+        self._pending.append({"pid": self.profile, "op": op, **fields})
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def take_pending(self) -> list[dict]:
+        pending, self._pending = self._pending, []
+        return pending
+
+    def compaction_due(self, extra: int = 0) -> bool:
+        return False                              # журнала нет — компактировать нечего
+
+    def prepare_snapshot(self) -> dict:
+        return dict(self.snapshot(), pid=self.profile)
+
+    def write(self, records: list[dict], snapshot: dict | None = None) -> None:
+        self.store.write(self.kind, records, snapshot)
+
+    def flush(self) -> None:
+        self.write(self.take_pending())
@@ -0,0 +1,206 @@
+# ─── progress_store.py ─────────────────────────────────────────────────────
+"""
+Журналируемое хранение прогресса.
+
+    data/progress.json          — снимок (формат save_progress)
+    data/progress.json.journal  — мелкие изменения, по JSON-записи на строку
+    data/progress.json.bak      — предыдущий снимок
+
+Изменения (вытянутые элементы, смена источника, импорт) дописываются
+в журнал пачками; снимок пересобирается при компактировании и
+подменяется атомарно (tmp → os.replace), после чего журнал так же
+подменяется оставшимися записями (новее снимка).
+При загрузке снимок «доигрывается» записями журнала. Недописанная
+последняя строка журнала (падение посреди записи) просто отбрасывается.
+
+Запись на диск (write) может идти в фоновом потоке (tk_executor):
+всё, что читает состояние окна, готовится заранее в потоке Tk.
+"""
+import json, os, threading
+
+import perf
+from pools import IdPool
+
+COMPACT_RECORDS = 256              # столько записей — и пора делать снимок
+COMPACT_BYTES   = 64 * 1024
+
+
+def apply_record(state: dict, rec: dict) -> None:
+    """Применяет одну запись журнала к состоянию-снимку."""
+    op = rec.get("op")
+    if op == "set":
+        state.update(rec["values"])
+    elif op == "pool":
+        state[rec["pool"] + "_pool"] = rec["data"]
+    elif op == "draw":
+        key = rec["pool"] + "_pool"
+        dump = state.get(key)
+        if not dump:
+            return
+        pool = IdPool.load(dump, dump["size"])
+        drop = set(rec["ids"])
+        state[key] = IdPool(i for i in pool if i not in drop).dump(dump["size"], dump.get("fp"))
+    elif op == "import":
+        state["imported_grammar"] = rec["items"]
+        state["grammar_source"]   = "imported"
+        state["grammar_pool"]     = rec["pool"]
+    elif op == "rotate":
+        state.setdefault("rotations", {})[rec["pool"]] = rec["data"]
+
+
+class ProgressJournal:
+    """
+    Снимок + журнал изменений. `snapshot` — функция, возвращающая полное
+    текущее состояние (нужна для компактирования), `apply` — применение
+    записи журнала к снимку (по умолчанию apply_record).
+    """
+
+    def __init__(self, path: str, snapshot, apply=apply_record):
+        self.path = path
+        self.apply = apply
+        self.journal_path = path + ".journal"
+        self.backup_path = path + ".bak"
+        self.snapshot = snapshot
+        self.seq = 0                       # номер последней записи
+        self._pending: list[dict] = []
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._snapshot_seq = 0
+        self._lock = threading.Lock()
+
+    # ---------- загрузка ----------
+    def _read_snapshot(self) -> dict | None:
+        for p in (self.path, self.backup_path):
+            try:
+                with open(p, encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                perf.error("LOAD ERROR", f"{p}: {e}")
+        return None
+
+    def load(self) -> dict | None:
+        """Снимок + доигранный журнал; None, если сохранений ещё нет."""
+        state = self._read_snapshot()
+        base_seq = (state or {}).get("journal_seq", 0)
+        self.seq = self._snapshot_seq = base_seq
+        try:
+            with open(self.journal_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return state
+
+        good, records = 0, []                     # good — конец последней целой записи
+        for line in raw.splitlines(keepends=True):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError
+                rec = json.loads(line)
+            except ValueError:
+                break                             # хвост недописан
+            good += len(line)
+            if rec.get("seq", 0) > base_seq:      # остальное уже вошло в снимок
+                records.append(rec)
+        self._journal_records = len(records)
+        self._journal_bytes = good
+
+        # пачки могли записаться из разных потоков не по порядку
+        records.sort(key=lambda r: r["seq"])
+        for rec in records:
+            if state is None:
+                state = {}
+            self.apply(state, rec)
+            self.seq = rec["seq"]
+
+        if good < len(raw):                       # новые записи — после целых
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good)
+        return state
+
+    # ---------- запись ----------
+    def append(self, op: str, **fields) -> None:
+        """Поставить изменение в очередь; на диск попадёт при flush()."""
+        self.seq += 1
+        self._pending.append({"seq": self.seq, "op": op, **fields})
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def take_pending(self) -> list[dict]:
+        """Забрать накопленные записи (в потоке Tk) — для write() в фоне."""
+        pending, self._pending = self._pending, []
+        return pending
+
+    def compaction_due(self, extra: int = 0) -> bool:
+        return (self._journal_records + extra >= COMPACT_RECORDS
+                or self._journal_bytes >= COMPACT_BYTES)
+
+    def prepare_snapshot(self) -> dict:
+        """Полное состояние + номер последней вошедшей в него записи."""
+        return dict(self.snapshot(), journal_seq=self.seq)
+
+    def write(self, records: list[dict], snapshot: dict | None = None) -> None:
+        """
+        Дописать записи одной операцией (+ fsync), затем — если передан
+        снимок (prepare_snapshot) — компактировать. Безопасно вызывать из
+        фонового потока: состояние Tk здесь не читается.
+        """
+        with self._lock:
+            if records:
+                chunk = "".join(json.dumps(r, ensure_ascii=False,
+                                           separators=(",", ":")) + "\n"
+                                for r in records)
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_records += len(records)
+                self._journal_bytes += len(chunk)
+            if snapshot is not None and snapshot["journal_seq"] >= self._snapshot_seq:
+                self._write_snapshot(snapshot)
+
+    def flush(self) -> None:
+        """Синхронно: накопленные записи + снимок, если журнал разросся."""
+        records = self.take_pending()
+        snap = self.prepare_snapshot() if self.compaction_due(len(records)) else None
+        self.write(records, snap)
+
+    def compact(self) -> None:
+        """Полный снимок с атомарной подменой (синхронно)."""
+        self._pending.clear()              # снимок уже включает всё
+        self.write([], self.prepare_snapshot())
+
+    def _write_snapshot(self, data: dict) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(self.path):
+            os.replace(self.path, self.backup_path)
+        os.replace(tmp, self.path)
+        self._snapshot_seq = seq = data["journal_seq"]
+
+        # в журнале остаются только записи новее снимка
+        keep = []
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        if json.loads(line).get("seq", 0) > seq:
+                            keep.append(line)
+                    except ValueError:
+                        break
+        except FileNotFoundError:
+            pass
+        # не обрезаем на месте: падение посреди записи не должно съесть журнал
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.writelines(keep)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal_path)
+        self._journal_records = len(keep)
+        self._journal_bytes = sum(map(len, keep))
@@ -0,0 +1,285 @@
+# ─── records.py ────────────────────────────────────────────────────────────
+"""
+Компактные неизменяемые записи учебного контента вместо dict из json.load.
+
+Урок, конструкция, пример, строка таблицы спряжения — классы со __slots__
+(без __dict__ у каждой записи), доступные только для чтения. Окна и поиск
+по-прежнему пишут c["title"], c.get("jlpt"), lesson["use_cases"].items():
+записи реализуют Mapping, а ключи, которых нет в файле, ведут себя как
+отсутствующие ключи dict. Незнакомые поля (файл дополнили руками) не
+теряются — они лежат в extra.
+
+Запись грамматики (GrammarEntry) — namedtuple (title, comment): это та же
+пара, что окна, SRS и classroom.py ждут от элемента пула, и одновременно
+g["title"] / g.get("comment") для кода, читающего список уровня.
+
+Повторяющиеся строки — форма, уровень JLPT, названия строк таблицы
+спряжения — интернируются (sys.intern): на тысячи записей одна копия.
+Сравнение с dict по памяти — benchmarks/memory_report.py.
+"""
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
+intern = sys.intern
+_EMPTY = MappingProxyType({})
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"                      # pickle: тот же единственный объект
+
+
+MISSING = _Missing()                     # поля нет в исходном объекте
+
+
+def freeze(obj):
+    """Рекурсивно превращает результат json.load в неизменяемое представление."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+_CONTAINERS = (dict, list)
+
+
+def _str(value):
+    return intern(value) if isinstance(value, str) else value
+
+
+# ─────────────────── базовая запись ───────────────────
+class Record(Mapping):
+    """
+    Запись с фиксированным набором полей FIELDS. Значения — в слотах,
+    MISSING — поля не было; extra — прочие ключи исходного объекта.
+    DECODE — поле → функция разбора значения (остальные поля: freeze).
+    """
+
+    __slots__ = ("extra",)
+    FIELDS: tuple[str, ...] = ()
+    DECODE: dict = {}
+    _slot: dict = {}                          # поле → дескриптор слота
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._slot = {f: cls.__dict__[f] for f in cls.FIELDS}
+        cls._fill = tuple((f, cls._slot[f].__set__, cls.DECODE.get(f))
+                          for f in cls.FIELDS)
+
+    def __init__(self, *values, extra=_EMPTY):
+        for (_, set_, _), value in zip(self._fill, values):
+            set_(self, value)
+        for _, set_, _ in self._fill[len(values):]:
+            set_(self, MISSING)
+        _set_extra(self, extra)
+
+    @classmethod
+    def from_json(cls, obj: dict):
+        # в обход __init__: дескрипторы слотов напрямую, без промежуточного списка
+        self = object.__new__(cls)
+        get, found = obj.get, 0
+        for field, set_, decode in cls._fill:
+            value = get(field, MISSING)
+            if value is not MISSING:
+                if decode is not None:
+                    value = decode(value)
+                elif value.__class__ in _CONTAINERS:
+                    value = freeze(value)
+                found += 1
+            set_(self, value)
+        if found == len(obj):
+            _set_extra(self, _EMPTY)
+        else:
+            _set_extra(self, MappingProxyType(
+                {k: freeze(v) for k, v in obj.items() if k not in cls._slot}))
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__}: запись только для чтения")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__}: запись только для чтения")
+
+    # ─── Mapping ───
+    def __getitem__(self, key):
+        slot = self._slot.get(key)
+        if slot is None:
+            return self.extra[key]
+        value = slot.__get__(self)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        slot = self._slot.get(key)
+        if slot is None:
+            return self.extra.get(key, default)
+        value = slot.__get__(self)
+        return default if value is MISSING else value
+
+    def __iter__(self):
+        for field, slot in self._slot.items():
+            if slot.__get__(self) is not MISSING:
+                yield field
+        yield from self.extra
+
+    def __len__(self):
+        return sum(s.__get__(self) is not MISSING for s in self._slot.values()) + len(self.extra)
+
+    def items(self):
+        """Пары (поле, значение) — кортежем, без ItemsView и __getitem__ на каждое поле."""
+        pairs = tuple((f, v) for f, s in self._slot.items()
+                      if (v := s.__get__(self)) is not MISSING)
+        return pairs + tuple(self.extra.items()) if self.extra else pairs
+
+    def __contains__(self, key):
+        slot = self._slot.get(key)
+        if slot is None:
+            return key in self.extra
+        return slot.__get__(self) is not MISSING
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and all(
+                getattr(self, f) == getattr(other, f) for f in ("extra", *self.FIELDS))
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        body = ", ".join(f"{k}={v!r}" for k, v in self.items())
+        return f"{type(self).__name__}({body})"
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), tuple(getattr(self, f) for f in self.FIELDS),
+                           dict(self.extra)))
+
+
+_set_extra = Record.__dict__["extra"].__set__
+
+
+def _rebuild(cls, values, extra):
+    return cls(*values, extra=MappingProxyType(extra) if extra else _EMPTY)
+
+
+# ─────────────────── записи контента ───────────────────
+class Example(Record):
+    """Пример употребления: японский текст, чтение, перевод."""
+
+    __slots__ = FIELDS = ("ja", "hiragana", "ru")
+
+
+def _examples(value):
+    if isinstance(value, list):
+        return tuple(Example.from_json(x) if isinstance(x, dict) else freeze(x)
+                     for x in value)
+    return freeze(value)
+
+
+class Construction(Record):
+    """Запись grammar_constructions.json."""
+
+    __slots__ = FIELDS = ("title", "form", "jlpt", "frequency", "comment", "examples")
+
+    DECODE = {"form": _str, "jlpt": _str, "examples": _examples}
+
+
+class UseCase(Record):
+    """Случай употребления формы в уроке: пояснение и примеры."""
+
+    __slots__ = FIELDS = ("note", "examples")
+
+    DECODE = {"examples": _examples}
+
+
+def _interned_keys(value, decode):
+    if not isinstance(value, dict):
+        return freeze(value)
+    return MappingProxyType({intern(k): decode(v) if isinstance(v, dict) else freeze(v)
+                             for k, v in value.items()})
+
+
+class Lesson(Record):
+    """Урок lessons.json: ключи use_cases и formation интернируются."""
+
+    __slots__ = FIELDS = ("title", "description", "use_cases", "formation")
+
+    DECODE = {"use_cases": lambda v: _interned_keys(v, UseCase.from_json),
+              "formation": lambda v: _interned_keys(v, freeze)}
+
+
+class ConjugationRow(Record):
+    """Строка таблицы спряжения: название формы и значения по столбцам."""
+
+    __slots__ = FIELDS = ("form", "values")
+
+    DECODE = {"form": _str}
+
+
+class GrammarEntry(NamedTuple):
+    """Конструкция списка JLPT: пара (title, comment) с доступом g["title"]."""
+
+    title: str
+    comment: str = ""
+
+    @classmethod
+    def from_json(cls, obj: dict) -> "GrammarEntry":
+        return cls(obj["title"], obj.get("comment") or "")
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in self._fields:
+                return getattr(self, key)
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+    def keys(self):
+        return self._fields
+
+
+# ─────────────────── наборы данных ───────────────────
+def _conjugation_part(value):
+    """Значение верхнего уровня conjugation: rows → ConjugationRow."""
+    if isinstance(value, list) and value and all(
+            isinstance(x, dict) and "values" in x for x in value):
+        return tuple(ConjugationRow.from_json(x) for x in value)
+    if isinstance(value, list):
+        return tuple(_str(x) if isinstance(x, str) else freeze(x) for x in value)
+    return freeze(value)
+
+
+# имя набора (content.DATASETS) → декодер одного элемента верхнего уровня
+DECODERS = {
+    "lessons":       Lesson.from_json,
+    "constructions": Construction.from_json,
+    "grammar_n5":    GrammarEntry.from_json,
+    "grammar_n4":    GrammarEntry.from_json,
+    "grammar_n3":    GrammarEntry.from_json,
+    "conjugation":   _conjugation_part,
+}
+
+
+def decoder(name: str):
+    """Декодер элемента набора `name` (для content_pack.ContentPack.load)."""
+    return DECODERS.get(name, freeze)
+
+
+def freeze_dataset(name: str, data):
+    """Результат json.load набора `name` → записи (dict → MappingProxyType, list → tuple)."""
+    decode = decoder(name)
+    if isinstance(data, dict):
+        return MappingProxyType({intern(k): decode(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return tuple(map(decode, data))
+    return freeze(data)
@@ -0,0 +1,228 @@
+# ─── search.py ─────────────────────────────────────────────────────────────
+"""
+Полнотекстовый поиск по методичкам, конструкциям, спискам JLPT и таблице
+спряжений.
+
+Инвертированный индекс: японский текст режется на символьные 1- и 2-граммы
+(катакана приводится к хирагане, ширина символов — через NFKC), русский /
+английский — на слова с грубым усечением окончаний. Индекс хранится по
+сегментам (сегмент = файл данных) в data/search_index.json; при старте
+пересобираются только сегменты, чей файл изменился.
+"""
+import json, math, os, re, time, unicodedata
+
+import content
+import perf
+
+SEARCH_PATH = "data/search_index.json"
+INDEX_FORMAT = 1
+
+SOURCES = ("lessons", "constructions", "grammar_n5", "grammar_n4",
+           "grammar_n3", "conjugation")
+SOURCE_LABELS = {
+    "lessons": "Методичка", "constructions": "Конструкция",
+    "grammar_n5": "JLPT N5", "grammar_n4": "JLPT N4", "grammar_n3": "JLPT N3",
+    "conjugation": "Спряжение",
+}
+
+_JA   = re.compile(r"[぀-ヿ㐀-鿿豈-﫿々〆]+")
+_WORD = re.compile(r"[^\W_]+")
+_CYR  = re.compile(r"[а-яё]")
+_KATA = {c: c - 0x60 for c in range(0x30A1, 0x30F7)}     # ァ..ヶ → ぁ..ゖ
+
+
+# ─────────────────── токенизация ───────────────────
+def fold(text: str) -> str:
+    """NFKC (полу/полноширинные) + нижний регистр + катакана → хирагана."""
+    return unicodedata.normalize("NFKC", text).lower().translate(_KATA)
+
+
+def _word(w: str) -> str:
+    # «просьба» / «просьбы» / «просьбу» → «прось»: дёшево вместо стемминга
+    if len(w) > 5 and _CYR.match(w):
+        return w[:max(5, len(w) - 2)]
+    return w
+
+
+def tokens(text: str, query: bool = False) -> list[str]:
+    """
+    Термы текста. В документах японские фрагменты дают 1- и 2-граммы,
+    в запросе — только 2-граммы (или сам символ, если он один).
+    """
+    t, out, pos = fold(text), [], 0
+    for m in _JA.finditer(t):
+        out += map(_word, _WORD.findall(t[pos:m.start()]))
+        run = m.group()
+        bigrams = [run[i:i + 2] for i in range(len(run) - 1)]
+        if query:
+            out += bigrams or [run]
+        else:
+            out += list(run) + bigrams
+        pos = m.end()
+    out += map(_word, _WORD.findall(t[pos:]))
+    return out
+
+
+# ─────────────────── документы по источникам ───────────────────
+def _examples(examples) -> str:
+    return " ".join(f"{e['ja']} {e['hiragana']} {e['ru']}" for e in examples)
+
+
+def documents(name: str, data):
+    """(заголовок, фрагмент, ссылка, текст для индекса) для набора `name`."""
+    if name == "lessons":
+        for form, lesson in data.items():
+            f = lesson["formation"]
+            rules = " ".join(f"{g['rule']} " + " ".join(f"{p} {x}" for p, x in g["patterns"].items())
+                             for k, g in f.items() if k.startswith("group_"))
+            yield (lesson["title"], lesson["description"], form,
+                   f"{lesson['title']} {lesson['description']} {f.get('overview', '')} {rules}")
+            for case, uc in lesson["use_cases"].items():
+                note = uc.get("note", "")
+                yield (f"{lesson['title']} · {case}", note, form,
+                       f"{case} {note} {_examples(uc['examples'])}")
+    elif name == "constructions":
+        for c in data:
+            yield (f"{c['title']} ({c['form']}, {c['jlpt']})", c["comment"], c["form"],
+                   f"{c['title']} {c['comment']} {_examples(c['examples'])}")
+    elif name == "conjugation":
+        rows = data["rows"]
+        for i, verb in enumerate(data["columns"]):
+            values = [r["values"][i] for r in rows]
+            yield (verb, ", ".join(values[1:6]), "conjugation",
+                   " ".join(f"{r['form']} {v}" for r, v in zip(rows, values)))
+    else:                                           # grammar_nX
+        for g in data:
+            yield g["title"], g.get("comment", ""), name, f"{g['title']} {g.get('comment', '')}"
+
+
+def build_segment(name: str, data, stamp: str) -> dict:
+    docs, postings = [], {}
+    for i, (title, snippet, ref, text) in enumerate(documents(name, data)):
+        docs.append([title, snippet[:160], ref])
+        tf: dict[str, int] = {}
+        for t in tokens(text):
+            tf[t] = tf.get(t, 0) + 1
+        for t in tokens(title):                     # совпадение в заголовке весомее
+            tf[t] = tf.get(t, 0) + 3
+        for t, n in tf.items():
+            postings.setdefault(t, []).extend((i, n))
+    return {"stamp": stamp, "docs": docs, "postings": postings}
+
+
+# ─────────────────── индекс ───────────────────
+class SearchIndex:
+    """Объединение сегментов: терм → [(источник, документ, tf), …]."""
+
+    def __init__(self, segments: dict[str, dict]):
+        self.segments = segments
+        self.version = tuple(seg["stamp"] for seg in segments.values())
+        self.postings: dict[str, list[tuple[str, int, int]]] = {}
+        n_docs = 0
+        for name, seg in segments.items():
+            n_docs += len(seg["docs"])
+            for term, flat in seg["postings"].items():
+                lst = self.postings.setdefault(term, [])
+                lst.extend((name, flat[j], flat[j + 1]) for j in range(0, len(flat), 2))
+        self.n_docs = max(1, n_docs)
+
+    def search(self, query: str, limit: int = 50) -> list[tuple]:
+        """
+        Документы, содержащие все термы запроса, по убыванию tf·idf:
+        [(score, источник, заголовок, фрагмент, ссылка), …].
+        """
+        terms = set(tokens(query, query=True))
+        if not terms:
+            return []
+        scores: dict[tuple[str, int], float] | None = None
+        # начинаем с самого редкого терма — меньше кандидатов
+        for term in sorted(terms, key=lambda t: len(self.postings.get(t, ()))):
+            plist = self.postings.get(term)
+            if not plist:
+                return []
+            idf = math.log(1 + self.n_docs / len(plist))
+            if scores is None:
+                scores = {(s, d): tf * idf for s, d, tf in plist}
+            else:
+                nxt = {}
+                for s, d, tf in plist:
+                    if (key := (s, d)) in scores:
+                        nxt[key] = scores[key] + tf * idf
+                scores = nxt
+            if not scores:
+                return []
+
+        best = sorted(scores.items(), key=lambda kv: -kv[1])[:limit]
+        return [(round(sc, 3), s, *self.segments[s]["docs"][d]) for (s, d), sc in best]
+
+
+def _read(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") == INDEX_FORMAT:
+            return data.get("segments", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def load_index(repo=None, path: str = SEARCH_PATH) -> tuple[SearchIndex, list[str]]:
+    """
+    Индекс с диска; сегменты, чей источник изменился, пересобираются,
+    и файл индекса перезаписывается (атомарно). Возвращает индекс и
+    список пересобранных сегментов.
+    """
+    repo = repo or content.repo
+    stored = _read(path)
+    segments, rebuilt = {}, []
+    for name in SOURCES:
+        try:
+            stamp = repo.source_stamp(name)
+        except Exception:
+            continue                               # набора нет — ищем без него
+        seg = stored.get(name)
+        if seg is None or seg.get("stamp") != stamp:
+            seg = build_segment(name, repo.get(name), stamp)
+            rebuilt.append(name)
+        segments[name] = seg
+
+    if rebuilt or set(stored) != set(segments):
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"format": INDEX_FORMAT, "segments": segments}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            perf.error("SAVE ERROR", e)
+    return SearchIndex(segments), rebuilt
+
+
+# ─────────────────── общий экземпляр ───────────────────
+_index: SearchIndex | None = None
+
+
+def get_index() -> SearchIndex:
+    """Текущий индекс; пересобирается по сегментам, если данные изменились."""
+    global _index
+    if _index is not None:
+        try:
+            fresh = tuple(content.repo.source_stamp(n) for n in _index.segments)
+        except Exception:
+            fresh = None
+        if fresh == _index.version:
+            return _index
+    with perf.span("search.index"):
+        _index, _ = load_index()
+    return _index
+
+
+def timed_search(query: str, limit: int = 50) -> tuple[list, float, tuple]:
+    """Поиск + время в миллисекундах + версия индекса (ключ кэша вида)."""
+    index = get_index()
+    t0 = time.perf_counter()
+    hits = index.search(query, limit)
+    dt = time.perf_counter() - t0
+    perf.record("search.query", dt, {"hits": len(hits)})
+    return hits, dt * 1000, index.version
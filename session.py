@@ -0,0 +1,367 @@
+# ─── session.py ────────────────────────────────────────────────────────────
+"""
+Логика сессии и прогресса без Tk.
+
+Session — состояние одного ученика: настройки, пулы оставшихся элементов,
+импортированный список. Отсюда берутся «элементы на сегодня», снимок для
+progress.json и восстановление из него. MainMenu держит один Session и
+лишь переносит в него значения переменных окна; пакетный генератор
+(classroom.py) создаёт по Session на ученика.
+
+Изменения пулов и настроек сообщаются через log(op, **fields) — это
+записи журнала progress_store (op: set / pool / draw / import / rotate).
+
+Режим constructions — конструкции grammar_constructions.json, выборка
+взвешенная (pools.WeightedPool, веса — content.construction_weights):
+частые и своего уровня попадаются чаще, вытянутые до конца круга не
+повторяются.
+
+Ротации (pools.ShuffleBag) — «случайные» факт, совет и конструкция в
+главном окне без повторов до конца круга. Ключ — пул: facts, advice,
+grammar_n5/n4/n3; у каждого уровня свой круг, как и у каждого профиля.
+"""
+import random
+
+import content
+from pools import IdPool, ShuffleBag, WeightedPool, fingerprint, ids_from_items
+from records import GrammarEntry
+
+PROGRESS_FORMAT = 2                      # 2: пулы id (битовые карты) вместо текста
+LEVELS = ("N5", "N4", "N3")
+
+BUILTIN_FORMS = [
+    "Te-form", "Negative-form", "Masu-form", "Ta-form",
+    "Potential-form", "Passive-form", "Causative-form", "Imperative-form",
+    "Volitional-form", "Ba-form", "Tara-form",
+    "Masu-stem", "Progressive-form", "Command-form"
+]
+
+
+def srs_key(item) -> str:
+    """Ключ SRS-карточки: заголовок конструкции или название формы."""
+    if isinstance(item, (list, tuple)) and len(item) == 2:
+        return item[0]
+    return item
+
+
+def _no_log(op: str, **fields) -> None:
+    pass
+
+
+class Session:
+    """Настройки и прогресс одного ученика."""
+
+    def __init__(self, log=None):
+        self.user_name      = ""
+        self.user_level     = "N5"
+        self.mode           = "grammar"             # grammar | forms | constructions
+        self.grammar_source = "builtin"             # builtin | imported
+        self.selected_count = 5
+        self.srs_enabled    = False
+
+        # пулы хранят id элементов каталога (см. grammar_catalog)
+        self.imported_grammar: list = []
+        self.grammar_pool = IdPool()
+        self._grammar_fp: str | None = None         # каталог, по которому заполнен grammar_pool
+        self.forms_pool   = IdPool.full(len(BUILTIN_FORMS))
+        self.constructions_pool: WeightedPool | None = None   # см. constructions()
+        self._constructions_saved: dict | None = None         # снимок пула до этого
+        self.rotations: dict[str, ShuffleBag] = {}   # пул → круг без повторов
+
+        self.log = log or _no_log
+        self._srs_catalogs: dict[tuple, dict] = {}
+        self._imported_fp: tuple[list, str] | None = None   # (список, отпечаток)
+
+    # ─────────────────── настройки ───────────────────
+    def settings(self) -> dict:
+        return {
+            "grammar_source": self.grammar_source,
+            "user_level": self.user_level,
+            "selected_count": self.selected_count,
+            "user_name": self.user_name,
+            "srs_enabled": self.srs_enabled,
+        }
+
+    def log_settings(self):
+        self.log("set", values=self.settings())
+
+    def log_pool(self, op: str, pool: str, **fields):
+        """Запись pool / draw с источником на момент изменения (см. pool_source)."""
+        self.log(op, pool=pool, source=self.pool_source(pool), **fields)
+
+    # ─────────────────── каталоги и пулы ───────────────────
+    def grammar_catalog(self):
+        """Каталог, в который указывают id из grammar_pool."""
+        if self.grammar_source == "imported":
+            return self.imported_grammar
+        return content.grammar(self.user_level)     # кортеж records.GrammarEntry
+
+    def grammar_catalog_size(self) -> int:
+        if self.grammar_source == "imported":
+            return len(self.imported_grammar)
+        try:
+            return len(content.grammar(self.user_level))
+        except Exception:
+            return 0
+
+    def grammar_fingerprint(self) -> str | None:
+        """Отпечаток каталога grammar_pool (None — файл уровня не читается)."""
+        if self.grammar_source == "imported":       # список заменяется целиком, не правится
+            cached = self._imported_fp
+            if cached is None or cached[0] is not self.imported_grammar:
+                cached = self._imported_fp = (self.imported_grammar,
+                                              fingerprint(self.imported_grammar))
+            return cached[1]
+        try:
+            return fingerprint(self.grammar_catalog())
+        except Exception:
+            return None
+
+    def ensure_builtin_loaded(self, catalog=None):
+        """
+        Пустой пул встроенного списка → заполнить весь уровень (catalog —
+        уже прочитанный список уровня, иначе читается здесь).
+        """
+        if self.grammar_pool:
+            return
+        if catalog is None:
+            catalog = content.grammar(self.user_level)
+        self.grammar_pool = IdPool.full(len(catalog))
+        self._grammar_fp = fingerprint(catalog)
+        self.log_pool("pool", "grammar",
+                      data=self.grammar_pool.dump(len(catalog), self._grammar_fp))
+
+    def constructions(self) -> WeightedPool:
+        """
+        Пул конструкций с весами под текущий уровень: строится при первом
+        обращении (файл читается только в этом режиме), при смене уровня —
+        новые веса, опустел — снова полный.
+        """
+        weights = content.construction_weights(self.user_level)
+        fp = fingerprint(content.get("constructions"))
+        pool = self.constructions_pool
+        if pool is None:
+            pool = WeightedPool.load(self._constructions_saved, weights, fp)
+            self._constructions_saved = None
+        elif pool.weights is not weights:
+            if len(pool.weights) == len(weights):
+                pool.reweight(weights)
+            else:                                   # файл отредактирован
+                pool = WeightedPool((i for i in pool if i < len(weights)), weights)
+                self.log_pool("pool", "constructions", data=pool.dump(len(weights), fp))
+        if not pool:
+            pool = WeightedPool.full(weights)
+            self.log_pool("pool", "constructions", data=pool.dump(len(weights), fp))
+        self.constructions_pool = pool
+        return pool
+
+    def remaining_grammar(self) -> int:
+        if self.grammar_source == "builtin":
+            self.ensure_builtin_loaded()
+        return len(self.grammar_pool)
+
+    def use_builtin_grammar(self):
+        """Переключаемся на встроенный список (N5/N4/N3)."""
+        self.grammar_source = "builtin"
+        self.grammar_pool.clear()                   # заставим перечитать файл
+        self.log_pool("pool", "grammar", data=None)
+        self.log_settings()
+
+    def import_items(self, items: list):
+        """Импортированный список становится источником грамматики."""
+        self.imported_grammar = items
+        self.grammar_source = "imported"
+        self.grammar_pool = IdPool.full(len(items))
+        self._grammar_fp = self.grammar_fingerprint()
+        self.log("import", items=items, pool=self.grammar_pool.dump(len(items), self._grammar_fp))
+
+    def content_changed(self, names) -> None:
+        """
+        Файл встроенного списка уровня отредактирован на лету: если каталог
+        сменился (другой отпечаток), id пула указывают не туда — пул
+        заполняется заново, как при загрузке (IdPool.load).
+        """
+        if (self.grammar_source != "builtin"
+                or f"grammar_{self.user_level.lower()}" not in names):
+            return
+        fp = self.grammar_fingerprint()
+        if fp is None or fp == self._grammar_fp:
+            return
+        self.grammar_pool = IdPool()
+        self.ensure_builtin_loaded()
+
+    def reset(self):
+        """Полный сброс: снова встроенные списки + полные пулы."""
+        self.grammar_source = "builtin"
+        self.forms_pool   = IdPool.full(len(BUILTIN_FORMS))
+        self.grammar_pool = IdPool()                # будет перезаполнен
+        self.constructions_pool = self._constructions_saved = None
+        self.log_pool("pool", "forms", data=self.forms_pool.dump(len(BUILTIN_FORMS),
+                                                                 fingerprint(BUILTIN_FORMS)))
+        self.log_pool("pool", "constructions", data=None)
+        self.log_settings()
+        self.ensure_builtin_loaded()
+
+    # ─────────────────── «сегодняшние элементы» ───────────────────
+    def today_items(self, n: int | None = None, rng=random, srs=None) -> list:
+        """
+        n элементов на сегодня. Без SRS — случайная выборка из пула
+        (вытянутые удаляются); с SRS — карточки с наступившим сроком.
+        """
+        n = max(1, self.selected_count if n is None else n)
+        if self.srs_enabled and srs is not None:
+            return self.due_items(srs, n)
+        if self.mode == "forms":
+            ids = self.forms_pool.draw(n, rng)
+            self.log_pool("draw", "forms", ids=ids)
+            self.log_settings()
+            return [BUILTIN_FORMS[i] for i in ids]
+        if self.mode == "constructions":
+            ids = self.constructions().draw(n, rng)
+            data = content.get("constructions")
+            self.log_pool("draw", "constructions", ids=ids)
+            self.log_settings()
+            return [GrammarEntry(data[i]["title"], data[i].get("comment") or "") for i in ids]
+
+        if self.grammar_source == "builtin":
+            self.ensure_builtin_loaded()
+        ids = self.grammar_pool.draw(n, rng)
+        if self.grammar_source == "imported":
+            items = [self.imported_grammar[i] for i in ids]
+        else:
+            level = content.grammar(self.user_level)
+            items = [level[i] for i in ids]
+        self.log_pool("draw", "grammar", ids=ids)
+        self.log_settings()
+        return items
+
+    # ─────────────────── ротации ───────────────────
+    def rotate(self, pool: str, size: int, rng=random, fp: str | None = None) -> int:
+        """
+        Следующий id пула `pool` из каталога размера size (с отпечатком fp),
+        без повторов до конца круга. Каталог сменился (файл отредактировали) —
+        новый круг.
+        """
+        bag = self.rotations.get(pool)
+        if bag is None or not bag.fits(size, fp):
+            bag = self.rotations[pool] = ShuffleBag(size, rng=rng, fp=fp)
+        bag.fp = bag.fp or fp                       # сохранённая до отпечатков
+        i = bag.next(rng)
+        self.log("rotate", pool=pool, data=bag.dump())
+        return i
+
+    # ─────────────────── SRS: колода / каталог ───────────────────
+    def pool_source(self, pool: str) -> str:
+        """Источник пула: forms, constructions, imported или grammar_n5/n4/n3."""
+        if pool != "grammar":
+            return pool
+        if self.grammar_source == "imported":
+            return "imported"
+        return f"grammar_{self.user_level.lower()}"
+
+    def srs_deck_name(self) -> str:
+        return self.pool_source(self.mode)
+
+    def srs_catalog(self) -> tuple[tuple, dict]:
+        """
+        Ключ карточки → элемент для показа. Строится один раз на версию
+        каталога, чтобы выдача «на сегодня» не была O(n).
+        """
+        deck = self.srs_deck_name()
+        if deck == "forms":
+            version = (deck,)
+        elif deck == "imported":
+            version = (deck, id(self.imported_grammar), len(self.imported_grammar))
+        elif deck == "constructions":
+            content.get(deck)
+            version = (deck, content.repo.version(deck))
+        else:
+            content.grammar(self.user_level)
+            version = (deck, content.repo.version(deck))
+
+        catalog = self._srs_catalogs.get(version)
+        if catalog is None:
+            if deck == "forms":
+                catalog = {f: f for f in BUILTIN_FORMS}
+            elif deck == "imported":
+                catalog = {srs_key(x): x for x in self.imported_grammar}
+            elif deck == "constructions":
+                catalog = {c["title"]: GrammarEntry(c["title"], c.get("comment") or "")
+                           for c in content.get(deck)}
+            else:
+                catalog = {g.title: g for g in content.grammar(self.user_level)}
+            self._srs_catalogs[version] = catalog
+        return version, catalog
+
+    def due_items(self, srs, n: int) -> list:
+        """k элементов с наступившим сроком повторения, O(k log n)."""
+        version, catalog = self.srs_catalog()
+        deck = srs.deck(self.srs_deck_name())
+        if deck.synced != version:
+            deck.sync(catalog)
+            deck.synced = version
+        return [catalog.get(k, k) for k in deck.take_due(n)]
+
+    # ─────────────────── снимок / восстановление ───────────────────
+    def snapshot(self) -> dict:
+        """Полное состояние прогресса (снимок для progress.json)."""
+        return {
+            "format": PROGRESS_FORMAT,
+            "grammar_pool": self.grammar_pool.dump(self.grammar_catalog_size(),
+                                                   self.grammar_fingerprint()),
+            "forms_pool": self.forms_pool.dump(len(BUILTIN_FORMS), fingerprint(BUILTIN_FORMS)),
+            "constructions_pool": (self._constructions_saved if self.constructions_pool is None
+                                   else self.constructions_pool.dump(
+                                       len(self.constructions_pool.weights),
+                                       fingerprint(content.get("constructions")))),
+            "imported_grammar": self.imported_grammar,
+            "rotations": {k: bag.dump() for k, bag in self.rotations.items()},
+            **self.settings(),
+        }
+
+    def apply(self, data: dict) -> bool:
+        """Снимок → состояние. True, если снимок пришлось мигрировать."""
+        self.grammar_source = data.get("grammar_source", "builtin")
+        self.user_level     = data.get("user_level", "N5")
+        self.imported_grammar = data.get("imported_grammar", [])
+        self.selected_count = data.get("selected_count", 5)
+        self.user_name      = data.get("user_name", "")
+        self.srs_enabled    = data.get("srs_enabled", False)
+        self.rotations = {k: bag for k, d in (data.get("rotations") or {}).items()
+                          if (bag := ShuffleBag.load(d, (d or {}).get("size"))) is not None}
+
+        migrated = data.get("format", 1) < PROGRESS_FORMAT
+        if migrated:
+            data = self.migrate(data)
+
+        n_forms = len(BUILTIN_FORMS)
+        forms = IdPool.load(data.get("forms_pool"), n_forms, fingerprint(BUILTIN_FORMS))
+        self.forms_pool = IdPool.full(n_forms) if forms is None else forms
+        fp = self.grammar_fingerprint()
+        grammar = IdPool.load(data.get("grammar_pool"), self.grammar_catalog_size(), fp)
+        self.grammar_pool = IdPool() if grammar is None else grammar
+        self._grammar_fp = None if grammar is None else fp
+        self.constructions_pool = None
+        self._constructions_saved = data.get("constructions_pool")
+        return migrated
+
+    def migrate(self, data: dict) -> dict:
+        """
+        Формат 1 хранил оставшиеся элементы текстом (remaining_grammar /
+        remaining_forms) → переводим в пулы id по текущим каталогам.
+        """
+        data = dict(data)
+        forms = data.pop("remaining_forms", None)
+        if forms is not None:
+            data["forms_pool"] = IdPool(
+                ids_from_items(forms, BUILTIN_FORMS)
+            ).dump(len(BUILTIN_FORMS), fingerprint(BUILTIN_FORMS))
+
+        # пустой список в старом формате означал «ещё не загружен»
+        if grammar := data.pop("remaining_grammar", None):
+            catalog = self.grammar_catalog()
+            data["grammar_pool"] = IdPool(
+                ids_from_items(grammar, catalog)
+            ).dump(len(catalog), fingerprint(catalog))
+        data["format"] = PROGRESS_FORMAT
+        return data
@@ -0,0 +1,161 @@
+# ─── srs.py ────────────────────────────────────────────────────────────────
+"""
+Интервальное повторение (SM-2) с очередью «к повторению» на куче.
+
+Колода (Deck) — набор карточек, ключ карточки — заголовок конструкции
+или название формы. Куча упорядочена по времени due; устаревшие записи
+(карточку уже перепланировали) отбрасываются лениво при извлечении,
+поэтому выдача k элементов стоит O(k log n) даже для 100k карточек.
+
+Состояние всех колод хранится в data/srs.json + журнал оценок
+(см. progress_store.ProgressJournal).
+"""
+import heapq, time
+
+from progress_store import ProgressJournal
+
+SRS_PATH = "data/srs.json"
+DAY = 86400
+
+# кнопки оценки в окне сессии → качество ответа SM-2 (0..5)
+GRADES = (("Снова", 1), ("Трудно", 3), ("Хорошо", 4), ("Легко", 5))
+
+
+class Card:
+    __slots__ = ("ease", "interval", "reps", "lapses", "due")
+
+    def __init__(self, ease=2.5, interval=0, reps=0, lapses=0, due=0.0):
+        self.ease, self.interval = ease, interval
+        self.reps, self.lapses, self.due = reps, lapses, due
+
+    def dump(self) -> list:
+        return [round(self.ease, 3), self.interval, self.reps, self.lapses, self.due]
+
+
+def sm2(card: Card, quality: int, now: float) -> None:
+    """Классический SM-2: новый интервал (в днях), ease и дата повтора."""
+    if quality < 3:
+        card.reps = 0
+        card.interval = 1
+        card.lapses += 1
+    else:
+        card.reps += 1
+        if card.reps == 1:
+            card.interval = 1
+        elif card.reps == 2:
+            card.interval = 6
+        else:
+            card.interval = max(1, round(card.interval * card.ease))
+    q = 5 - quality
+    card.ease = max(1.3, card.ease + 0.1 - q * (0.08 + q * 0.02))
+    card.due = now + card.interval * DAY
+
+
+class Deck:
+    """Карточки одной колоды + куча (due, порядковый номер, ключ)."""
+
+    def __init__(self):
+        self.cards: dict[str, Card] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = 0
+        self.synced = None                 # версия каталога, с которой сверялись
+
+    def _push(self, key: str, card: Card):
+        self._seq += 1
+        heapq.heappush(self._heap, (card.due, self._seq, key))
+
+    def add(self, key: str, card: Card | None = None):
+        card = card or Card()
+        self.cards[key] = card
+        self._push(key, card)
+
+    def sync(self, keys) -> None:
+        """Новые ключи каталога → новые карточки (due = 0, т.е. сразу)."""
+        for k in keys:
+            if k not in self.cards:
+                self.add(k)
+
+    def take_due(self, k: int, now: float | None = None) -> list[str]:
+        """
+        До k ключей с наступившим сроком, в порядке due. Карточки остаются
+        в очереди, пока их не оценят (незавершённая сессия ничего не теряет).
+        """
+        now = time.time() if now is None else now
+        heap, out, keep = self._heap, [], []
+        while heap and len(out) < k and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            due, _, key = entry
+            card = self.cards.get(key)
+            if card is None or card.due != due:
+                continue                         # запись устарела
+            out.append(key)
+            keep.append(entry)
+        for entry in keep:
+            heapq.heappush(heap, entry)
+        return out
+
+    def grade(self, key: str, quality: int, now: float | None = None) -> Card:
+        card = self.cards.get(key)
+        if card is None:
+            card = self.cards[key] = Card()
+        sm2(card, quality, time.time() if now is None else now)
+        self._push(key, card)
+        if len(self._heap) > 2 * len(self.cards) + 64:
+            self._rebuild()
+        return card
+
+    def _rebuild(self):
+        """Выбросить устаревшие записи из кучи (амортизированно O(n))."""
+        self._heap = [(c.due, i, k) for i, (k, c) in enumerate(self.cards.items())]
+        heapq.heapify(self._heap)
+        self._seq = len(self._heap)
+
+    def dump(self) -> dict:
+        return {k: c.dump() for k, c in self.cards.items()}
+
+    @classmethod
+    def load(cls, data: dict) -> "Deck":
+        deck = cls()
+        deck.cards = {k: Card(*v) for k, v in data.items()}
+        deck._rebuild()
+        return deck
+
+
+def _apply(state: dict, rec: dict) -> None:
+    if rec.get("op") == "review":
+        state.setdefault("decks", {}).setdefault(rec["deck"], {})[rec["key"]] = rec["card"]
+
+
+class SRSStore:
+    """Все колоды пользователя; оценки пишутся в журнал."""
+
+    def __init__(self, path: str = SRS_PATH, journal=None):
+        """journal — готовый журнал (например, profile_store.ProfileJournal)."""
+        self.decks: dict[str, Deck] = {}
+        if journal is None:
+            journal = ProgressJournal(path, self.snapshot, apply=_apply)
+        else:
+            journal.snapshot = self.snapshot
+        self.journal = journal
+
+    def load(self) -> None:
+        self.decks = self.decks_from(self.journal.load())
+
+    @staticmethod
+    def decks_from(data: dict | None) -> dict[str, Deck]:
+        """Снимок (snapshot()) → колоды; можно строить в фоне и подменить потом."""
+        return {name: Deck.load(cards)
+                for name, cards in (data or {}).get("decks", {}).items()}
+
+    def snapshot(self) -> dict:
+        return {"decks": {name: d.dump() for name, d in self.decks.items()}}
+
+    def deck(self, name: str) -> Deck:
+        if (d := self.decks.get(name)) is None:
+            d = self.decks[name] = Deck()
+        return d
+
+    def grade(self, deck: str, key: str, quality: int) -> Card:
+        card = self.deck(deck).grade(key, quality)
+        self.journal.append("review", deck=deck, key=key, card=card.dump())
+        return card
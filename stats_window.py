@@ -0,0 +1,114 @@
+# ─── stats_window.py ───────────────────────────────────────────────────────
+"""
+Окно «Статистика» (кнопка в главном меню): итоги и серия дней подряд,
+последние дни с занятиями, покрытие уровней JLPT и форм, оценка времени
+до конца каждого пула. Данные — готовые агрегаты history (см. history.py),
+читаются в фоне одним запросом на таблицу; историю окно не перебирает.
+"""
+import time
+from datetime import date
+
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+from content import JLPT_ORDER
+from history import Totals, day_of
+
+DAY_COLUMNS = (("day", "день", 110), ("sessions", "сессий", 70), ("items", "элементов", 90))
+COVERAGE_COLUMNS = (("group", "группа", 150), ("seen", "встречалось", 90),
+                    ("total", "всего", 70), ("share", "%", 60))
+
+
+def _group_label(group: str) -> str:
+    if group.startswith("form:"):
+        return group[5:]
+    return {"forms": "формы", "imported": "импорт"}.get(group, group)
+
+
+def _group_order(group: str) -> tuple:
+    """Сначала уровни JLPT (N5 → N1), затем прочее, затем формы."""
+    return (group.startswith("form:"), JLPT_ORDER.get(group, len(JLPT_ORDER)), group)
+
+
+class StatsWindow:
+    def __init__(self, root, io, load, remaining: dict[str, int]):
+        """
+        load() — в фоне: (ProfileStore.read_history(), history.catalog_sizes());
+        remaining — подпись пула → сколько в нём осталось (для оценки сроков).
+        """
+        self.root = root
+        self.root.title("Статистика")
+        self.io = io
+        self.remaining = remaining
+
+        self.summary = tb.Label(root, text="Загрузка…", font=("Segoe UI", 11, "bold"),
+                                bootstyle="primary", justify="left")
+        self.summary.pack(anchor="w", padx=10, pady=(10, 4))
+        self.pace = tb.Label(root, bootstyle="secondary", justify="left")
+        self.pace.pack(anchor="w", padx=10)
+
+        tables = tb.Frame(root)
+        tables.pack(fill=BOTH, expand=YES, padx=10, pady=6)
+        self.days = self._table(tables, DAY_COLUMNS, "day")
+        self.days.pack(side=LEFT, fill=Y)
+        self.coverage = self._table(tables, COVERAGE_COLUMNS, "group")
+        self.coverage.pack(side=LEFT, fill=BOTH, expand=YES, padx=(8, 0))
+
+        self.estimates = tb.Label(root, justify="left")
+        self.estimates.pack(anchor="w", padx=10, pady=4)
+
+        tb.Button(root, text="Закрыть", bootstyle="danger, outline",
+                  command=root.destroy).pack(pady=(4, 10))
+
+        root.bind("<Destroy>", self._on_destroy, add="+")
+        self.io.submit(load, on_done=self._loaded, on_error=self.show_error, owner=self)
+
+    @staticmethod
+    def _table(master, columns, key_col):
+        tv = tb.Treeview(master, columns=[c for c, *_ in columns], show="headings", height=14)
+        for col, text, width in columns:
+            tv.heading(col, text=text)
+            tv.column(col, width=width, anchor="w" if col == key_col else "e")
+        return tv
+
+    def _on_destroy(self, event):
+        if event.widget is self.root:
+            self.io.cancel(self)
+
+    def show_error(self, e):
+        self.summary.config(text=f"Ошибка: {e}")
+
+    def _loaded(self, result):
+        data, sizes = result
+        totals = Totals(*data["totals"])
+        today = day_of(time.time())
+
+        if not totals.sessions:
+            self.summary.config(text="Сессий ещё не было — нажмите ▶ в главном окне.")
+        else:
+            since = date.fromordinal(totals.first_day).strftime("%d.%m.%Y")
+            self.summary.config(
+                text=f"Серия: {totals.current_streak(today)} дн. подряд "
+                     f"(лучшая — {totals.best_streak})\n"
+                     f"Сессий: {totals.sessions} · элементов: {totals.items} · "
+                     f"дней с занятиями: {totals.days} (с {since})")
+            self.pace.config(text=f"Темп: {totals.items_per_day:.1f} элементов за день "
+                                  f"занятий, {totals.items_per_session:.1f} за сессию")
+
+        for day, sessions, items in data["days"]:
+            label = "сегодня" if day == today else date.fromordinal(day).strftime("%d.%m.%Y")
+            self.days.insert("", "end", values=(label, sessions, items))
+
+        for g in sorted(set(sizes) | set(data["coverage"]), key=_group_order):
+            seen, total = data["coverage"].get(g, 0), sizes.get(g, 0)
+            seen = min(seen, total) if total else seen      # файл могли сократить
+            share = f"{seen / total * 100:.0f}" if total else "—"
+            self.coverage.insert("", "end", values=(_group_label(g), seen, total or "—", share))
+
+        lines = []
+        for label, left in self.remaining.items():
+            days = totals.days_to_finish(left)
+            eta = ("пройдено" if not left else "—" if days is None
+                   else f"≈ {max(1, round(days))} дн. занятий")
+            lines.append(f"До конца: {label} — {left} · {eta}")
+        self.estimates.config(text="\n".join(lines))
@@ -0,0 +1,84 @@
+# ─── tests/test_conjugation.py ─────────────────────────────────────────────
+"""
+Спряжение conjugation.py против таблицы из поставки
+(data/conjugation_table_with_translations.json) и классификация
+глаголов, которые легко принять за する / 来る.
+
+    python -m pytest -q tests
+"""
+import json, os, sys, unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import conjugation
+from conjugation import GODAN, ICHIDAN, KURU, SURU, classify, conjugate
+
+TABLE = os.path.join(ROOT, "data", "conjugation_table_with_translations.json")
+
+# строки таблицы → формы FORMS (Command-form в таблице нет)
+TABLE_FORMS = {
+    "Dictionary Form": "Plain-form", "Polite Form": "Masu-form",
+    "Masu Stem": "Masu-stem", "Te-Form": "Te-form", "Past Tense": "Ta-form",
+    "Continuous Form": "Progressive-form", "Negative Form": "Negative-form",
+    "Past-Negative Form": "Past-negative-form", "Passive Form": "Passive-form",
+    "Causative Form": "Causative-form", "Causative Passive Form": "Causative-passive-form",
+    "Imperative Form": "Imperative-form", "BA Hypothetical Form": "Ba-form",
+    "TARA Conditional Form": "Tara-form", "Potential Form": "Potential-form",
+    "Volitional Form": "Volitional-form",
+}
+# опечатки таблицы: こらせる вместо こさせる
+TABLE_ERRATA = {("Causative Form", "来る"), ("Causative Passive Form", "来る")}
+
+
+def accepted(verb: str, form: str) -> set[str]:
+    """Допустимые варианты формы: 来る и кандзи, и каной; краткий 〜される у 五段."""
+    out = {conjugate(verb)[form]}
+    if verb.endswith("来る"):
+        out.add(conjugate(verb[:-2] + "くる")[form])
+    if form == "Causative-passive-form" and classify(verb) == GODAN:
+        out.update(v.replace("せられる", "される") for v in set(out))
+    return out
+
+
+class ConjugationTableTest(unittest.TestCase):
+    def test_matches_shipped_table(self):
+        with open(TABLE, encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual({r["form"] for r in data["rows"]}, set(TABLE_FORMS))
+        for row in data["rows"]:
+            form = TABLE_FORMS[row["form"]]
+            for verb, value in zip(data["columns"], row["values"]):
+                if (row["form"], verb) in TABLE_ERRATA:
+                    continue
+                with self.subTest(verb=verb, form=form):
+                    self.assertIn(value.replace("(ら)", "ら"), accepted(verb, form))
+
+    def test_table_keeps_column_order_and_rejects(self):
+        table, rejected = conjugation.table(["飲む", "こする", "飲む", "きれい", "出来る"])
+        self.assertEqual(table["columns"], ["飲む", "こする", "出来る"])
+        self.assertEqual(rejected, ["きれい"])
+
+
+class ClassifyTest(unittest.TestCase):
+    def test_suru_only_alone_or_after_noun(self):
+        for verb in ("する", "勉強する", "コピーする", "びっくりする"):
+            self.assertEqual(classify(verb), SURU, verb)
+        for verb in ("こする", "さする", "かする"):
+            self.assertEqual(classify(verb), GODAN, verb)
+        forms = conjugate("こする")
+        self.assertEqual(forms["Masu-form"], "こすります")
+        self.assertEqual(forms["Potential-form"], "こすれる")
+        self.assertEqual(conjugate("勉強する")["Potential-form"], "勉強できる")
+
+    def test_dekiru_is_not_kuru(self):
+        self.assertEqual(classify("出来る"), ICHIDAN)
+        self.assertEqual(classify("できる"), ICHIDAN)
+        self.assertEqual(conjugate("出来る")["Imperative-form"], "出来ろ")
+        self.assertEqual(conjugate("出来る")["Negative-form"], "出来ない")
+        for verb in ("来る", "くる", "持って来る", "持ってくる"):
+            self.assertEqual(classify(verb), KURU, verb)
+        self.assertEqual(classify("つくる"), GODAN)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+# ─── tests/test_overlay.py ─────────────────────────────────────────────────
+"""
+Слои overlay.py при обновлении: копии data/ от прежних версий не должны
+закрывать новый контент сборки, а правки пользователя — теряться.
+
+    python -m pytest -q tests
+"""
+import json, os, shutil, sys, tempfile, unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import content
+import overlay
+from overlay import LEGACY_DIR, MANIFEST_NAME, file_sha1
+
+NAME = "grammar_n5"
+FNAME = content.DATASETS[NAME]
+OLD = [{"title": "です", "comment": "старая сборка"}]
+NEW = [{"title": "です", "comment": "новая сборка"}, {"title": "ます", "comment": ""}]
+
+
+def _write(path: str, data) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+class OverlayUpgradeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.bundle = os.path.join(self.tmp, "bundle")
+        self.data = os.path.join(self.tmp, "data")
+        os.makedirs(self.bundle)
+        os.makedirs(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def repo(self) -> content.ContentRepository:
+        return content.ContentRepository(self.data, os.path.join(self.tmp, "missing.pack"),
+                                         bundle_dir=self.bundle)
+
+    def comments(self, repo) -> list[str]:
+        return [g.comment for g in repo.get(NAME)]
+
+    def test_legacy_copy_of_old_bundle_yields_to_upgrade(self):
+        # прежняя версия скопировала свою сборку в data/, манифеста нет
+        _write(os.path.join(self.data, FNAME), OLD)
+        _write(os.path.join(self.bundle, FNAME), NEW)
+        shipped = {FNAME: (file_sha1(os.path.join(self.data, FNAME)),)}
+
+        with mock.patch.dict(overlay.SHIPPED_SHA1, shipped):
+            repo = self.repo()
+            self.assertEqual(self.comments(repo), ["новая сборка", ""])
+        self.assertFalse(os.path.exists(os.path.join(self.data, FNAME)))
+        self.assertTrue(os.path.exists(os.path.join(self.data, LEGACY_DIR, FNAME)))
+        self.assertEqual(repo.overlay.overrides(), [])
+        self.assertEqual(self.comments(self.repo()), ["новая сборка", ""])   # и после перезапуска
+
+    def test_unknown_file_before_manifest_is_an_override(self):
+        # правка, сделанная в прежней версии: ни с одной сборкой не совпадает
+        _write(os.path.join(self.data, FNAME), [{"title": "だ", "comment": "правка"}])
+        _write(os.path.join(self.bundle, FNAME), NEW)
+
+        repo = self.repo()
+        self.assertEqual(self.comments(repo), ["правка"])
+        self.assertTrue(os.path.exists(os.path.join(self.data, FNAME)))
+        self.assertFalse(os.path.exists(os.path.join(self.data, LEGACY_DIR)))
+        self.assertEqual(repo.overlay.overrides(), [FNAME])
+
+    def test_extract_copies_bundle_for_editing(self):
+        _write(os.path.join(self.bundle, FNAME), OLD)
+        repo = self.repo()
+        self.assertEqual(repo.extract([NAME]), [os.path.join(self.data, FNAME)])
+        self.assertEqual(repo.extract([NAME]), [])                    # уже лежит
+        self.assertEqual(repo.overlay.overrides(), [])
+
+        _write(os.path.join(self.bundle, FNAME), NEW)                 # нетронутая копия
+        self.assertEqual(self.comments(self.repo()), ["новая сборка", ""])
+        _write(os.path.join(self.data, FNAME), [{"title": "だ", "comment": "правка"}])
+        self.assertEqual(self.comments(self.repo()), ["правка"])
+
+    def test_legacy_copy_equal_to_bundle_follows_later_upgrades(self):
+        _write(os.path.join(self.data, FNAME), OLD)
+        _write(os.path.join(self.bundle, FNAME), OLD)
+        self.assertEqual(self.comments(self.repo()), ["старая сборка"])
+        self.assertTrue(os.path.exists(os.path.join(self.data, FNAME)))
+
+        _write(os.path.join(self.bundle, FNAME), NEW)                 # следующее обновление
+        self.assertEqual(self.comments(self.repo()), ["новая сборка", ""])
+
+    def test_files_added_after_manifest_are_overrides(self):
+        _write(os.path.join(self.bundle, FNAME), OLD)
+        repo = self.repo()
+        self.assertEqual(self.comments(repo), ["старая сборка"])
+        self.assertTrue(os.path.exists(os.path.join(self.data, MANIFEST_NAME)))
+
+        _write(os.path.join(self.data, FNAME), [{"title": "だ", "comment": "правка"}])
+        self.assertEqual(self.comments(self.repo()), ["правка"])
+        _write(os.path.join(self.bundle, FNAME), NEW)                 # обновление её не трогает
+        repo = self.repo()
+        self.assertEqual(self.comments(repo), ["правка"])
+        self.assertEqual(repo.overlay.overrides(), [FNAME])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# ─── tests/test_pools.py ───────────────────────────────────────────────────
+"""
+Пулы pools.py: сохранение IdPool / ShuffleBag в progress.json и проверка
+отпечатка каталога; взвешенная выборка WeightedPool (таблица псевдонимов) —
+распределение по критерию χ², отказы на вытянутых id и пересборка
+таблицы ниже REBUILD_AT.
+
+    python -m pytest -q tests
+"""
+import math, os, random, sys, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pools import REBUILD_AT, IdPool, ShuffleBag, WeightedPool, fingerprint
+
+SEED = 1
+N = 200
+SAMPLES = 100_000
+ALPHA = 0.001
+
+
+def weights(n: int, rng) -> tuple[float, ...]:
+    """Как у конструкций: частота × вес уровня (свой / проще / сложнее / прочие)."""
+    return tuple(rng.randint(1, 100) * rng.choice((1.0, 0.5, 0.3, 0.1)) for _ in range(n))
+
+
+def chi_square_p(pool: WeightedPool, samples: int, rng) -> float:
+    """p-значение χ² для samples бросков pool.sample() (Уилсон — Хилферти)."""
+    ids = list(pool)
+    total = sum(pool.weights[i] for i in ids)
+    observed = dict.fromkeys(ids, 0)
+    for _ in range(samples):
+        observed[pool.sample(rng)] += 1             # KeyError — выпал вытянутый id
+    stat = sum((observed[i] - samples * pool.weights[i] / total) ** 2
+               / (samples * pool.weights[i] / total) for i in ids)
+    dof = len(ids) - 1
+    z = ((stat / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class IdPoolTest(unittest.TestCase):
+    CATALOG = ("て-форма", ["た-форма", "прошедшее"], {"title": "ます-форма"}, "ない-форма")
+
+    def test_dump_load_round_trip(self):
+        pool = IdPool.full(70)
+        drawn = pool.draw(25, random.Random(SEED))
+        data = pool.dump(70, "abc")
+        self.assertEqual(data["fp"], "abc")
+        loaded = IdPool.load(data, 70, "abc")
+        self.assertEqual(sorted(loaded), sorted(pool))
+        self.assertTrue(set(drawn).isdisjoint(loaded))
+
+    def test_load_rejects_other_catalog(self):
+        data = IdPool.full(4).dump(4, fingerprint(self.CATALOG))
+        renamed = self.CATALOG[:3] + ("ないで",)
+        self.assertIsNone(IdPool.load(data, 4, fingerprint(renamed)))
+        self.assertIsNone(IdPool.load(data, 5, fingerprint(self.CATALOG)))
+        self.assertIsNone(IdPool.load(None, 4))
+        self.assertIsNotNone(IdPool.load(data, 4, fingerprint(list(self.CATALOG))))
+
+    def test_dump_without_fp_is_accepted_by_size(self):
+        data = IdPool([1, 3]).dump(4)
+        self.assertNotIn("fp", data)
+        self.assertEqual(sorted(IdPool.load(data, 4, fingerprint(self.CATALOG))), [1, 3])
+
+    def test_fingerprint_depends_on_titles_and_order(self):
+        fp = fingerprint(self.CATALOG)
+        self.assertEqual(fp, fingerprint(["て-форма", ("た-форма", "другой комментарий"),
+                                          {"title": "ます-форма"}, "ない-форма"]))
+        self.assertNotEqual(fp, fingerprint(self.CATALOG[::-1]))
+
+    def test_shuffle_bag_round_trip(self):
+        bag = ShuffleBag(5, fp="abc")
+        first = [bag.next() for _ in range(3)]
+        loaded = ShuffleBag.load(bag.dump(), 5, "abc")
+        self.assertTrue(loaded.fits(5, "abc"))
+        rest = [loaded.next() for _ in range(2)]
+        self.assertEqual(sorted(first + rest), list(range(5)))
+        self.assertIsNone(ShuffleBag.load(bag.dump(), 5, "def"))
+        self.assertFalse(bag.fits(5, "def"))
+        self.assertFalse(bag.fits(6))
+
+
+class WeightedPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(SEED)
+        self.pool = WeightedPool.full(weights(N, self.rng))
+
+    def test_distribution_matches_weights(self):
+        self.assertGreaterEqual(chi_square_p(self.pool, SAMPLES, self.rng), ALPHA)
+
+    def test_drawn_ids_are_dead_and_rest_keep_proportions(self):
+        drawn = self.pool.draw(N // 3, self.rng)
+        self.assertEqual(len(set(drawn)), len(drawn))
+        self.assertEqual(len(self.pool), N - len(drawn))
+        self.assertTrue(set(drawn).isdisjoint(self.pool))
+        self.assertTrue(all(not self.pool.alive[i] for i in drawn))
+        # таблица ещё старая (выше REBUILD_AT): мёртвые id отсеиваются отказами
+        self.assertGreaterEqual(self.pool.live_weight,
+                                self.pool.table_weight * REBUILD_AT)
+        self.assertGreaterEqual(chi_square_p(self.pool, SAMPLES, self.rng), ALPHA)
+
+    def test_table_rebuilt_below_rebuild_at(self):
+        while self.pool.live_weight >= self.pool.table_weight * REBUILD_AT:
+            self.pool.draw(1, self.rng)
+        stale = len(self.pool.slots)
+        self.pool.sample(self.rng)                  # здесь таблица пересобирается
+        self.assertLess(len(self.pool.slots), stale)
+        self.assertEqual(sorted(self.pool.slots), sorted(self.pool))
+        self.assertAlmostEqual(self.pool.table_weight, self.pool.live_weight)
+        self.assertGreaterEqual(chi_square_p(self.pool, SAMPLES, self.rng), ALPHA)
+
+    def test_draw_exhausts_pool_once(self):
+        drawn = []
+        while self.pool:
+            drawn += self.pool.draw(7, self.rng)
+        self.assertEqual(sorted(drawn), list(range(N)))
+        self.assertEqual(self.pool.draw(5, self.rng), [])
+        with self.assertRaises(IndexError):
+            self.pool.sample(self.rng)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# ─── tests/test_progress_store.py ──────────────────────────────────────────
+"""
+Журнал progress_store.py: снимок «доигрывается» записями журнала,
+компактирование оставляет в журнале только записи новее снимка,
+а файлы подменяются атомарно (tmp → os.replace).
+
+    python -m pytest -q tests
+"""
+import json, os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pools import IdPool
+from progress_store import ProgressJournal, apply_record
+
+
+class ProgressJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "progress.json")
+        self.state = {"grammar_source": "N5", "grammar_pool": IdPool.full(10).dump(10, "abc")}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def journal(self) -> ProgressJournal:
+        return ProgressJournal(self.path, lambda: dict(self.state))
+
+    def journal_seqs(self) -> list[int]:
+        with open(self.path + ".journal", encoding="utf-8") as f:
+            return [json.loads(line)["seq"] for line in f]
+
+    def test_apply_record_draw_keeps_fingerprint(self):
+        state = dict(self.state)
+        apply_record(state, {"op": "draw", "pool": "grammar", "ids": [2, 5]})
+        self.assertEqual(state["grammar_pool"]["fp"], "abc")
+        self.assertEqual(sorted(IdPool.load(state["grammar_pool"], 10, "abc")),
+                         [0, 1, 3, 4, 6, 7, 8, 9])
+        apply_record(state, {"op": "set", "values": {"grammar_source": "N4"}})
+        apply_record(state, {"op": "rotate", "pool": "facts", "data": {"size": 3}})
+        self.assertEqual(state["grammar_source"], "N4")
+        self.assertEqual(state["rotations"], {"facts": {"size": 3}})
+
+    def test_load_replays_journal_over_snapshot(self):
+        j = self.journal()
+        j.compact()
+        j.append("draw", pool="grammar", ids=[0, 1])
+        j.append("set", values={"grammar_source": "N4"})
+        j.flush()
+
+        j2 = self.journal()
+        state = j2.load()
+        self.assertEqual(j2.seq, 2)
+        self.assertEqual(state["grammar_source"], "N4")
+        self.assertEqual(sorted(IdPool.load(state["grammar_pool"], 10)), list(range(2, 10)))
+
+    def test_torn_tail_is_dropped(self):
+        j = self.journal()
+        j.append("set", values={"grammar_source": "N4"})
+        j.flush()
+        with open(self.path + ".journal", "ab") as f:
+            f.write(b'{"seq":2,"op":"set","values":{"grammar_sou')
+
+        state = self.journal().load()
+        self.assertEqual(state, {"grammar_source": "N4"})
+        self.assertEqual(self.journal_seqs(), [1])
+
+    def test_compaction_keeps_only_newer_records(self):
+        j = self.journal()
+        j.append("draw", pool="grammar", ids=[0])
+        j.append("draw", pool="grammar", ids=[1])
+        j.write(j.take_pending())
+        snap = j.prepare_snapshot()                 # снимок после записей 1–2
+        j.append("draw", pool="grammar", ids=[2])
+        j.write(j.take_pending(), snap)
+
+        self.assertEqual(self.journal_seqs(), [3])
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["journal_seq"], 2)
+        state = self.journal().load()
+        self.assertNotIn(2, IdPool.load(state["grammar_pool"], 10))
+
+    def test_snapshot_replaced_atomically(self):
+        j = self.journal()
+        j.compact()
+        self.state["grammar_source"] = "N3"
+        j.compact()
+
+        self.assertEqual(sorted(os.listdir(self.tmp)),
+                         ["progress.json", "progress.json.bak", "progress.json.journal"])
+        with open(self.path + ".bak", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["grammar_source"], "N5")
+        self.assertEqual(self.journal().load()["grammar_source"], "N3")
+
+    def test_falls_back_to_backup(self):
+        j = self.journal()
+        j.compact()
+        j.compact()
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"grammar_sou')                # снимок побит посреди записи
+        self.assertEqual(self.journal().load()["grammar_source"], "N5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# ─── tests/test_srs.py ─────────────────────────────────────────────────────
+"""
+Интервальное повторение srs.py: интервалы и ease по SM-2, порядок
+выдачи из кучи due с ленивым отбрасыванием устаревших записей.
+
+    python -m pytest -q tests
+"""
+import os, shutil, sys, tempfile, unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from srs import DAY, Card, Deck, SRSStore, sm2
+
+NOW = 1_000_000.0
+
+
+class SM2Test(unittest.TestCase):
+    def test_intervals_for_good_answers(self):
+        card = Card()
+        intervals = []
+        for _ in range(4):
+            sm2(card, 4, NOW)
+            intervals.append(card.interval)
+        self.assertEqual(intervals, [1, 6, 15, 38])
+        self.assertAlmostEqual(card.ease, 2.5)        # «хорошо» ease не меняет
+        self.assertEqual(card.due, NOW + 38 * DAY)
+
+    def test_ease_follows_quality(self):
+        easy, hard = Card(), Card()
+        sm2(easy, 5, NOW)
+        sm2(hard, 3, NOW)
+        self.assertAlmostEqual(easy.ease, 2.6)
+        self.assertAlmostEqual(hard.ease, 2.36)
+
+    def test_lapse_resets_and_ease_has_floor(self):
+        card = Card(ease=1.4, interval=30, reps=5)
+        sm2(card, 1, NOW)
+        self.assertEqual((card.reps, card.interval, card.lapses), (0, 1, 1))
+        self.assertEqual(card.ease, 1.3)
+        sm2(card, 4, NOW)
+        self.assertEqual((card.reps, card.interval), (1, 1))
+
+
+class DeckTest(unittest.TestCase):
+    def setUp(self):
+        self.deck = Deck()
+        for key, due in (("c", NOW - 10), ("a", NOW - 30), ("b", NOW - 20), ("later", NOW + DAY)):
+            self.deck.add(key, Card(due=due))
+
+    def test_take_due_in_due_order(self):
+        self.assertEqual(self.deck.take_due(10, NOW), ["a", "b", "c"])
+        self.assertEqual(self.deck.take_due(2, NOW), ["a", "b"])
+        # без оценки карточки остаются в очереди
+        self.assertEqual(self.deck.take_due(10, NOW), ["a", "b", "c"])
+        self.assertEqual(self.deck.take_due(10, NOW + DAY), ["a", "b", "c", "later"])
+
+    def test_graded_card_leaves_queue(self):
+        self.deck.grade("a", 4, NOW)
+        # старая запись "a" в куче устарела и отбрасывается при извлечении
+        self.assertEqual(self.deck.take_due(10, NOW), ["b", "c"])
+        self.assertEqual(self.deck.take_due(10, NOW + DAY), ["b", "c", "later", "a"])
+
+    def test_sync_adds_new_keys_due_now(self):
+        self.deck.sync(["a", "new"])
+        self.assertEqual(len(self.deck.cards), 5)
+        self.assertEqual(self.deck.take_due(1, NOW), ["new"])
+
+    def test_heap_rebuilt_when_stale_entries_pile_up(self):
+        for i in range(200):
+            self.deck.grade("a", 1 + i % 5, NOW + i)
+        self.assertLessEqual(len(self.deck._heap), 2 * len(self.deck.cards) + 64)
+        due = self.deck.cards["a"].due
+        keys = self.deck.take_due(10, due)
+        self.assertEqual(keys.count("a"), 1)
+        self.assertEqual(keys[0], "b")
+
+    def test_load_restores_order(self):
+        deck = Deck.load(self.deck.dump())
+        self.assertEqual(deck.take_due(10, NOW), ["a", "b", "c"])
+
+
+class SRSStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "srs.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_grades_survive_reload(self):
+        store = SRSStore(self.path)
+        store.deck("N5").sync(["です", "ます"])
+        card = store.grade("N5", "です", 5)
+        store.journal.flush()
+
+        again = SRSStore(self.path)
+        again.load()
+        self.assertEqual(again.deck("N5").cards["です"].dump(), card.dump())
+        self.assertNotIn("ます", again.deck("N5").cards)   # не оценённые — не журналируются
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# ─── tk_executor.py ────────────────────────────────────────────────────────
+"""
+Фоновое выполнение дисковых операций для окон Tk.
+
+Задача уходит в пул потоков, а её результат возвращается в поток Tk
+через очередь, которую «насос» разбирает по root.after(). Колбэки
+on_done / on_error всегда вызываются в потоке Tk, поэтому в них можно
+трогать виджеты. Задачи группируются по owner (обычно — окно): при
+закрытии окна cancel(owner) отменяет ещё не начатые задачи и глушит
+колбэки уже выполняющихся. Исключение в колбэке пишется в лог
+([CALLBACK ERROR]) и не останавливает разбор остальных результатов.
+"""
+import queue, time, traceback
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import perf
+from perf import percentile
+
+PUMP_MS = 15
+
+
+class TkExecutor:
+    def __init__(self, root, workers: int = 2):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=workers,
+                                        thread_name_prefix="jt-io")
+        self._done: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending: dict[Future, object] = {}          # future → owner
+        self._cancelled_owners: set = set()
+        self._pump_job = None
+        self.closed = False
+
+        # метрики
+        self.submitted = self.completed = self.failed = self.cancelled = 0
+        self._latencies: deque[float] = deque(maxlen=256)
+
+    # ─────────────────── постановка задач ───────────────────
+    def submit(self, fn, *args, on_done=None, on_error=None, owner=None) -> Future | None:
+        """
+        Выполнить fn(*args) в фоне. on_done(result) / on_error(exc) —
+        в потоке Tk. Без on_error ошибка печатается как [IO ERROR].
+        """
+        if self.closed:
+            return None
+        self._cancelled_owners.discard(owner)
+        t0 = time.perf_counter()
+        fut = self._pool.submit(fn, *args)
+        self._pending[fut] = owner
+        self.submitted += 1
+        fut.add_done_callback(
+            lambda f: self._done.put((f, on_done, on_error, owner, t0)))
+        self._ensure_pump()
+        return fut
+
+    def cancel(self, owner) -> None:
+        """Отменить задачи владельца (закрытие окна)."""
+        self._cancelled_owners.add(owner)
+        for fut, own in list(self._pending.items()):
+            if own is owner and fut.cancel():
+                self._pending.pop(fut, None)
+                self.cancelled += 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Дождаться записи на диск (wait) и закрыть пул."""
+        self.closed = True
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        if self._pump_job is not None:
+            try:
+                self.root.after_cancel(self._pump_job)
+            except Exception:
+                pass
+            self._pump_job = None
+
+    # ─────────────────── «насос» результатов ───────────────────
+    def _ensure_pump(self):
+        if self._pump_job is None:
+            self._pump_job = self.root.after(PUMP_MS, self._pump)
+
+    def _pump(self):
+        self._pump_job = None
+        while True:
+            try:
+                fut, on_done, on_error, owner, t0 = self._done.get_nowait()
+            except queue.Empty:
+                break
+            if self._pending.pop(fut, None) is None and fut.cancelled():
+                continue                               # уже учтена в cancel()
+            if fut.cancelled() or owner in self._cancelled_owners:
+                self.cancelled += 1
+                continue
+            latency = time.perf_counter() - t0
+            self._latencies.append(latency)
+            perf.record("io.task", latency)
+            exc = fut.exception()
+            if exc is not None:
+                self.failed += 1
+                if on_error is not None:
+                    self._call(on_error, exc)
+                else:
+                    perf.error("IO ERROR", repr(exc))
+                continue
+            self.completed += 1
+            if on_done is not None:
+                self._call(on_done, fut.result())
+        if self._pending and not self.closed:
+            self._ensure_pump()
+
+    @staticmethod
+    def _call(callback, arg) -> None:
+        """Колбэк окна; его ошибка не должна оставить очередь неразобранной."""
+        try:
+            callback(arg)
+        except Exception:
+            perf.error("CALLBACK ERROR", traceback.format_exc().rstrip())
+
+    # ─────────────────── метрики ───────────────────
+    def metrics(self) -> dict:
+        lat = list(self._latencies)
+        return {
+            "queue_depth": len(self._pending),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "latency_ms_p50": round(percentile(lat, 0.50) * 1000, 2),
+            "latency_ms_p95": round(percentile(lat, 0.95) * 1000, 2),
+        }
@@ -1,19 +1,19 @@
-import os, sys, shutil
+import os, sys
 
 def resource_path(rel: str) -> str:
     """Путь к файлу внутри пакета (работает как в IDE, так и из .exe)."""
     base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base, rel)
 
-def ensure_data_dir(files, dst_folder="data"):
+def ensure_data_dir(dst_folder="data"):
     """
-    Создаёт dst_folder рядом с exe и копирует туда файлы,
-    если папка ещё не существовала.
+    Создаёт dst_folder рядом с exe (прогресс, журналы, правки контента).
+    Контент сюда не копируется: он читается прямо из сборки, а в папке
+    появляются только файлы, изменённые или добавленные пользователем
+    (см. overlay.py).
     """
     exe_dir = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else __file__)
     target = os.path.join(exe_dir, dst_folder)
-
-    if not os.path.exists(target):
+    if not os.path.isdir(target):
         os.makedirs(target, exist_ok=True)
-        for f in files:
-            shutil.copy(resource_path(f), os.path.join(target, f))
\ No newline at end of file
+    return target
@@ -0,0 +1,103 @@
+# ─── virtual_table.py ──────────────────────────────────────────────────────
+"""
+Виртуализированная таблица на tb.Treeview.
+
+В Treeview живёт фиксированное число строк-«слотов» (по высоте окна);
+данные прокручиваются через них: при скролле меняются только значения
+слотов, которые действительно поменялись. Таблица на тысячи строк
+стоит столько же, сколько таблица на 30.
+"""
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+
+class VirtualTable:
+    def __init__(self, master, height: int = 28, col_width: int = 110):
+        self.height = height
+        self.col_width = col_width
+        self.columns: tuple = ()
+        self.rows: tuple | list = ()
+        self.offset = 0
+        self._slots: list[str] = []
+        self._shown: list[tuple | None] = []
+
+        self.frame = tb.Frame(master)
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.tv = tb.Treeview(self.frame, show="headings", height=height)
+        self.tv.grid(row=0, column=0, sticky="nsew")
+        self.sb = tb.Scrollbar(self.frame, orient=VERTICAL, command=self.yview)
+        self.sb.grid(row=0, column=1, sticky="ns")
+
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tv.bind(seq, self._on_wheel)
+        self.tv.bind("<Prior>", lambda e: self.yview("scroll", -1, "pages"))
+        self.tv.bind("<Next>",  lambda e: self.yview("scroll", 1, "pages"))
+
+    # ─────────────────── данные ───────────────────
+    def set_data(self, columns, rows) -> None:
+        """Новые данные; колонки перенастраиваются только если изменились."""
+        columns = tuple(columns)
+        if columns != self.columns:
+            self._setup_columns(columns)
+        self.rows = rows
+        self.offset = max(0, min(self.offset, len(rows) - self.height))
+        self._refresh()
+
+    def _setup_columns(self, columns):
+        tv = self.tv
+        if self._slots:
+            tv.delete(*self._slots)
+        tv["columns"] = columns
+        for col in columns:
+            tv.heading(col, text=col)
+            tv.column(col, width=self.col_width, anchor="center")
+        self._slots = [tv.insert("", "end", iid=f"slot{i}")
+                       for i in range(self.height)]
+        self._shown = [()] * self.height           # () ≠ любым значениям
+        self.columns = columns
+
+    def _refresh(self):
+        """Переписать только те слоты, чьё содержимое изменилось."""
+        tv, visible = self.tv, self.rows[self.offset:self.offset + self.height]
+        for i, iid in enumerate(self._slots):
+            vals = tuple(visible[i]) if i < len(visible) else None
+            if vals == self._shown[i]:
+                continue
+            if vals is None:
+                tv.detach(iid)
+            else:
+                if self._shown[i] is None:
+                    tv.move(iid, "", i)                # вернуть скрытый слот
+                tv.item(iid, values=vals)
+            self._shown[i] = vals
+
+        total = len(self.rows) or 1
+        self.sb.set(self.offset / total,
+                    min(1.0, (self.offset + self.height) / total))
+
+    # ─────────────────── прокрутка ───────────────────
+    def yview(self, *args):
+        """Протокол команды Scrollbar: moveto f | scroll n units/pages."""
+        if not args:
+            return
+        last = max(0, len(self.rows) - self.height)
+        if args[0] == "moveto":
+            new = round(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            new = self.offset + int(args[1]) * step
+        else:
+            return
+        new = max(0, min(new, last))
+        if new != self.offset:
+            self.offset = new
+            self._refresh()
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
@@ -0,0 +1,169 @@
+# ─── watcher.py ────────────────────────────────────────────────────────────
+"""
+Наблюдение за файлами data/ без перезапуска программы.
+
+FileWatcher следит за набором файлов {имя: путь} в отдельном потоке и
+сообщает on_change({имена}) — тоже из этого потока. На Linux работает
+inotify (через ctypes, на папки с файлами), в остальных случаях — опрос
+(mtime, size) раз в POLL_S. Серия быстрых сохранений (редактор пишет
+файл в несколько приёмов, через временный файл и т. п.) сводится к
+одному уведомлению: имя отдаётся, когда файл DEBOUNCE_S не менялся.
+"""
+import ctypes, ctypes.util, os, select, struct, sys, threading, time
+
+import perf
+
+DEBOUNCE_S = 0.3
+POLL_S     = 1.0
+
+# inotify(7)
+IN_MODIFY      = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_IGNORED     = 0x00008000
+IN_NONBLOCK    = os.O_NONBLOCK
+IN_CLOEXEC     = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct("iIII")                # wd, mask, cookie, len
+
+
+def _stamp(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch           # есть ли вообще
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    def __init__(self, paths: dict[str, str], on_change,
+                 debounce: float = DEBOUNCE_S, poll: float = POLL_S,
+                 backend: str = "auto"):
+        self.paths = dict(paths)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll = poll
+        self.backend = "poll"
+        self._fd = None
+        self._wds: dict[int, dict[str, str]] = {}   # wd → {имя файла: имя набора}
+        self._stamps = {name: _stamp(p) for name, p in self.paths.items()}
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = None
+        if backend in ("auto", "inotify"):
+            self._init_inotify()
+        if backend == "inotify" and self.backend != "inotify":
+            raise OSError("inotify недоступен")
+
+    # ─────────────────── inotify ───────────────────
+    def _init_inotify(self):
+        libc = _libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        by_dir: dict[str, dict[str, str]] = {}
+        for name, path in self.paths.items():
+            d, f = os.path.split(os.path.abspath(path))
+            by_dir.setdefault(d, {})[f] = name
+        for d, files in by_dir.items():
+            wd = libc.inotify_add_watch(fd, os.fsencode(d), WATCH_MASK)
+            if wd < 0:                                # папки нет и т. п. → опрос
+                os.close(fd)
+                self._wds.clear()
+                return
+            self._wds[wd] = files
+        self._fd = fd
+        self.backend = "inotify"
+
+    def _read_inotify(self, timeout: float) -> set[str]:
+        r, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._fd not in r:
+            return set()
+        try:
+            buf = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed, pos = set(), 0
+        while pos < len(buf):
+            wd, mask, _, ln = _EVENT.unpack_from(buf, pos)
+            fname = buf[pos + _EVENT.size:pos + _EVENT.size + ln].rstrip(b"\0")
+            pos += _EVENT.size + ln
+            if mask & IN_IGNORED:                     # папку удалили → опрос
+                self._wds.pop(wd, None)
+                if not self._wds:
+                    os.close(self._fd)
+                    self._fd = None
+                    self.backend = "poll"
+                continue
+            name = self._wds.get(wd, {}).get(os.fsdecode(fname))
+            if name is not None:
+                changed.add(name)
+        return changed
+
+    # ─────────────────── опрос ───────────────────
+    def _read_poll(self, timeout: float) -> set[str]:
+        select.select([self._wake_r], [], [], min(timeout, self.poll))
+        changed = set()
+        for name, path in self.paths.items():
+            st = _stamp(path)
+            if st != self._stamps[name]:
+                self._stamps[name] = st
+                changed.add(name)
+        return changed
+
+    # ─────────────────── поток ───────────────────
+    def start(self) -> "FileWatcher":
+        self._thread = threading.Thread(target=self._run, name="jt-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        os.write(self._wake_w, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _run(self):
+        pending: dict[str, float] = {}                # имя → когда отдать
+        while not self._stop.is_set():
+            now = time.monotonic()
+            timeout = max(0.0, min(pending.values()) - now) if pending else self.poll
+            if self._fd is not None:
+                changed = self._read_inotify(timeout)
+            else:
+                changed = self._read_poll(timeout)
+            if self._stop.is_set():
+                break
+
+            now = time.monotonic()
+            for name in changed:                      # каждое событие сдвигает срок
+                pending[name] = now + self.debounce
+            due = {n for n, t in pending.items() if t <= now}
+            if not due:
+                continue
+            for n in due:
+                del pending[n]
+            try:
+                self.on_change(due)
+            except Exception as e:
+                perf.error("IO ERROR", repr(e))